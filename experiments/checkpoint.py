@@ -0,0 +1,159 @@
+"""Checkpoints of long running experiment jobs.
+
+Every job of a sweep has a JSON sidecar file. While an ILP job runs, its
+incumbent and bound are persisted from the solver's progress events at most
+every `CHECKPOINT_INTERVAL` seconds, and once the job ends its result row
+is. When a sweep is restarted, finished jobs are skipped and their rows
+written again, while unfinished and failed jobs run again from the start
+with the full time limit.
+
+Progress events only hold the size of the incumbent, not its certificate,
+so a job can not resume from its checkpointed incumbent: a solver cut off
+at it and finding nothing better would have no certificate to return.
+Instead, the incumbent and bound of every run of a job are merged, and a
+job that times out reports the best bound of all its runs with the
+certificate of its last run. The ILP solver reports no events for graphs
+with more than one nontrivial component, so such jobs are not checkpointed
+while running. Incumbents and bounds are in terms of the formulation being
+solved, e.g. of the doubled graph for the VC formulation.
+"""
+
+
+# Imports
+from experiments import RESULTS_DIR
+from timeit import default_timer
+import json
+import os
+
+
+# Directory of the sidecar files, by sweep
+CHECKPOINTS_DIR = RESULTS_DIR / 'checkpoints'
+
+# Seconds between checkpoints of a running job
+CHECKPOINT_INTERVAL = 30
+
+# Status of a job in its sidecar file
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def _load(path):
+    """Read a sidecar file, empty if missing or cut off."""
+    try:
+        with open(str(path)) as infile:
+            return json.load(infile)
+    except (OSError, ValueError):
+        return {}
+
+
+class Checkpoint():
+    """Sidecar file of a job, also usable as an ILP `on_event` callback.
+
+    Attributes
+    ----------
+    path : Path
+        Path of the sidecar file.
+    interval : float
+        Minimum number of seconds between checkpoints of a running job.
+    state : dict
+        Contents of the sidecar file.
+    """
+
+    def __init__(self, path, interval=CHECKPOINT_INTERVAL):
+        """Initialize Checkpoint, loading the sidecar file if any.
+
+        Parameters
+        ----------
+        path : Path
+            Path of the sidecar file.
+        interval : float
+            Minimum number of seconds between checkpoints of a running job.
+        """
+        self.path = path
+        self.interval = interval
+        self.state = _load(path)
+        self._written = None
+
+    @classmethod
+    def for_job(cls, sweep, *keys):
+        """Checkpoint of the job of a sweep identified by keys."""
+        path = CHECKPOINTS_DIR.joinpath(sweep, *keys[:-1])
+        return cls(path / (keys[-1] + '.json'))
+
+    @property
+    def running(self):
+        """Whether the job was started but did not finish."""
+        return self.state.get('status') == RUNNING
+
+    @property
+    def done(self):
+        """Whether the job finished."""
+        return self.state.get('status') == DONE
+
+    @property
+    def row(self):
+        """Result row of a finished job, None if it had none."""
+        return self.state.get('row')
+
+    @property
+    def incumbent(self):
+        """Smallest incumbent of every run of the job, None if none."""
+        return self.state.get('incumbent')
+
+    @property
+    def bound(self):
+        """Largest bound of every run of the job, None if none."""
+        return self.state.get('bound')
+
+    def __call__(self, event):
+        """Persist a progress event, unless one was persisted recently.
+
+        Values are merged with those of earlier runs of the job, so the
+        incumbent only decreases and the bound only increases.
+        """
+        now = default_timer()
+        if self._written is not None and now - self._written < self.interval:
+            return
+        incumbent = [
+            v for v in (event.incumbent, self.incumbent) if v is not None
+        ]
+        bound = [v for v in (event.bound, self.bound) if v is not None]
+        self._write({
+            'status': RUNNING,
+            'time': event.time,
+            'incumbent': min(incumbent) if incumbent else None,
+            'bound': max(bound) if bound else None
+        })
+        self._written = now
+
+    def start(self):
+        """Mark the job as running, keeping earlier incumbents and bounds."""
+        self._write({
+            'status': RUNNING,
+            'time': 0.0,
+            'incumbent': self.incumbent,
+            'bound': self.bound
+        })
+
+    def finish(self, row=None):
+        """Mark the job as finished with its result row, if any."""
+        self._write({'status': DONE, 'row': row})
+
+    def fail(self, error):
+        """Mark the job as failed, so that it runs again from the start."""
+        self._write({
+            'status': FAILED,
+            'error': str(error),
+            'incumbent': self.incumbent,
+            'bound': self.bound
+        })
+
+    def _write(self, state):
+        """Replace the sidecar file atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix('.tmp')
+        with open(str(temporary), 'w') as outfile:
+            json.dump(state, outfile)
+        os.replace(str(temporary), str(self.path))
+        self.state = state
@@ -13,11 +13,10 @@ import random
 
 from dimod.generators.fcl import frustrated_loop
 from matplotlib import pyplot as plt, rc
-import networkx as nx
 import seaborn as sns
 
 from experiments import FCL_DATA_DIR, logger
-from src.preprocessing import graphs
+from src.preprocessing import graphs, qubo
 
 
 # FCL Constants
@@ -116,26 +115,22 @@ def generate_fcls(dataset_name: str,
                 seed=random.randint(MIN_SEED, MAX_SEED)
             )
 
-            # Generate a graph from the non-zero edges
-            fcl = nx.Graph()
-            fcl.add_weighted_edges_from(
-                (*e, w) for e, w in bqm.quadratic.items() if w
-            )
-
-            # Set graph name (will be used as filename)
-            fcl.graph['name'] = 'fcl_{}_{:.2f}_{}'.format(clique, cycles, i)
+            # Generate a graph from the non-zero edges, with node labels
+            # normalized to integers in the range 0..n.
+            num_vertices, edges, _ = qubo.from_bqm(bqm)
+            fcl = (num_vertices, edges)
 
-            # Normalize node labels to integers in the range 0..n.
-            fcl = graphs.reset_labels(fcl)
+            # Graph name (will be used as filename)
+            name = 'fcl_{}_{:.2f}_{}'.format(clique, cycles, i)
 
             # Store
             fcls.append(fcl)
-            graphs.write_edgelist(fcl, edgelist_dir)
-            graphs.write_huffner(fcl, huffner_dir)
-            graphs.write_snap(fcl, snap_dir)
+            graphs.write_edgelist(fcl, edgelist_dir, name=name)
+            graphs.write_huffner(fcl, huffner_dir, name=name)
+            graphs.write_snap(fcl, snap_dir, name=name)
             data.append((
-                len(fcl.nodes()),
-                len(fcl.edges()),
+                num_vertices,
+                len(edges),
                 (clique, cycles,),
             ))
 
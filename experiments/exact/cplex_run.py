@@ -47,7 +47,7 @@ def _run_ilp(dataset, threads, formulation, timeout):
     )
 
     # Return solution
-    return solution.time, solution.opt, solution.certificate
+    return solution.time, solution.opt, solution.certificate.tolist()
 
 
 def _generate_ground_truth():
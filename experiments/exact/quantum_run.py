@@ -47,7 +47,7 @@ def _run_ilp(dataset, threads=4):
     )
 
     # Return solution
-    return solution.time, solution.opt, solution.certificate
+    return solution.time, solution.opt, solution.certificate.tolist()
 
 
 def _run_ai(dataset):
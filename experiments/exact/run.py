@@ -13,6 +13,7 @@ from experiments import (
     EXACT_TIMEOUT,
     GROUND_TRUTH_DATA_FILE
 )
+from experiments.checkpoint import Checkpoint
 from experiments.exact import (
     AI,
     IC,
@@ -20,9 +21,11 @@ from experiments.exact import (
     ILP1T,
     EXACT_RESULTS_DATA_PATH
 )
+from src.ilp.solution import OPTIMAL
 from src.ilp.solver import read_edgelist, solve as solve_ilp
 from src.akiba_iwata.solver import solve as solve_ai
 from src.huffner.solver import solve as solve_ic
+from src.usage import fields
 from functools import partial
 from itertools import product
 import csv
@@ -33,44 +36,72 @@ from pathlib import Path
 import argparse
 
 
-def _run_ilp(dataset, threads=4):
-    """Run the designmated ILP solver on a dataset."""
+def _run_ilp(dataset, checkpoint, threads=4):
+    """Run the designmated ILP solver on a dataset.
+
+    The bound is the best of the solution and of the earlier runs of the
+    job in its checkpoint.
+    """
 
     # Compute solution
+    graph = read_edgelist(str(SNAP_DATA_DIR / (dataset + SNAP_DATA_EXT)))
     solution = solve_ilp(
-        read_edgelist(str(SNAP_DATA_DIR / (dataset + SNAP_DATA_EXT))),
+        graph,
         formulation='VC',
         solver='CPLEX',
         threads=threads,
         timelimit=EXACT_TIMEOUT,
-        convert_to_oct=True
+        convert_to_oct=True,
+        on_event=checkpoint
     )
 
+    # Checkpointed bounds are of the doubled graph
+    bounds = [solution.bound]
+    if checkpoint.bound is not None:
+        bounds.append(checkpoint.bound - graph.number_of_nodes() // 2)
+    bounds = [bound for bound in bounds if bound is not None]
+
     # Return solution
-    return solution.time, solution.opt, solution.certificate
+    return (
+        solution.time, solution.opt, solution.certificate.tolist(),
+        solution.usage, solution.status, max(bounds) if bounds else None
+    )
+
+
+def _finished(solution):
+    """Add the status and bound of a solver stopped at the timeout.
+
+    Its result is only kept if it finished before the timeout.
+    """
+    time, size = solution[:2]
+    if time < EXACT_TIMEOUT:
+        return solution + (OPTIMAL, size)
+    return solution + (None, None)
 
 
-def _run_ai(dataset):
+def _run_ai(dataset, checkpoint):
     """Run Akiba-Iwata on a dataset"""
 
     # Run
-    return solve_ai(
+    return _finished(solve_ai(
         str(SNAP_DATA_DIR / (dataset + SNAP_DATA_EXT)),
         timeout=EXACT_TIMEOUT,
-        convert_to_oct=True
-    )
+        convert_to_oct=True,
+        return_usage=True
+    ))
 
 
-def _run_ic(dataset):
+def _run_ic(dataset, checkpoint):
     """Run iterative compression on a dataset."""
 
     # Run
-    return solve_ic(
+    return _finished(solve_ic(
         str(HUFFNER_DATA_DIR / (dataset + HUFFNER_DATA_EXT)),
         timeout=EXACT_TIMEOUT,
         preprocessing=2,
-        htime=min(0.3 * EXACT_TIMEOUT, 1)
-    )
+        htime=min(0.3 * EXACT_TIMEOUT, 1),
+        return_usage=True
+    ))
 
 
 def _generate_ground_truth():
@@ -126,28 +157,48 @@ def main(current_server_id, total_servers, seed_filter):
         writer.writerow([
             headers.DATASET, headers.SOLVER, headers.TIME,
             headers.SIZE, headers.CERTIFICATE
-        ])
+        ] + headers.USAGE + [headers.STATUS, headers.BOUND])
 
         # Run experiments
         for dataset, (name, solver) in experiments:
 
+            # Skip finished jobs of an earlier run, keeping their rows
+            checkpoint = Checkpoint.for_job('exact', dataset, name)
+            if checkpoint.done:
+                if checkpoint.row is not None:
+                    writer.writerow(checkpoint.row)
+                    output.flush()
+                continue
+
             # Log
             logger.info('Running {} on {}'.format(name, dataset))
 
-            # Solve and write output
+            # Solve and write output. A timed out ILP job keeps its
+            # solution as a feasible row, other solvers have none
+            checkpoint.start()
             try:
-                solution = solver(dataset)
-                if solution[0] >= EXACT_TIMEOUT:
+                solution = solver(dataset, checkpoint)
+                if solution[4] is None:
+                    checkpoint.finish()
                     continue
             except subprocess.TimeoutExpired:
+                checkpoint.finish()
+                continue
+            except Exception as e:
+                logger.error(
+                    '{} failed on {}: {}'.format(name, dataset, e)
+                )
+                checkpoint.fail(e)
                 continue
 
-            writer.writerow([
+            row = [
                 dataset,
                 name,
-                *solution
-            ])
+                *solution[:3]
+            ] + fields(solution[3]) + list(solution[4:])
+            writer.writerow(row)
             output.flush()
+            checkpoint.finish(row)
 
     # Now generate the ground truth table if akiba_iwata was run
     if (AI, _run_ai) in solvers:
@@ -1,15 +1,18 @@
 """Experiment runner.
 
 This frustrated cluster loop experiment runs exact solvers against the FCL
-dataset. Solvers are run with a timeout.
+dataset. Solvers are run with a timeout, and the best solution found by
+then is reported as feasible.
 """
 
 
 # Imports
-from typing import Set, Tuple
+from typing import Optional, Set, Tuple
 import csv
 
+from experiments.checkpoint import Checkpoint
 from experiments import (
+    headers,
     logger,
     FCL_DATA_DIR,
     RESULTS_DIR,
@@ -19,7 +22,9 @@ from experiments import (
 )
 from src.akiba_iwata.solver import solve as solve_ai
 from src.huffner.solver import solve as solve_ic
+from src.ilp.solution import FEASIBLE, OPTIMAL
 from src.ilp.solver import read_edgelist, solve as solve_ilp
+from src.usage import Usage, fields
 
 
 # Paths
@@ -36,10 +41,38 @@ OUTPUT_HEADER = [
     'Time',
     'Size',
     'Certificate',
+] + headers.USAGE + [
+    headers.STATUS,
+    headers.BOUND
 ]
 
+# Result of a solver: size, time, certificate, resource usage, status and
+# lower bound
+Result = Tuple[int, float, str, Usage, str, Optional[float]]
 
-def _run_ai(dataset: str, name: str) -> Tuple[int, float, str]:
+
+def _status(size: int, time: float) -> Tuple[str, Optional[int]]:
+    """Status and bound of a solver stopped at the timeout.
+
+    Parameters
+    ----------
+    size : int
+        Solution size.
+    time : float
+        Solution time.
+
+    Returns
+    -------
+    Tuple[str, Optional[int]]
+        Status, and the size as bound if finished before the timeout.
+    """
+    if time < EXACT_TIMEOUT:
+        return OPTIMAL, size
+    return FEASIBLE, None
+
+
+def _run_ai(dataset: str, name: str,
+            checkpoint: Checkpoint) -> Result:
     """Run Akiba-Iwata on a dataset.
 
     Parameters
@@ -48,53 +81,74 @@ def _run_ai(dataset: str, name: str) -> Tuple[int, float, str]:
         Dataset name.
     name : str
         FCL name.
+    checkpoint : Checkpoint
+        Checkpoint of the job.
 
     Returns
     -------
-    Tuple[int, float, str]
-        Solution size, time, and certificate.
+    Result
+        Solution size, time, certificate, resource usage, status and bound.
     """
     # Execute
-    time, size, certificate = solve_ai(
+    time, size, certificate, usage = solve_ai(
         str(FCL_DATA_DIR / dataset / 'snap' / (name + SNAP_DATA_EXT)),
         timeout=EXACT_TIMEOUT,
-        convert_to_oct=True
+        convert_to_oct=True,
+        return_usage=True
     )
-    return size, time, certificate
+    return (size, time, certificate, usage) + _status(size, time)
 
 
-def _run_ilp(dataset: str, name: str) -> Tuple[int, float, str]:
+def _run_ilp(dataset: str, name: str,
+             checkpoint: Checkpoint) -> Result:
     """Run ILP on all datasets.
 
+    The bound is the best of the solution and of the earlier runs of the
+    job in its checkpoint.
+
     Parameters
     ----------
     dataset : str
         Dataset name.
     name : str
         FCL name.
+    checkpoint : Checkpoint
+        Checkpoint of the job.
 
     Returns
     -------
-    Tuple[int, float, str]
-        Solution size, time, and certificate.
+    Result
+        Solution size, time, certificate, resource usage, status and bound.
     """
     # Execute
+    graph = read_edgelist(str(
+        FCL_DATA_DIR / dataset / 'snap' / (name + SNAP_DATA_EXT)
+    ))
     solution = solve_ilp(
-        read_edgelist(str(
-            FCL_DATA_DIR / dataset / 'snap' / (name + SNAP_DATA_EXT)
-        )),
+        graph,
         formulation='VC',
         solver='CPLEX',
         threads=4,
         timelimit=EXACT_TIMEOUT,
-        convert_to_oct=True
+        convert_to_oct=True,
+        on_event=checkpoint
     )
 
+    # Checkpointed bounds are of the doubled graph
+    bounds = [solution.bound]
+    if checkpoint.bound is not None:
+        bounds.append(checkpoint.bound - graph.number_of_nodes() // 2)
+    bounds = [bound for bound in bounds if bound is not None]
+
     # Return
-    return solution.opt, solution.time, solution.certificate
+    return (
+        solution.opt, solution.time, solution.certificate.tolist(),
+        solution.usage, solution.status, max(bounds) if bounds else None
+    )
 
 
-def _run_ic(dataset: str, name: str) -> Tuple[int, float, str]:
+def _run_ic(dataset: str, name: str,
+            checkpoint: Checkpoint) -> Result:
     """Run iterative compression on all datasets.
 
     Parameters
@@ -103,22 +157,25 @@ def _run_ic(dataset: str, name: str) -> Tuple[int, float, str]:
         Dataset name.
     name : str
         FCL name.
+    checkpoint : Checkpoint
+        Checkpoint of the job.
 
     Returns
     -------
-    Tuple[int, float, str]
-        Solution size, time, and certificate.
+    Result
+        Solution size, time, certificate, resource usage, status and bound.
     """
     # Execute
-    time, size, certificate = solve_ic(
+    time, size, certificate, usage = solve_ic(
         str(FCL_DATA_DIR / dataset / 'huffner' / (name + HUFFNER_DATA_EXT)),
         timeout=EXACT_TIMEOUT,
         preprocessing=2,
-        htime=min(0.3 * EXACT_TIMEOUT, 1)
+        htime=min(0.3 * EXACT_TIMEOUT, 1),
+        return_usage=True
     )
 
     # Return
-    return size, time, str(certificate)
+    return (size, time, str(certificate), usage) + _status(size, time)
 
 
 def _datasets() -> Set[str]:
@@ -192,41 +249,61 @@ def main():
                 # Execute for each solver
                 for sn, solver in solvers:
 
+                    # Skip finished jobs of an earlier run, keeping rows
+                    checkpoint = Checkpoint.for_job(
+                        'fcls_exact', dataset, name, sn
+                    )
+                    if checkpoint.done:
+                        csv_writer.writerow(checkpoint.row)
+                        results_file_fd.flush()
+                        continue
+
                     logger.info('Running solver {}'.format(sn))
+                    checkpoint.start()
 
                     # Try to execute heuristics
+                    error = None
                     try:
 
-                        size, time, certificate = solver(dataset, name)
+                        size, time, certificate, usage, status, bound = (
+                            solver(dataset, name, checkpoint)
+                        )
 
                         # Write results
-                        csv_writer.writerow([
+                        row = [
                             '{}/{}'.format(dataset, name),
                             sn,
                             time,
                             size,
                             certificate
-                        ])
+                        ] + fields(usage) + [status, bound]
 
                     except Exception as e:
 
                         # Log error
                         logger.error(e)
+                        error = e
 
                         # Write empty row
-                        csv_writer.writerow([
+                        row = [
                             name,
                             sn,
                             float('nan'),
                             float('nan'),
                             float('nan')
-                        ])
-
-                    finally:
-
-                        # Flush results so we at least get partial results if
-                        # something catastrophic causes the script to crash.
-                        results_file_fd.flush()
+                        ] + fields(None) + [float('nan'), float('nan')]
+
+                    # Write the row and flush results so we at least get
+                    # partial results if something catastrophic causes the
+                    # script to crash.
+                    csv_writer.writerow(row)
+                    results_file_fd.flush()
+
+                    # Failed jobs run again when the experiment restarts
+                    if error is None:
+                        checkpoint.finish(row)
+                    else:
+                        checkpoint.fail(error)
 
 
 # Invoke main
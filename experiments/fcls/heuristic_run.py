@@ -9,16 +9,14 @@ dataset. Heuristics are run at different timeout levels.
 from itertools import product
 from typing import Set, Tuple
 import csv
-import re
-import subprocess
 
-from experiments import logger, PROJECT_ROOT, FCL_DATA_DIR, RESULTS_DIR
+from experiments import logger, FCL_DATA_DIR, RESULTS_DIR
+from src.heuristics.solver import solve as solve_he
 from src.huffner.solver import solve as solve_ic
 from src.ilp.solver import read_edgelist, solve as solve_ilp
 
 
 # Paths
-HEURISTIC_SOLVER = str(PROJECT_ROOT / 'src/heuristics/heuristic_solver')
 RESULTS_FILE = str(RESULTS_DIR / 'fcls_heuristic_experiment.csv')
 
 
@@ -58,28 +56,13 @@ def _run_he(dataset: str, name: str, timeout: int) -> Tuple[int, float, str]:
     """
     # Execute
     # The heuristic ensemble expects timeout in milliseconds.
-    proc = subprocess.run(
-        [
-            HEURISTIC_SOLVER,
-            str(int(1000 * timeout)),
-            str(FCL_DATA_DIR / dataset / 'edgelist/{}.edgelist'.format(name))
-        ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
+    time, size, certificate = solve_he(
+        str(FCL_DATA_DIR / dataset / 'edgelist/{}.edgelist'.format(name)),
+        int(1000 * timeout)
     )
 
-    # Parse results
-    output_string = bytes.decode(proc.stdout, 'utf-8').strip()
-    match = re.match(
-        r'(\d+),(\d+),"(\[((\d+)(,(\d+))*)?\])"',
-        output_string
-    )
-    size = int(match.group(1))
-    time = int(match.group(2)) / 1000
-    certificate = match.group(3)
-
     # Return
-    return size, time, certificate
+    return size, time / 1000, str(certificate)
 
 
 def _run_ilp(dataset: str, name: str, timeout: int) -> Tuple[int, float, str]:
@@ -113,7 +96,7 @@ def _run_ilp(dataset: str, name: str, timeout: int) -> Tuple[int, float, str]:
     )
 
     # Return
-    return solution.opt, solution.time, solution.certificate
+    return solution.opt, solution.time, solution.certificate.tolist()
 
 
 def _run_ic(dataset: str, name: str, timeout: int) -> Tuple[int, float, str]:
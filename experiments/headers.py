@@ -15,12 +15,31 @@ VERTICES_REMOVED = 'vertices_removed'
 EDGES = 'Edges'
 EDGES_REMOVED = 'edges_removed'
 OPT = 'Opt'
+STATUS = 'Status'
+BOUND = 'Bound'
+TRACE = 'Trace'
+MAX_RSS = 'Max RSS'
+USER_TIME = 'User Time'
+SYSTEM_TIME = 'System Time'
+VOLUNTARY_SWITCHES = 'Voluntary Switches'
+INVOLUNTARY_SWITCHES = 'Involuntary Switches'
+PYTHON_PEAK = 'Python Peak'
 HTIME = 'HTime'
 RESULTS_FILE = 'Results File'
 VALID = 'Is Valid Certificate'
 OCT = 'oct'
 BIPARTITE = 'bipartite'
 
+# Resource usage columns, in the order of `src.usage.fields`
+USAGE = [
+    MAX_RSS,
+    USER_TIME,
+    SYSTEM_TIME,
+    VOLUNTARY_SWITCHES,
+    INVOLUNTARY_SWITCHES,
+    PYTHON_PEAK
+]
+
 # Formatted names
 BF_DATASET = '\\textbf{Dataset}'
 LT_OPT = '$OPT$'
@@ -70,7 +70,7 @@ def main():
                     experiment[0],
                     solution.opt,
                     solution.time,
-                    solution.certificate
+                    solution.certificate.tolist()
                 ])
                 output.flush()
 
@@ -6,19 +6,17 @@ from experiments import (
     logger,
     PREPROCESSING_TIMEOUTS_MILLISECONDS,
     EDGELIST_DATA_DIR,
-    EDGELIST_DATA_EXT,
-    PROJECT_ROOT
+    EDGELIST_DATA_EXT
 )
 from experiments.datasets import preprocessed
 from experiments.heuristic import (
     HEURISTICS_RESULTS_DATA_FILE,
     HEURISTICS_CSV_HEADERS
 )
+from src.heuristics.solver import solve
 from itertools import product
 import csv
 import os
-import re
-import subprocess
 
 
 # Define experiment parameters
@@ -26,7 +24,6 @@ DATASETS = list(map(
     lambda d: str(EDGELIST_DATA_DIR / (d + EDGELIST_DATA_EXT)),
     preprocessed
 ))
-HEURISTIC_SOLVER = PROJECT_ROOT / 'src/heuristics/heuristic_solver'
 
 
 def main():
@@ -55,23 +52,8 @@ def main():
                 'Starting experiment timeout={} dataset={}'.format(*experiment)
             )
 
-            # Run subprocess
-            cmd = [str(HEURISTIC_SOLVER), *experiment]
-            proc = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-
-            # Parse results
-            output_string = bytes.decode(proc.stdout, 'utf-8').strip()
-            match = re.match(
-                r'(\d+),(\d+),"(\[((\d+)(,(\d+))*)?\])"',
-                output_string
-            )
-            size = int(match.group(1))
-            time = int(match.group(2))
-            certificate = match.group(3)
+            # Run solver
+            time, size, certificate = solve(experiment[1], experiment[0])
 
             # Write
             writer.writerow([
@@ -5,13 +5,12 @@ import csv
 from itertools import product
 import logging
 from pathlib import Path
-import re
-import subprocess
 
 # Imports from this project
+from experiments.registry import select
+from src.heuristics.solver import solve as solve_he
 from src.huffner.solver import solve as solve_ic
 from src.ilp.solver import read_edgelist, solve as solve_ilp
-from src.preprocessing.graphs import names_in_dir
 
 # Init logger
 logging.basicConfig(format='%(asctime)-15s %(message)s')
@@ -51,7 +50,7 @@ def _execute_cplex(configurations, outfile, csv_writer):
                 timeout,
                 solution.time,
                 solution.opt,
-                solution.certificate
+                solution.certificate.tolist()
             ])
             outfile.flush()
 
@@ -83,22 +82,7 @@ def _execute_heuristic_ensemble(configurations, outfile, csv_writer):
             )
 
             # Execute configuration
-            solver = str(Path('.') / 'src' / 'heuristics' / 'heuristic_solver')
-            proc = subprocess.run(
-                [solver, timeout, dataset],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-
-            # Parse results
-            output_string = bytes.decode(proc.stdout, 'utf-8').strip()
-            match = re.match(
-                r'(\d+),(\d+),"(\[((\d+)(,(\d+))*)?\])"',
-                output_string
-            )
-            size = int(match.group(1))
-            time = int(match.group(2))
-            certificate = match.group(3)
+            time, size, certificate = solve_he(dataset, timeout)
 
             # Write results
             csv_writer.writerow([
@@ -201,28 +185,13 @@ if __name__ == '__main__':
     # Retrive the command-line arguments
     args = _init_args()
 
-    # Ensure the command-line args are reasonable
-    if args.server > args.of:
-        raise ValueError('Unsupported server and total count configuration')
-
-    # Find all datasets
-    input_dir = Path('.') / 'data' / 'preprocessed' / 'edgelist'
-    datasets = names_in_dir(input_dir, '.edgelist')
-    # Take the subset of datasets that is quantum
-    datasets = sorted(list(filter(lambda x: '-' not in x, datasets)))
-
-    # Filter out datasets of empty graphs
-    def nontrivial(filename):
-        with open(str(input_dir / filename) + '.edgelist', 'r') as infile:
-            topline = tuple(map(int, infile.readline().split()))
-            if topline == (0, 0):
-                return False
-            else:
-                return True
-    datasets = sorted(list(filter(nontrivial, datasets)))
-
-    # Split data across servers
-    datasets = datasets[args.server-1::args.of]
+    # Take the nontrivial quantum datasets, split across servers
+    datasets = select(
+        "model == ''",
+        nontrivial=True,
+        server=args.server,
+        of=args.of
+    )
 
     # Define timeouts
     timeouts_in_seconds = [0.01, 0.1, 1, 10]
@@ -5,13 +5,14 @@ import csv
 from itertools import product
 import logging
 from pathlib import Path
-import re
-import subprocess
 
 # Imports from this project
+from experiments import headers
+from experiments.registry import select
+from src.heuristics.solver import solve as solve_he
 from src.huffner.solver import solve as solve_ic
 from src.ilp.solver import read_edgelist, solve as solve_ilp
-from src.preprocessing.graphs import names_in_dir
+from src.usage import fields
 
 # Init logger
 logging.basicConfig(format='%(asctime)-15s %(message)s')
@@ -51,8 +52,8 @@ def _execute_cplex(configurations, outfile, csv_writer):
                 timeout,
                 solution.time,
                 solution.opt,
-                solution.certificate
-            ])
+                solution.certificate.tolist()
+            ] + fields(solution.usage))
             outfile.flush()
 
         except Exception as e:
@@ -63,7 +64,7 @@ def _execute_cplex(configurations, outfile, csv_writer):
                 float('nan'),
                 float('nan'),
                 float('nan')
-            ])
+            ] + fields(None))
             outfile.flush()
             logger.error(e)
 
@@ -83,23 +84,10 @@ def _execute_heuristic_ensemble(configurations, outfile, csv_writer):
             )
 
             # Execute configuration
-            solver = str(Path('.') / 'src' / 'heuristics' / 'heuristic_solver')
-            proc = subprocess.run(
-                [solver, timeout, dataset],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+            time, size, certificate, usage = solve_he(
+                dataset, timeout, return_usage=True
             )
 
-            # Parse results
-            output_string = bytes.decode(proc.stdout, 'utf-8').strip()
-            match = re.match(
-                r'(\d+),(\d+),"(\[((\d+)(,(\d+))*)?\])"',
-                output_string
-            )
-            size = int(match.group(1))
-            time = int(match.group(2))
-            certificate = match.group(3)
-
             # Write results
             csv_writer.writerow([
                 dataset.split('/')[-1].replace('.edgelist', ''),
@@ -108,7 +96,7 @@ def _execute_heuristic_ensemble(configurations, outfile, csv_writer):
                 time,
                 size,
                 certificate
-            ])
+            ] + fields(usage))
             outfile.flush()
         except Exception as e:
             csv_writer.writerow([
@@ -118,7 +106,7 @@ def _execute_heuristic_ensemble(configurations, outfile, csv_writer):
                 float('nan'),
                 float('nan'),
                 float('nan')
-            ])
+            ] + fields(None))
             outfile.flush()
             logger.error(e)
 
@@ -143,11 +131,12 @@ def _execute_iterative_compression(configurations, outfile, csv_writer):
                 preprocessing = 2
 
             # Solve
-            time, size, certificate = solve_ic(
+            time, size, certificate, usage = solve_ic(
                 dataset,
                 timeout=timeout,
                 preprocessing=preprocessing,
-                htime=min(0.3 * timeout, 1)
+                htime=min(0.3 * timeout, 1),
+                return_usage=True
             )
 
             # Write output
@@ -158,7 +147,7 @@ def _execute_iterative_compression(configurations, outfile, csv_writer):
                 time,
                 size,
                 certificate
-            ])
+            ] + fields(usage))
             outfile.flush()
         except Exception as e:
             csv_writer.writerow([
@@ -168,7 +157,7 @@ def _execute_iterative_compression(configurations, outfile, csv_writer):
                 float('nan'),
                 float('nan'),
                 float('nan')
-            ])
+            ] + fields(None))
             outfile.flush()
             logger.error(e)
 
@@ -207,30 +196,13 @@ if __name__ == '__main__':
     # Retrive the command-line arguments
     args = _init_args()
 
-    # Ensure the command-line args are reasonable
-    if args.server > args.of:
-        raise ValueError('Unsupported server and total count configuration')
-
-    # Find all datasets
-    input_dir = Path('.') / 'data' / 'preprocessed' / 'edgelist'
-    datasets = names_in_dir(input_dir, '.edgelist')
-    # Take the subset of datasets that matches our seeds
-    valid_suffixes = tuple(map(lambda x: '-{}'.format(x), args.seeds))
-    datasets = sorted(list(filter(lambda x: x.endswith(valid_suffixes),
-                                  datasets)))
-
-    # Filter out datasets of empty graphs
-    def nontrivial(filename):
-        with open(str(input_dir / filename) + '.edgelist', 'r') as infile:
-            topline = tuple(map(int, infile.readline().split()))
-            if topline == (0, 0):
-                return False
-            else:
-                return True
-    datasets = sorted(list(filter(nontrivial, datasets)))
-
-    # Split data across servers
-    datasets = datasets[args.server-1::args.of]
+    # Take the nontrivial datasets that match our seeds, split across servers
+    datasets = select(
+        'seed in {}'.format(list(args.seeds)),
+        nontrivial=True,
+        server=args.server,
+        of=args.of
+    )
 
     # Define timeouts
     timeouts_in_seconds = [0.01, 0.1, 1, 10]
@@ -248,7 +220,7 @@ if __name__ == '__main__':
         'Time',
         'Size',
         'Certificate'
-    ]
+    ] + headers.USAGE
 
     outfile_path = Path('.') / 'results' / 'heuristic_experiment.csv'
     with open(str(outfile_path), 'w') as outfile:
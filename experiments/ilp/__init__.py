@@ -5,6 +5,7 @@ from experiments import RESULTS_DIR
 
 
 ILP_RESULTS_FILE_PATH = RESULTS_DIR / 'ilp_experiment_results.csv'
+SYMMETRY_RESULTS_FILE_PATH = RESULTS_DIR / 'ilp_symmetry_results.csv'
 
 
 SOLVERS = [('CPLEX', 1), ('CPLEX', 4), ('GLPK', 1)]  # (solver, threads)
@@ -12,6 +12,12 @@ Experiment results are reported in the generated CSV file
 - Time
 - Opt
 - Certificate
+- Trace
+- Max RSS, User Time, System Time, Voluntary Switches,
+  Involuntary Switches and Python Peak, see `src.usage`
+
+Experiments run concurrently on every core, each job reserving as many
+cores as solver threads, so rows are written in completion order.
 
 All VertexCover formulation solutions are converted back
 to an OCT solution for comparision to the OCT formulation.
@@ -38,7 +44,8 @@ from experiments.ilp import (
     ILP_RESULTS_FILE_PATH
 )
 from itertools import product, chain
-from src.ilp.solver import solve, read_edgelist
+from src.ilp.batch import Job, solve_batch
+from src.usage import fields
 import csv
 import os
 
@@ -73,12 +80,22 @@ def _run_experiments():
         ilp_experiment_datasets
     )))
 
-    # Generate iterator for experiments
-    experiments = product(
-        SOLVERS,
-        EXPERIMENT_MEMORY_LIMITS,
-        DATA
-    )
+    # Generate one batch job per experiment
+    jobs = [
+        Job(
+            key=experiment,
+            path=experiment[2][1],
+            options={
+                'solver': experiment[0][0],
+                'threads': experiment[0][1],
+                'formulation': experiment[2][0],
+                'timelimit': EXACT_TIMEOUT,
+                'memlimit': experiment[1],
+                'convert_to_oct': True
+            }
+        )
+        for experiment in product(SOLVERS, EXPERIMENT_MEMORY_LIMITS, DATA)
+    ]
 
     # Log
     logger.info('Starting ILP Experiments')
@@ -103,53 +120,44 @@ def _run_experiments():
             headers.EDGES,
             headers.TIME,
             headers.OPT,
-            headers.CERTIFICATE
-        ])
-
-        # Iterate over experiments
-        for experiment in experiments:
-
-            # Run Experiments
-            try:
-
-                # Log
-                logger.info((
-                    'Running experiment solver={}, threads={}, '
-                    'memlimit={}, dataset={}'
-                ).format(
-                    experiment[0][0], experiment[0][1],
-                    experiment[1], experiment[2][1]
-                ))
-
-                # Compute solution
-                solution = solve(
-                    read_edgelist(experiment[2][1]),
-                    solver=experiment[0][0],
-                    threads=experiment[0][1],
-                    formulation=experiment[2][0],
-                    timelimit=EXACT_TIMEOUT,
-                    memlimit=experiment[1],
-                    convert_to_oct=True
-                )
-
-                # Write
-                writer.writerow([
-                    experiment[0][0],
-                    experiment[0][1],
-                    experiment[1],
-                    experiment[2][0],
-                    os.path.splitext(os.path.basename(experiment[2][1]))[0],
-                    solution.n,
-                    solution.m,
-                    solution.time,
-                    solution.opt,
-                    solution.certificate
-                ])
-                output.flush()
+            headers.CERTIFICATE,
+            headers.TRACE
+        ] + headers.USAGE)
+
+        # Solve experiments concurrently, writing rows as they complete
+        for result in solve_batch(jobs):
+            experiment = result.job.key
 
             # Handle failure
-            except Exception as e:
-                logger.error(e)
+            if result.error is not None:
+                logger.error(result.error)
+                continue
+
+            # Log
+            logger.info((
+                'Finished experiment solver={}, threads={}, '
+                'memlimit={}, dataset={}'
+            ).format(
+                experiment[0][0], experiment[0][1],
+                experiment[1], experiment[2][1]
+            ))
+
+            # Write
+            solution = result.solution
+            writer.writerow([
+                experiment[0][0],
+                experiment[0][1],
+                experiment[1],
+                experiment[2][0],
+                os.path.splitext(os.path.basename(experiment[2][1]))[0],
+                solution.n,
+                solution.m,
+                solution.time,
+                solution.opt,
+                solution.certificate.tolist(),
+                solution.trace
+            ] + fields(solution.usage))
+            output.flush()
 
 
 def main():
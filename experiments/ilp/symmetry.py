@@ -0,0 +1,118 @@
+"""Benchmark the symmetry breaking OCT formulation against the plain one.
+
+Both formulations are solved with GLPK on the ILP experiment datasets.
+Results are reported in the generated CSV file `ilp_symmetry_results.csv`.
+Result headers are, in order
+- Solver
+- Formulation (OCT or OCT-SB)
+- Dataset
+- Vertices
+- Edges
+- Time
+- Opt
+- Certificate
+- Trace
+- Max RSS, User Time, System Time, Voluntary Switches,
+  Involuntary Switches and Python Peak, see `src.usage`
+"""
+
+
+# Imports
+from experiments import (
+    headers,
+    logger,
+    EXACT_TIMEOUT,
+    EDGELIST_DATA_DIR,
+    EDGELIST_DATA_EXT
+)
+from experiments.datasets import ilp_experiment_datasets
+from experiments.ilp import SYMMETRY_RESULTS_FILE_PATH
+from itertools import product
+from src.ilp.solver import solve, read_edgelist
+from src.usage import fields
+import csv
+
+
+# (formulation label, symmetry breaking)
+VARIANTS = [('OCT', False), ('OCT-SB', True)]
+
+
+def _run_experiments():
+    """Run experiments."""
+
+    # Log
+    logger.info('Starting symmetry breaking experiments')
+    logger.info('- {} data sets'.format(len(ilp_experiment_datasets)))
+
+    # Open output file
+    with open(str(SYMMETRY_RESULTS_FILE_PATH), 'w') as output:
+
+        # Get writer
+        writer = csv.writer(output)
+
+        # Write header
+        writer.writerow([
+            headers.SOLVER,
+            headers.FORMULATION,
+            headers.DATASET,
+            headers.VERTICES,
+            headers.EDGES,
+            headers.TIME,
+            headers.OPT,
+            headers.CERTIFICATE,
+            headers.TRACE
+        ] + headers.USAGE)
+
+        # Iterate over experiments
+        for dataset, variant in product(ilp_experiment_datasets, VARIANTS):
+
+            # Run Experiments
+            try:
+
+                # Log
+                logger.info(
+                    'Running experiment formulation={}, dataset={}'.format(
+                        variant[0], dataset
+                    )
+                )
+
+                # Compute solution
+                solution = solve(
+                    read_edgelist(
+                        str(EDGELIST_DATA_DIR / (dataset + EDGELIST_DATA_EXT))
+                    ),
+                    solver='GLPK',
+                    formulation='OCT',
+                    timelimit=EXACT_TIMEOUT,
+                    symmetry_breaking=variant[1]
+                )
+
+                # Write
+                writer.writerow([
+                    'GLPK',
+                    variant[0],
+                    dataset,
+                    solution.n,
+                    solution.m,
+                    solution.time,
+                    solution.opt,
+                    solution.certificate.tolist(),
+                    solution.trace
+                ] + fields(solution.usage))
+                output.flush()
+
+            # Handle failure
+            except Exception as e:
+                logger.error(e)
+
+
+def main():
+    """Manage symmetry breaking experiments."""
+
+    # Run
+    _run_experiments()
+
+
+# Call main
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@ Runs reduction rules to generate data/preprocessed/ from data/converted/
 
 import networkx as nx
 from pathlib import Path
+import os
 import subprocess
 import time
 
@@ -19,7 +20,13 @@ from src.preprocessing.graphs import (
     names_in_dir,
     convert_oct_set,
     load_pre_oct_set,
-    load_og_name_lookup
+    load_og_name_lookup,
+    huffner_lines,
+    is_path,
+    pipe_lines,
+    pipe_path,
+    resolve_path,
+    solver_input
 )
 from src.preprocessing.oct import oct_reductions
 from src.preprocessing.vc import vc_reductions
@@ -373,11 +380,24 @@ def create_dirs():
 
 
 def call_huffner(filename):
+    """
+    Compute an OCT set with Huffner. filename names a file in
+    data/preprocessed/huffner/, or is an in-memory graph which is streamed
+    to Huffner directly.
+    """
     HUFFNER = './src/huffner-src/occ'
-    DATA = 'data/preprocessed/huffner/{}'.format(filename)
     try:
-        output = subprocess.check_output('{} < {} -b'.format(HUFFNER, DATA),
-                              stderr=subprocess.STDOUT, shell=True)
+        # Stream the (possibly compressed) graph to Huffner's stdin
+        if is_path(filename):
+            DATA = 'data/preprocessed/huffner/{}'.format(filename)
+            stdin = pipe_path(resolve_path(DATA))
+        else:
+            stdin = pipe_lines(huffner_lines(filename))
+        try:
+            output = subprocess.check_output([HUFFNER, '-b'], stdin=stdin,
+                                             stderr=subprocess.STDOUT)
+        finally:
+            os.close(stdin)
         oct_set = output.decode('utf-8').split()
         return oct_set
     except:
@@ -385,14 +405,26 @@ def call_huffner(filename):
 
 
 def call_akiba_iwata(filename):
+    """
+    Compute an OCT set with Akiba-Iwata. filename names a dataset in
+    data/preprocessed/snap/, or is an in-memory graph which is streamed to
+    the solver directly.
+    """
+    if is_path(filename):
+        filename = 'data/preprocessed/snap/{}.snap'.format(filename)
     try:
-        output = subprocess.run(
-            args=['java', '-cp', 'src/akiba-iwata-src/bin', 'Main',
-                  'data/preprocessed/snap/{}.snap'.format(
-                  filename), '-r', '3', '-p'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True)
+        data, stdin = solver_input(filename, file_format='snap')
+        try:
+            output = subprocess.run(
+                args=['java', '-cp', 'src/akiba-iwata-src/bin', 'Main',
+                      data, '-r', '3', '-p'],
+                stdin=stdin,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True)
+        finally:
+            if stdin is not None:
+                os.close(stdin)
 
         # Pull the number of vertices from stderr
         err = output.stderr.decode('utf-8').split('\n')
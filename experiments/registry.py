@@ -0,0 +1,200 @@
+"""Indexed registry of every graph under `data/`.
+
+Runners used to discover datasets by globbing directories and opening each
+edgelist just to read its `n m` header. The registry scans the data
+directories once, records per-graph metadata in a small CSV index at
+`data/index.csv`, and answers later lookups from that file. The index is
+rebuilt automatically whenever one of the scanned directories changes.
+
+Indexed columns are
+
+- collection: `preprocessed`, `sanitized` or `fcls/<dataset>`
+- name: dataset name, as used for file names
+- family: `aa`, `j`, `gka`, `bqp50`, ..., or `fcl`
+- qubo: the quantum dataset a synthetic graph was modeled on, else the name
+- model: synthetic source model (`er`, `cl`, `ba`, `to`), empty otherwise
+- seed: synthetic generator seed, -1 otherwise
+- n, m: number of vertices and edges
+- preprocessing statistics from `data/preprocessed/summary/*.csv`, where
+  available (`original_vertices`, `original_edges`, `vertices_removed`,
+  `edges_removed`, `oct`, `bipartite`)
+"""
+
+
+# Imports
+from experiments import (
+    DATA_DIR,
+    FCL_DATA_DIR,
+    PREPROCESSED_DATA_DIR,
+    EDGELIST_DATA_EXT
+)
+from src.preprocessing.graphs import names_in_dir, open_path, resolve_path
+import pandas
+import re
+
+
+# Constants
+INDEX_FILE = DATA_DIR / 'index.csv'
+SANITIZED_DATA_DIR = DATA_DIR / 'sanitized'
+SUMMARY_DATA_DIR = PREPROCESSED_DATA_DIR / 'summary'
+SYNTHETIC_MODELS = ('er', 'cl', 'ba', 'to')
+SUMMARY_COLUMNS = [
+    'original_vertices', 'original_edges', 'vertices_removed',
+    'edges_removed', 'oct', 'bipartite'
+]
+INDEX_COLUMNS = [
+    'collection', 'name', 'family', 'qubo', 'model', 'seed', 'n', 'm'
+] + SUMMARY_COLUMNS
+
+
+def _collections():
+    """Map every collection name to its data directory."""
+    collections = {
+        'preprocessed': PREPROCESSED_DATA_DIR,
+        'sanitized': SANITIZED_DATA_DIR
+    }
+    if FCL_DATA_DIR.is_dir():
+        for dataset in sorted(FCL_DATA_DIR.iterdir()):
+            if dataset.is_dir():
+                collections['fcls/{}'.format(dataset.name)] = dataset
+    return collections
+
+
+def _scanned_paths():
+    """All directories and summary files whose contents the index reflects."""
+    paths = [SUMMARY_DATA_DIR, FCL_DATA_DIR]
+    paths += [d / 'edgelist' for d in _collections().values()]
+    paths += list(SUMMARY_DATA_DIR.glob('*.csv'))
+    return [p for p in paths if p.exists()]
+
+
+def parse_name(name):
+    """Parse a dataset name into (family, qubo, model, seed).
+
+    Synthetic graphs are named `<qubo>-<model>-<seed>`, all other graphs
+    are identified by their own name.
+    """
+    match = re.match(
+        r'^(.+)-({})-(\d+)$'.format('|'.join(SYNTHETIC_MODELS)),
+        name
+    )
+    if match:
+        qubo, model, seed = match.group(1), match.group(2), int(match.group(3))
+    else:
+        qubo, model, seed = name, '', -1
+
+    # bqp datasets are grouped by size, everything else by prefix
+    if qubo.startswith('bqp'):
+        family = qubo.split('_')[0]
+    else:
+        family = re.match(r'[a-zA-Z]*', qubo).group(0)
+
+    return family, qubo, model, seed
+
+
+def _read_header(path):
+    """Read the `n m` header of an edgelist file."""
+    with open_path(resolve_path(path), 'r') as infile:
+        return tuple(map(int, infile.readline().split()[:2]))
+
+
+def _read_summaries():
+    """Read preprocessing statistics of all summary files with a header."""
+    summaries = []
+    for path in sorted(SUMMARY_DATA_DIR.glob('*.csv')):
+        summary = pandas.read_csv(str(path))
+        if 'Dataset' in summary.columns:
+            summaries.append(summary)
+    if not summaries:
+        return pandas.DataFrame(columns=['name'] + SUMMARY_COLUMNS)
+    summary = pandas.concat(summaries, ignore_index=True)
+    summary = summary.rename(columns={'Dataset': 'name'})
+    summary = summary.drop_duplicates('name', keep='last')
+    return summary.reindex(columns=['name'] + SUMMARY_COLUMNS)
+
+
+def build_index():
+    """Scan all data directories and write a fresh index.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The index.
+    """
+
+    # Collect metadata of every edgelist
+    rows = []
+    for collection, directory in _collections().items():
+        edgelist_dir = directory / 'edgelist'
+        if not edgelist_dir.is_dir():
+            continue
+        for name in names_in_dir(edgelist_dir, EDGELIST_DATA_EXT):
+            n, m = _read_header(edgelist_dir / (name + EDGELIST_DATA_EXT))
+            rows.append((collection, name, *parse_name(name), n, m))
+    index = pandas.DataFrame(rows, columns=INDEX_COLUMNS[:8])
+
+    # Attach preprocessing statistics to preprocessed graphs
+    stats = _read_summaries()
+    stats['collection'] = 'preprocessed'
+    index = index.merge(stats, how='left', on=['collection', 'name'])
+
+    # Write
+    index.to_csv(str(INDEX_FILE), index=False)
+    return index
+
+
+def load_index(rebuild=False):
+    """Load the index, rebuilding it first if it is missing or stale.
+
+    Parameters
+    ----------
+    rebuild : bool
+        Force a rebuild.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The index.
+    """
+    if not rebuild and INDEX_FILE.is_file():
+        built = INDEX_FILE.stat().st_mtime
+        if all(p.stat().st_mtime <= built for p in _scanned_paths()):
+            return pandas.read_csv(
+                str(INDEX_FILE), keep_default_na=False,
+                na_values={c: [''] for c in SUMMARY_COLUMNS}
+            )
+    return build_index()
+
+
+def select(query=None, collection='preprocessed', nontrivial=False,
+           server=1, of=1):
+    """Select dataset names from the index.
+
+    Parameters
+    ----------
+    query : str
+        Optional `pandas.DataFrame.query` expression over the index columns,
+        e.g. `"model == 'er' and seed in [5, 6]"`.
+    collection : str
+        Collection to select from.
+    nontrivial : bool
+        If True, graphs without vertices are excluded.
+    server : int
+        One based index of this server when sharding.
+    of : int
+        Total number of servers to shard across.
+
+    Returns
+    -------
+    list
+        Sorted dataset names of this server's shard.
+    """
+    if server < 1 or server > of:
+        raise ValueError('Unsupported server and total count configuration')
+    index = load_index()
+    index = index[index['collection'] == collection]
+    if nontrivial:
+        index = index[index['n'] > 0]
+    if query:
+        index = index.query(query)
+    return sorted(index['name'])[server - 1::of]
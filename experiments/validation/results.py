@@ -26,11 +26,8 @@ from experiments.exact import EXACT_RESULTS_DATA_PATH
 from experiments.heuristic import COMBINED_RESULTS_DATA_FILE
 from experiments.ic import SELF_COMPARISON_DATA_PATH, BASELINE_FILE
 from experiments.ilp import ILP_RESULTS_FILE_PATH
-from src.preprocessing.graphs import (
-    read_beasley, read_huffner,
-    convert_oct_set, load_pre_oct_set,
-    load_og_name_lookup
-)
+from src.preprocessing.graphs import read_beasley, read_huffner
+from src.preprocessing.lifting import lift_certificates
 from itertools import chain
 import ast
 import networkx as nx
@@ -55,46 +52,46 @@ BEASLEY_DATASETS = set(beasley_small)
 BEASLEY_GKA = set(preprocessed_gka)
 
 
-def _is_valid_certificate(c):
-    """Check to see if a certificate is valid."""
-
-    # Read the graph
-    if c.Dataset in HUFFNER_DATASETS:
-        graph = read_huffner(
+def _read_original(dataset):
+    """Read the original graph of a dataset."""
+    if dataset in HUFFNER_DATASETS:
+        return read_huffner(
             ORIGINAL_DATA_DIR / 'huffner',
-            c.Dataset + ORIGINAL_HUFFNER_DATA_EXT
+            dataset + ORIGINAL_HUFFNER_DATA_EXT
         )
-    elif c.Dataset in BEASLEY_DATASETS:
-        graph = read_beasley(
+    elif dataset in BEASLEY_DATASETS:
+        return read_beasley(
             ORIGINAL_DATA_DIR / 'beasley',
-            c.Dataset + BEASLEY_EXT
+            dataset + BEASLEY_EXT
         )
-    elif c.Dataset in BEASLEY_GKA:
-        graph = read_beasley(
+    elif dataset in BEASLEY_GKA:
+        return read_beasley(
             ORIGINAL_DATA_DIR / 'gka',
-            c.Dataset + BEASLEY_EXT
+            dataset + BEASLEY_EXT
         )
     else:
-        raise Exception('Unknown Dataset: {}'.format(c.Dataset))
+        raise Exception('Unknown Dataset: {}'.format(dataset))
 
-    # Load the original oct set and names
-    og_names = load_og_name_lookup(LOOKUP, '{}.lookup'.format(c.Dataset))
-    pre_oct_set = load_pre_oct_set(OCT, '{}.oct'.format(c.Dataset))
 
-    # Parse the certificate
-    certificate = list(map(str, ast.literal_eval(c.Certificate)))
+def _valid_certificates(dataset, certificates):
+    """Check which certificates of a single dataset are valid."""
 
-    # Convert certificate to OCT set with original names
-    oct_set = convert_oct_set(certificate, og_names)
+    # Read the graph once for all certificates
+    graph = _read_original(dataset)
 
-    # Remove oct verticies
-    if pre_oct_set:
-        graph.remove_nodes_from(pre_oct_set)
-    if oct_set:
-        graph.remove_nodes_from(oct_set)
+    # Parse the certificates and lift them, together with the preprocessed
+    # oct vertices, to the original names in one pass
+    oct_sets = lift_certificates(
+        LOOKUP, OCT, dataset,
+        (ast.literal_eval(c) for c in certificates)
+    )
 
     # Verify the remainder is bipartite
-    return nx.is_bipartite(graph)
+    nodes = set(graph.nodes())
+    return [
+        nx.is_bipartite(graph.subgraph(nodes.difference(oct_set.tolist())))
+        for oct_set in oct_sets
+    ]
 
 
 def main():
@@ -114,11 +111,13 @@ def main():
         # Concat
         results = pandas.concat([results, partial_results], ignore_index=True)
 
-    # Compute if the certificate is valid
-    results[headers.VALID] = results.apply(
-        _is_valid_certificate,
-        axis=1
-    )
+    # Compute if the certificate is valid, one dataset at a time
+    results[headers.VALID] = False
+    for dataset, group in results.groupby(headers.DATASET):
+        results.loc[group.index, headers.VALID] = _valid_certificates(
+            dataset,
+            group[headers.CERTIFICATE]
+        )
 
     # Find any where it was not valid
     invalid = results[results[headers.VALID] == False].drop(
@@ -0,0 +1,77 @@
+import java.io.*;
+import java.util.*;
+
+/**
+ * Solves vertex cover instances with the Akiba-Iwata solver in a single JVM.
+ * Each line of stdin holds the path of a snap (or dimacs) graph file. Each
+ * line of stdout answers one request, either "ok <seconds> <vertex> ..." with
+ * the vertices of a minimum vertex cover, "memout <message>" if the heap is
+ * exhausted, or "error <message>". The time covers reading and solving the
+ * graph, but not starting the JVM.
+ */
+public class SolverServer {
+
+	static GraphConverter read(String file) throws IOException {
+		GraphConverter conv = new GraphConverter();
+		conv.file = file;
+		conv.type = "snap";
+		conv.undirected = true;
+		conv.sorting = true;
+		try {
+			conv.read();
+		} catch (Exception e) {
+			conv = new GraphConverter();
+			conv.file = file;
+			conv.type = "dimacs";
+			conv.undirected = true;
+			conv.sorting = true;
+			conv.read();
+		}
+		return conv;
+	}
+
+	static String solve(String file) throws IOException {
+		long start = System.nanoTime();
+		GraphConverter conv = read(file);
+
+		// Reset the solver state, using the defaults of Main
+		VCSolver.nBranchings = 0;
+		VCSolver.REDUCTION = 3;
+		VCSolver.LOWER_BOUND = 4;
+		VCSolver.BRANCHING = 2;
+		VCSolver.outputLP = false;
+		VCSolver.debug = 0;
+		VCSolver.rand = new Random(4327897);
+
+		VCSolver vc = new VCSolver(conv.adj, conv.adj.length);
+		vc.solve();
+		double time = 1e-9 * (System.nanoTime() - start);
+
+		StringBuilder sb = new StringBuilder("ok ").append(time);
+		for (int i = 0; i < conv.adj.length; i++) if (vc.y[i] > 0) {
+			sb.append(' ').append(conv.vertexID[i]);
+		}
+		return sb.toString();
+	}
+
+	public static void main(String[] args) throws IOException {
+		BufferedReader in = new BufferedReader(new InputStreamReader(System.in));
+		PrintStream out = System.out;
+
+		// Keep stray prints off the protocol stream
+		System.setOut(System.err);
+
+		for (String file; (file = in.readLine()) != null; ) {
+			String response;
+			try {
+				response = solve(file);
+			} catch (OutOfMemoryError e) {
+				response = "memout " + String.valueOf(e.getMessage()).replace('\n', ' ');
+			} catch (Exception e) {
+				response = "error " + String.valueOf(e).replace('\n', ' ');
+			}
+			out.println(response);
+			out.flush();
+		}
+	}
+}
@@ -3,11 +3,39 @@
 
 # Imports
 from typing import List
+from src.preprocessing.graphs import (
+    graph_parts,
+    is_compressed,
+    is_path,
+    open_path,
+    resolve_path,
+    snap_lines,
+    solver_input,
+    PIPE_CHUNK_SIZE
+)
+from src.limits import check, preexec, MemoryLimitExceeded
+from src.runner import default_runner
+from src.usage import difference, process_usage, Popen
+from contextlib import contextmanager
+from pathlib import Path
 import argparse
+import atexit
+import os
+import queue
+import shutil
 import subprocess
+import tempfile
+import threading
 import time
 
 
+# Classpath of the compiled solver, see the Makefile
+AKIBA_IWATA_CLASSPATH = 'src/akiba-iwata-src/bin'
+
+# Pool shared by the calls to solve given it
+_pool = None
+
+
 def _certificate_to_oct(num_vertices: int,
                         certificate: List[int]) -> List[int]:
     """Transform a VC certificate into an OCT certificate
@@ -48,66 +76,395 @@ def _certificate_to_oct(num_vertices: int,
     ]
 
 
-def solve(filename, timeout=None, convert_to_oct=False):
-    """Run akiba-iwata on the given file.
+def _java(limits=None):
+    """Command line prefix, environment and preexec_fn of a limited JVM.
 
-    Parameters
-    ----------
-    filename : string
-        File containing problem definition
-    timeout : float
-        Optional timeout in seconds
-    convert_to_oct : bool
-        Whether or not to convert to an OCT certificate
+    A JVM reserves far more address space than it uses, so `RLIMIT_AS`
+    would make it fail at startup rather than run out of memory. Its memory
+    is capped with flags instead: three quarters of the limit for the heap,
+    a sixteenth each for compiled code and class metadata, and few malloc
+    arenas for the rest. Only the cores it may run on are applied in the
+    child.
+    """
+    if limits is None or limits.memory is None:
+        return ['java'], None, preexec(limits)
+    memory = int(limits.memory)
+    native = max(16, memory // 16)
+    args = [
+        'java',
+        '-Xmx{}m'.format(max(1, memory * 3 // 4)),
+        '-XX:ReservedCodeCacheSize={}m'.format(native),
+        '-XX:MaxMetaspaceSize={}m'.format(native),
+        '-XX:CompressedClassSpaceSize={}m'.format(native // 2)
+    ]
+    env = dict(os.environ, MALLOC_ARENA_MAX='2')
+    return args, env, preexec(limits._replace(memory=None))
+
+
+class _Worker():
+    """A solver JVM handling one instance at a time."""
+
+    def __init__(self, classpath, limits=None):
+        self.limits = limits
+
+        # With a memory limit, errors are kept to tell running out of
+        # memory from other failures
+        args, env, preexec_fn = _java(limits)
+        self.errors = subprocess.DEVNULL
+        if limits is not None and limits.memory is not None:
+            self.errors = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            args + ['-cp', classpath, 'SolverServer'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self.errors,
+            universal_newlines=True,
+            env=env,
+            preexec_fn=preexec_fn
+        )
+
+        # Responses are read on a background thread to allow timeouts
+        self.busy = False
+        self.responses = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            self.responses.put(line)
+        self.responses.put(None)
+
+    def alive(self):
+        """Whether the JVM is still running."""
+        return self.process.poll() is None
+
+    def _errors(self):
+        """Error output of the JVM so far, if kept."""
+        if self.errors is subprocess.DEVNULL:
+            return b''
+        self.errors.seek(0)
+        return self.errors.read()
+
+    def solve(self, path, timeout=None):
+        """Solve the graph at path, returning (time, certificate, usage)."""
+        before = process_usage(self.process.pid)
+        self.busy = True
+        try:
+            self.process.stdin.write(path + '\n')
+            self.process.stdin.flush()
+        except BrokenPipeError:
+            # The JVM exited, which the reader reports below
+            pass
+        try:
+            response = self.responses.get(timeout=timeout)
+        except queue.Empty:
+            raise subprocess.TimeoutExpired(self.process.args, timeout)
+        status, _, values = (response or '').strip().partition(' ')
+        if status == 'memout':
+            # Left busy, so that the pool replaces it
+            raise MemoryLimitExceeded(
+                'Akiba-Iwata worker ran out of memory: {}'.format(values)
+            )
+        self.busy = False
+        if response is None:
+            check(self.limits, self.process.wait(), self._errors())
+            raise Exception('Akiba-Iwata worker exited unexpectedly')
+        if status != 'ok':
+            check(self.limits, 1, response)
+            raise Exception(values)
+        values = values.split()
+        usage = difference(process_usage(self.process.pid), before)
+        return float(values[0]), list(map(int, values[1:])), usage
+
+    def kill(self):
+        """Stop the JVM immediately."""
+        self.process.kill()
+        self.process.wait()
+        if self.errors is not subprocess.DEVNULL:
+            self.errors.close()
+
+    def close(self):
+        """Stop the JVM once its current instance is solved."""
+        if self.alive():
+            self.process.stdin.close()
+            self.process.wait()
+        if self.errors is not subprocess.DEVNULL:
+            self.errors.close()
+
+
+class SolverPool():
+    """A pool of persistent Akiba-Iwata solver JVMs.
+
+    Each JVM is started on first use and then solves one instance at a time,
+    so JVM startup and JIT warm-up are paid once per worker rather than once
+    per instance. The solver cannot be interrupted, so a worker whose
+    instance times out or runs out of memory is killed and replaced by a
+    fresh one. The pool may be shared by several threads.
+    """
+
+    def __init__(self, size=1, classpath=AKIBA_IWATA_CLASSPATH, limits=None):
+        """Initialize SolverPool.
+
+        Parameters
+        ----------
+        size : int
+            Number of JVMs, i.e. of instances solved at once.
+        classpath : str
+            Classpath of the compiled solver and `SolverServer`.
+        limits : src.limits.Limits
+            Optional memory and CPU limits of every JVM.
+        """
+        self.classpath = classpath
+        self.limits = limits
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(None)
+
+    def solve(self, path, timeout=None):
+        """Solve a snap file on an idle worker.
+
+        Returns
+        -------
+        tuple
+            (time, certificate, usage) where time is measured inside the
+            JVM and usage is the `src.usage.Usage` of the worker during the
+            job. Its peak resident set size is that of the whole JVM.
+
+        Raises
+        ------
+        subprocess.TimeoutExpired
+            Raised if no solution is found within the timeout. The worker
+            is recycled beforehand.
+        src.limits.MemoryLimitExceeded
+            Raised if the worker exceeds its memory limit. The worker is
+            recycled beforehand.
+        """
+        worker = self._idle.get()
+        try:
+            if worker is None or not worker.alive():
+                worker = _Worker(self.classpath, self.limits)
+            return worker.solve(path, timeout)
+        finally:
+            # Recycle a worker left with an unanswered request
+            if worker is not None and worker.busy:
+                worker.kill()
+                worker = None
+            self._idle.put(worker)
+
+    def close(self):
+        """Stop every idle worker."""
+        while not self._idle.empty():
+            worker = self._idle.get()
+            if worker is not None:
+                worker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def default_pool():
+    """Return a pool shared by calls to `solve`, starting it if needed."""
+    global _pool
+    if _pool is None:
+        _pool = SolverPool()
+        atexit.register(_pool.close)
+    return _pool
+
+
+@contextmanager
+def _named_input(source):
+    """Provide a graph as a path the solver JVM can open.
+
+    Plain files are used directly. Compressed files and in-memory graphs
+    are streamed in snap format through a named pipe by a background
+    thread, since the JVM reads requests from its own stdin.
+    """
+    if is_path(source) and not is_compressed(resolve_path(source)):
+        yield str(Path(str(resolve_path(source))).resolve())
+        return
+
+    directory = tempfile.mkdtemp()
+    fifo = os.path.join(directory, 'graph.snap')
+    os.mkfifo(fifo)
+
+    def _feed():
+        try:
+            with open(fifo, 'w') as outfile:
+                if is_path(source):
+                    with open_path(resolve_path(source), 'r') as infile:
+                        shutil.copyfileobj(infile, outfile, PIPE_CHUNK_SIZE)
+                else:
+                    outfile.writelines(snap_lines(source))
+        except BrokenPipeError:
+            # The solver stopped reading
+            pass
+
+    feeder = threading.Thread(target=_feed, daemon=True)
+    feeder.start()
+    try:
+        yield fifo
+    finally:
+        # Drain the pipe if the solver stopped before reading all of it
+        if feeder.is_alive():
+            fd = os.open(fifo, os.O_RDONLY | os.O_NONBLOCK)
+            try:
+                while feeder.is_alive():
+                    try:
+                        os.read(fd, PIPE_CHUNK_SIZE)
+                    except BlockingIOError:
+                        feeder.join(0.01)
+            finally:
+                os.close(fd)
+        feeder.join()
+        shutil.rmtree(directory)
+
+
+def _solve_once(filename, timeout=None, limits=None):
+    """Solve a snap file or in-memory graph in a fresh JVM.
 
     Returns
     -------
     tuple
-        (time, size, certificate)
-
-    Raises
-    ------
-    subprocess.TimeoutExpired
-        Raised if a timeout is specified and no solution is found
-        within the timelimit. The process is killed beforehand.
+        (time, certificate, usage) where time includes JVM startup.
     """
 
-    # Read first line of file to get number of vertices
-    with open(filename, 'r') as ifile:
-        num_vertices = int(ifile.readline().split()[2])
+    # Compressed and in-memory inputs are streamed to the solver over stdin
+    filename, stdin = solver_input(filename, file_format='snap')
 
     # Get start time
     start = time.time()
 
     # Create subprocess
-    proc = subprocess.Popen(
-        ['java', '-cp', 'src/akiba-iwata-src/bin', 'Main', '-p', filename],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
+    args, env, preexec_fn = _java(limits)
+    try:
+        proc = Popen(
+            args + ['-cp', AKIBA_IWATA_CLASSPATH, 'Main', '-p', filename],
+            stdin=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            preexec_fn=preexec_fn
+        )
+    finally:
+        if stdin is not None:
+            os.close(stdin)
 
     # Wait with timeout for the process to finish and grab output.
     try:
         stdout, stderr = proc.communicate(timeout=timeout)
     except subprocess.TimeoutExpired:
         proc.kill()
+        proc.wait()
         raise
 
     # Get total time
     total_time = time.time() - start
 
-    # Get output and pop the first line (which is the size)
-    certificate = list(map(int, bytes.decode(stdout, 'utf-8').strip().split()))
-    certificate.pop(0)
+    # Error on failure
+    check(limits, proc.returncode, stderr)
+    if proc.returncode:
+        raise Exception(stderr.decode('utf-8'))
+
+    # Get output and drop the first value, which is the size
+    certificate = list(map(int, stdout.decode('utf-8').split()))[1:]
+    return total_time, certificate, proc.usage
+
+
+def solve(filename, timeout=None, convert_to_oct=False, pool=None,
+          return_usage=False, limits=None):
+    """Run akiba-iwata on the given file.
+
+    By default the instance is solved by a fresh JVM, and the time includes
+    its startup. Given a pool of persistent JVMs, e.g. `default_pool()`, the
+    instance is solved by one of them instead, and the time is measured
+    inside the JVM. Pools are opt-in until `SolverServer` has been built
+    and run end to end against the pinned upstream solver.
+
+    Parameters
+    ----------
+    filename : string, Networkx Graph or tuple
+        File containing problem definition. May be gzip, xz or bz2
+        compressed. Alternatively an in-memory OCT graph (a NetworkX Graph
+        or a `(num_vertices, edges)` pair, labeled 0..n-1), whose VC doubling
+        is streamed to the solver in snap format over a pipe.
+    timeout : float
+        Optional timeout in seconds
+    convert_to_oct : bool
+        Whether or not to convert to an OCT certificate
+    pool : SolverPool
+        Optional pool solving the instance.
+    return_usage : bool
+        Whether to also return the `src.usage.Usage` of the JVM during the
+        job.
+    limits : src.limits.Limits
+        Optional memory and CPU limits of the fresh JVM. The limits of a
+        pool are set when it is created.
+
+    Returns
+    -------
+    tuple
+        (time, size, certificate), followed by the usage if requested.
+
+    Raises
+    ------
+    subprocess.TimeoutExpired
+        Raised if a timeout is specified and no solution is found
+        within the timelimit. The JVM is killed, or replaced in a pool,
+        beforehand.
+    src.limits.MemoryLimitExceeded
+        Raised if the solver exceeds its memory limit.
+    """
+    if limits is not None and pool is not None:
+        raise Exception('Limits of a pool are set when it is created')
+
+    # Read first line of file to get number of vertices. In-memory graphs
+    # are doubled when streamed.
+    if is_path(filename):
+        filename = resolve_path(filename)
+        with open_path(filename, 'r') as ifile:
+            num_vertices = int(ifile.readline().split()[2])
+    else:
+        num_vertices = 2 * len(graph_parts(filename)[1])
+
+    # Solve in a fresh JVM or on the pool
+    if pool is None:
+        total_time, certificate, usage = _solve_once(
+            filename, timeout=timeout, limits=limits
+        )
+    else:
+        with _named_input(filename) as path:
+            total_time, certificate, usage = pool.solve(
+                path, timeout=timeout
+            )
 
     # Convert to OCT
     if convert_to_oct:
         certificate = _certificate_to_oct(num_vertices, certificate)
 
     # Return
+    if return_usage:
+        return round(total_time, 1), len(certificate), certificate, usage
     return round(total_time, 1), len(certificate), certificate
 
 
+async def solve_async(filename, timeout=None, convert_to_oct=False,
+                      pool=None, runner=None, limits=None):
+    """Run akiba-iwata as a job of an asyncio runner.
+
+    Parameters are as for `solve`, and runner is a `src.runner.Runner`,
+    defaulting to the shared one. The pool should have as many workers as
+    the jobs meant to run at once.
+    """
+    if runner is None:
+        runner = default_runner()
+    return await runner.run_blocking(
+        solve, filename, timeout=timeout, convert_to_oct=convert_to_oct,
+        pool=pool, limits=limits
+    )
+
+
 def main():
     """Run."""
 
@@ -1,3 +1,7 @@
+#include <algorithm>
+#include <stdexcept>
+#include <utility>
+
 #include "Graph.hpp"
 
 
@@ -8,48 +12,85 @@ Graph::Graph(std::string filename)
     infile >> num_vertices >> num_edges;
 
     this->num_vertices = num_vertices;
-    neighbors.resize(num_vertices);
-    vertices_active = std::vector<bool>(num_vertices, true);
+    num_active = num_vertices;
+    vertices_active = std::vector<char>(num_vertices, true);
 
+    /* Read the edges, counting the neighbors of every vertex */
+    std::vector<std::pair<int, int>> edges;
+    std::vector<int> offsets(num_vertices + 1, 0);
     int vertex_1 = -1, vertex_2 = -1;
     while(infile.good())
     {
       infile >> vertex_1 >> vertex_2;
-      if (vertex_1 != -1 && vertex_2 != -1) add_edge(vertex_1, vertex_2);
+      if (vertex_1 != -1 && vertex_2 != -1) {
+          if (vertex_1 < 0 || vertex_1 >= num_vertices ||
+              vertex_2 < 0 || vertex_2 >= num_vertices) {
+              throw std::out_of_range("Edge endpoint out of range");
+          }
+          edges.emplace_back(vertex_1, vertex_2);
+          ++offsets[vertex_1 + 1];
+          if (vertex_1 != vertex_2) ++offsets[vertex_2 + 1];
+      }
     }
     infile.close();
-}
 
-void Graph::add_edge(int vertex_1, int vertex_2)
-{
-    neighbors.at(vertex_1).insert(vertex_2);
-    neighbors.at(vertex_2).insert(vertex_1);
-}
+    /* Place both directions of every edge in its row */
+    for (int vertex = 0; vertex < num_vertices; ++vertex)
+    {
+        offsets[vertex + 1] += offsets[vertex];
+    }
+    std::vector<int> neighbors(offsets[num_vertices]);
+    std::vector<int> next(offsets.begin(), offsets.end() - 1);
+    for (auto edge : edges)
+    {
+        neighbors[next[edge.first]++] = edge.second;
+        if (edge.first != edge.second) {
+            neighbors[next[edge.second]++] = edge.first;
+        }
+    }
 
-bool Graph::has_edge(int vertex_1, int vertex_2)
-{
-    return neighbors[vertex_1].find(vertex_2) != neighbors[vertex_1].end();
+    /* Sort rows and drop duplicate edges, compacting in place */
+    int size = 0;
+    int begin = 0;
+    for (int vertex = 0; vertex < num_vertices; ++vertex)
+    {
+        int end = offsets[vertex + 1];
+        std::sort(neighbors.begin() + begin, neighbors.begin() + end);
+        auto last = std::unique(
+            neighbors.begin() + begin, neighbors.begin() + end
+        );
+        offsets[vertex] = size;
+        size = std::copy(
+            neighbors.begin() + begin, last, neighbors.begin() + size
+        ) - neighbors.begin();
+        begin = end;
+    }
+    offsets[num_vertices] = size;
+    neighbors.resize(size);
+
+    /* Degrees start as the row lengths */
+    degrees.resize(num_vertices);
+    for (int vertex = 0; vertex < num_vertices; ++vertex)
+    {
+        degrees[vertex] = offsets[vertex + 1] - offsets[vertex];
+    }
+
+    auto shared = std::make_shared<Adjacency>();
+    shared->offsets = std::move(offsets);
+    shared->neighbors = std::move(neighbors);
+    adjacency = shared;
 }
 
-void Graph::remove_edge(int vertex_1, int vertex_2)
+bool Graph::has_edge(int vertex_1, int vertex_2)
 {
-    neighbors.at(vertex_1).erase(vertex_2);
-    neighbors.at(vertex_2).erase(vertex_1);
+    const int *first = adjacency->neighbors.data() + adjacency->offsets[vertex_1];
+    const int *last = adjacency->neighbors.data() + adjacency->offsets[vertex_1 + 1];
+    return is_active(vertex_2) && std::binary_search(first, last, vertex_2);
 }
 
 void Graph::remove_vertex(int vertex)
 {
-    if (!is_active(vertex)) {
-        return;
-    }
-
-    /* Wipe all edges involving this vertex */
-    for (auto neighbor : neighbors[vertex])
-    {
-          neighbors[neighbor].erase(vertex);
-    }
-    /* May also want to wipe neighbors[vertex]? */
-    vertices_active[vertex] = false;
+    remove_vertex(vertex, [](int) {});
 }
 
 int Graph::get_num_vertices()
@@ -57,35 +98,49 @@ int Graph::get_num_vertices()
     return num_vertices;
 }
 
+/**
+ * Provides the number of vertices currently marked as active.
+ *
+ * @return Number of active vertices.
+ */
+int Graph::get_num_active()
+{
+    return num_active;
+}
+
 int Graph::get_num_edges()
 {
     int result = 0;
     for (int vertex = 0; vertex < num_vertices; ++vertex)
     {
-        result += neighbors[vertex].size();
+        if (is_active(vertex)) result += degrees[vertex];
     }
     return result / 2;
 }
 
-std::set<int> Graph::get_neighbors(int vertex)
+Graph::Neighbors Graph::get_neighbors(int vertex)
 {
-    return neighbors[vertex];
+    const int *neighbors = adjacency->neighbors.data();
+    return Neighbors(
+        neighbors + adjacency->offsets[vertex],
+        neighbors + adjacency->offsets[vertex + 1],
+        vertices_active.data()
+    );
 }
 
 int Graph::get_degree(int vertex)
 {
-    return neighbors[vertex].size();
+    return degrees[vertex];
 }
 
 std::vector<int> Graph::get_min_degree_vertices()
 {
     std::vector<int> result;
-    result.resize(num_vertices);
     int min_degree = num_vertices;
     for (int i = 0; i < num_vertices; ++i)
     {
         if (vertices_active[i]) {
-            int degree = neighbors[i].size();
+            int degree = degrees[i];
             if (degree < min_degree) {
                 result.clear();
                 min_degree = degree;
@@ -107,6 +162,7 @@ std::vector<int> Graph::get_min_degree_vertices()
 std::vector<int> Graph::get_vertices()
 {
     std::vector<int> vertices;
+    vertices.reserve(num_active);
     for (int i = 0; i < get_num_vertices(); i++) {
         if (is_active(i)) vertices.push_back(i);
     }
@@ -124,6 +180,6 @@ void Graph::print_stats()
     std::cout << " - " << num_vertices << " vertices" << std::endl;
     for (int i = 0; i < num_vertices; ++i)
     {
-      std::cout << " - Vertex " << i << " has " << neighbors[i].size() << " neighbors" << std::endl;
+      std::cout << " - Vertex " << i << " has " << degrees[i] << " neighbors" << std::endl;
     }
 }
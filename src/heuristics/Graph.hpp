@@ -2,7 +2,7 @@
 #define GRAPH_HPP
 
 #include <cstddef>
-#include <set>
+#include <memory>
 #include <vector>
 #include <fstream>
 #include <string>
@@ -10,21 +10,121 @@
 
 #include "Debug.hpp"
 
+/**
+ * Undirected graph from which vertices can be removed.
+ *
+ * Adjacency is stored in compressed sparse row form: the neighbors of a
+ * vertex are a sorted, duplicate free slice of one flat array. It never
+ * changes once loaded and is shared between copies, so copying a graph only
+ * copies its degree and active arrays. Removing a vertex marks it inactive
+ * and decrements the degrees of its active neighbors.
+ */
 class Graph {
+    struct Adjacency {
+        std::vector<int> offsets;
+        std::vector<int> neighbors;
+    };
+
     int num_vertices;
-    std::vector<std::set<int>> neighbors;
-    std::vector<bool> vertices_active;
+    int num_active;
+    std::shared_ptr<const Adjacency> adjacency;
+    std::vector<int> degrees;
+    std::vector<char> vertices_active;
 
   public:
-    Graph(int num_vertices);
+    /**
+     * Iterator over the active vertices of a slice of neighbors.
+     */
+    class NeighborIterator {
+        const int *position;
+        const int *end;
+        const char *active;
+
+        void skip_inactive()
+        {
+            while (position != end && !active[*position]) ++position;
+        }
+
+      public:
+        NeighborIterator(const int *position, const int *end,
+                         const char *active)
+            : position(position), end(end), active(active)
+        {
+            skip_inactive();
+        }
+
+        int operator*() const { return *position; }
+
+        NeighborIterator &operator++()
+        {
+            ++position;
+            skip_inactive();
+            return *this;
+        }
+
+        bool operator==(const NeighborIterator &other) const
+        {
+            return position == other.position;
+        }
+
+        bool operator!=(const NeighborIterator &other) const
+        {
+            return position != other.position;
+        }
+    };
+
+    /**
+     * The active neighbors of a vertex in increasing order, viewed without
+     * copying. Vertices removed while iterating are skipped once reached.
+     */
+    class Neighbors {
+        const int *first;
+        const int *last;
+        const char *active;
+
+      public:
+        Neighbors(const int *first, const int *last, const char *active)
+            : first(first), last(last), active(active) {}
+
+        NeighborIterator begin() const
+        {
+            return NeighborIterator(first, last, active);
+        }
+
+        NeighborIterator end() const
+        {
+            return NeighborIterator(last, last, active);
+        }
+    };
+
     Graph(std::string filename);
-    void add_edge(int vertex_1, int vertex_2);
     bool has_edge(int vertex_1, int vertex_2);
-    void remove_edge(int vertex_1, int vertex_2);
     void remove_vertex(int vertex);
-    std::set<int> get_neighbors(int vertex);
+
+    /**
+     * Removes a vertex, calling on_neighbor with every active neighbor
+     * once its degree is decremented. The degree of a removed vertex is
+     * that at its removal.
+     */
+    template <typename Function>
+    void remove_vertex(int vertex, Function on_neighbor)
+    {
+        if (!is_active(vertex)) {
+            return;
+        }
+        vertices_active[vertex] = false;
+        --num_active;
+        for (int neighbor : get_neighbors(vertex))
+        {
+            --degrees[neighbor];
+            on_neighbor(neighbor);
+        }
+    }
+
+    Neighbors get_neighbors(int vertex);
     int get_degree(int vertex);
     int get_num_vertices();
+    int get_num_active();
     int get_num_edges();
     std::vector<int> get_min_degree_vertices();
     std::vector<int> get_vertices();
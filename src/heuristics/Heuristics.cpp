@@ -1,5 +1,163 @@
 #include "Heuristics.hpp"
 
+namespace {
+
+/**
+ * Vertices 0, ..., n - 1 not yet visited by a traversal, supporting removal
+ * and selection of the k-th smallest in O(log n) with a Fenwick tree.
+ */
+class UnvisitedVertices {
+    std::vector<int> tree;
+    std::vector<char> unvisited;
+    int count;
+    int step;
+
+  public:
+    explicit UnvisitedVertices(int num_vertices)
+        : tree(num_vertices + 1, 0), unvisited(num_vertices, true),
+          count(num_vertices), step(1)
+    {
+        for (int i = 1; i <= num_vertices; ++i) {
+            tree[i] += 1;
+            int parent = i + (i & -i);
+            if (parent <= num_vertices) tree[parent] += tree[i];
+        }
+        while (step * 2 <= num_vertices) step *= 2;
+    }
+
+    int size() const { return count; }
+
+    bool contains(int vertex) const { return unvisited[vertex]; }
+
+    void erase(int vertex)
+    {
+        unvisited[vertex] = false;
+        --count;
+        for (int i = vertex + 1; i < (int) tree.size(); i += i & -i) --tree[i];
+    }
+
+    /* The unvisited vertex with idx unvisited vertices before it */
+    int select(long idx) const
+    {
+        int position = 0;
+        for (int size = step; size > 0; size >>= 1) {
+            if (position + size < (int) tree.size()
+                && tree[position + size] <= idx) {
+                position += size;
+                idx -= tree[position];
+            }
+        }
+        return position;
+    }
+};
+
+/**
+ * Active vertices of a graph bucketed by current degree, for choosing a
+ * random vertex of minimum degree. The buckets are slices of one array in
+ * increasing order of degree, possibly with gaps between them, so removing
+ * a vertex or moving it down one bucket when a neighbor is removed takes
+ * O(1). Each move lowers the minimum degree by at most one, so scanning up
+ * for the minimum takes O(n + m) over a run.
+ */
+class MinDegreeQueue {
+    Graph &graph;
+    std::vector<int> order;
+    std::vector<int> position;
+    std::vector<int> first;
+    std::vector<int> last;
+    std::vector<int> degree;
+    std::vector<int> removed;
+    int min_degree;
+
+    void place(int vertex, int index)
+    {
+        order[index] = vertex;
+        position[vertex] = index;
+    }
+
+    /* Take a vertex out of its bucket, leaving a gap after the bucket */
+    void erase(int vertex)
+    {
+        place(order[--last[degree[vertex]]], position[vertex]);
+    }
+
+    /* Move a vertex to the end of the bucket below its own */
+    void move_down(int vertex)
+    {
+        int d = degree[vertex];
+        if (last[d - 1] == first[d]) {
+            place(order[first[d]], position[vertex]);
+            place(vertex, first[d]++);
+            ++last[d - 1];
+        } else {
+            erase(vertex);
+            place(vertex, last[d - 1]++);
+        }
+        degree[vertex] = d - 1;
+    }
+
+  public:
+    explicit MinDegreeQueue(Graph &graph)
+        : graph(graph), position(graph.get_num_vertices(), -1),
+          degree(graph.get_num_vertices(), -1), min_degree(0)
+    {
+        /* Counting sort of the active vertices by degree */
+        int max_degree = 0;
+        for (int vertex = 0; vertex < graph.get_num_vertices(); ++vertex) {
+            if (!graph.is_active(vertex)) continue;
+            degree[vertex] = graph.get_degree(vertex);
+            max_degree = std::max(max_degree, degree[vertex]);
+        }
+        first.assign(max_degree + 1, 0);
+        last.assign(max_degree + 1, 0);
+        for (int vertex = 0; vertex < graph.get_num_vertices(); ++vertex) {
+            if (degree[vertex] >= 0) ++last[degree[vertex]];
+        }
+        for (int d = 1; d <= max_degree; ++d) {
+            first[d] = last[d - 1];
+            last[d] += first[d];
+        }
+        order.resize(last[max_degree]);
+        for (int d = 0; d <= max_degree; ++d) last[d] = first[d];
+        for (int vertex = 0; vertex < graph.get_num_vertices(); ++vertex) {
+            if (degree[vertex] >= 0) place(vertex, last[degree[vertex]]++);
+        }
+    }
+
+    /* A uniformly random vertex of minimum degree, there must be one */
+    int get_random_min_degree_vertex()
+    {
+        while (first[min_degree] == last[min_degree]) ++min_degree;
+        int size = last[min_degree] - first[min_degree];
+        return order[first[min_degree] + rand() % size];
+    }
+
+    /* Remove a vertex and its neighbors from the graph and the queue. They
+       leave the queue first, so no bucket moves are spent on them */
+    void remove_closed_neighborhood(int vertex)
+    {
+        removed.clear();
+        removed.push_back(vertex);
+        for (int neighbor : graph.get_neighbors(vertex)) {
+            if (neighbor != vertex) removed.push_back(neighbor);
+        }
+        for (int v : removed) {
+            erase(v);
+            degree[v] = -1;
+        }
+        for (int v : removed) {
+            graph.remove_vertex(v, [this](int neighbor) {
+                if (degree[neighbor] < 0) return;
+                move_down(neighbor);
+                min_degree = std::min(min_degree, degree[neighbor]);
+            });
+        }
+    }
+};
+
+}
+
+
 std::vector<int> max_greedy_bipartite(Graph &graph, int num_seeds)
 {
 
@@ -47,34 +205,15 @@ std::vector<int> greedy_bipartite(Graph &graph, int seed)
 std::vector<int> min_degree_ind_set(Graph &graph)
 {
     std::vector<int> result;
+    MinDegreeQueue queue(graph);
 
-    /* Initialize the currently unused vertices */
-    std::set<int> vertices;
-    for (int vertex = 0; vertex < graph.get_num_vertices(); ++vertex)
-    {
-        if (graph.is_active(vertex))
-        {
-            vertices.insert(vertex);
-        }
-    }
-
-    while (vertices.size() > 0) {
+    while (graph.get_num_active() > 0) {
 
         /* Choose a random min degree vertex */
-        auto min_degree_vertices = graph.get_min_degree_vertices();
-        int random_index = rand() % min_degree_vertices.size();
-        int chosen_vertex = min_degree_vertices[random_index];
+        int chosen_vertex = queue.get_random_min_degree_vertex();
 
         /* Remove this vertex and its neighbors */
-        auto neighbors = graph.get_neighbors(chosen_vertex);
-        graph.remove_vertex(chosen_vertex);
-        vertices.erase(chosen_vertex);
-
-        for (int neighbor : neighbors)
-        {
-            graph.remove_vertex(neighbor);
-            vertices.erase(neighbor);
-        }
+        queue.remove_closed_neighborhood(chosen_vertex);
 
         /* Add the chosen vertex to the independent set */
         result.push_back(chosen_vertex);
@@ -142,80 +281,77 @@ void luby_ind_set(Graph &graph, std::vector<int> &result) {
     //    S'.insert(vertex) ("if we got here, we're good")
     // S' is the "chosen_vertex"
 
-    std::set<int> vertices;
-    std::set<int> initial_chosen_vertices;
-    std::set<int> chosen_vertices;
+    std::vector<int> vertices = graph.get_vertices();
+    std::vector<int> initial_chosen_vertices;
+    std::vector<int> chosen_vertices;
 
-    /* Initialize the currently unused vertices */
-    /* TODO: Move this internal to the graph class */
-    for (int i = 0; i < graph.get_num_vertices(); i++) {
-        if (graph.is_active(i)) {
-            vertices.insert(i);
-        }
-    }
+    /* Flags of the vertices in the two lists above */
+    std::vector<char> initially_chosen(graph.get_num_vertices(), false);
+    std::vector<char> chosen(graph.get_num_vertices(), false);
 
-    while (vertices.size() > 0) {
-        //fprintf(stderr, "Vertices left: %d\n", vertices.size());
+    while (graph.get_num_active() > 0) {
+        //fprintf(stderr, "Vertices left: %d\n", graph.get_num_active());
 
+        /* Drop the vertices removed in the last round */
+        vertices.erase(
+            std::remove_if(vertices.begin(), vertices.end(),
+                [&graph](int vertex) { return !graph.is_active(vertex); }),
+            vertices.end());
+
+        for (int vertex : initial_chosen_vertices) initially_chosen[vertex] = false;
+        for (int vertex : chosen_vertices) chosen[vertex] = false;
         initial_chosen_vertices.clear();
         chosen_vertices.clear();
 
         /* Select the next vertices to be added to the ind set */
-        for (std::set<int>::iterator vertex = vertices.begin();
-            vertex != vertices.end(); ++vertex)
+        for (int vertex : vertices)
         {
             // Add vertex if it has no neighbors, or otherwise with probability 1 / (2 * degree(vertex))
-            if (graph.get_degree(*vertex) == 0 ||
-                (double) rand() / (RAND_MAX) <= 1.0 / (2 * graph.get_degree(*vertex)))
+            if (graph.get_degree(vertex) == 0 ||
+                (double) rand() / (RAND_MAX) <= 1.0 / (2 * graph.get_degree(vertex)))
             {
-                initial_chosen_vertices.insert(*vertex);
-                //fprintf(stderr, "Selecting vertex %d\n", *vertex);
+                initial_chosen_vertices.push_back(vertex);
+                initially_chosen[vertex] = true;
+                //fprintf(stderr, "Selecting vertex %d\n", vertex);
             }
         }
 
         /* Resolve any conflicts in the selected set */
         bool keep;
-        for (std::set<int>::iterator vertex = initial_chosen_vertices.begin();
-            vertex != initial_chosen_vertices.end(); ++vertex) {
-            std::set<int> neighbors = graph.get_neighbors(*vertex);
-
+        for (int vertex : initial_chosen_vertices) {
             keep = true;
-            for (std::set<int>::iterator neighbor = neighbors.begin();
-                neighbor != neighbors.end(); ++neighbor)
+            for (int neighbor : graph.get_neighbors(vertex))
             {
-                if ( (initial_chosen_vertices.find(*neighbor) != initial_chosen_vertices.end()) \
-                    && ( chosen_vertices.find(*neighbor) != chosen_vertices.end() \
-                    ||  graph.get_degree(*vertex) < graph.get_degree(*neighbor)) ) {
-                        //fprintf(stderr, "Found a conflict: %d, %d\n", *vertex, *neighbor);
+                if (initially_chosen[neighbor]
+                    && (chosen[neighbor]
+                    ||  graph.get_degree(vertex) < graph.get_degree(neighbor))) {
+                        //fprintf(stderr, "Found a conflict: %d, %d\n", vertex, neighbor);
                         keep = false;
                         break;
                 }
             }
             if (keep) {
-                //fprintf(stderr, "Selecting to keep %d\n", *vertex);
-                chosen_vertices.insert(*vertex);
+                //fprintf(stderr, "Selecting to keep %d\n", vertex);
+                chosen_vertices.push_back(vertex);
+                chosen[vertex] = true;
             }
         }
 
         /* Remove the selected vertices and their neighbors from the graph */
-        for (std::set<int>::iterator vertex = chosen_vertices.begin();
-            vertex != chosen_vertices.end(); ++vertex)
+        for (int vertex : chosen_vertices)
         {
             /* Remove this vertex and its neighbors */
-            std::set<int> neighbors = graph.get_neighbors(*vertex);
-            graph.remove_vertex(*vertex);
-            vertices.erase(*vertex);
-            //fprintf(stderr, "Removing vertex %d\n", *vertex);
-
-            for (std::set<int>::iterator neighbor = neighbors.begin(); \
-                neighbor != neighbors.end(); ++neighbor) {
-                    //fprintf(stderr, "   Removing neighbor %d\n", *neighbor);
-                  graph.remove_vertex(*neighbor);
-                  vertices.erase(*neighbor);
+            auto neighbors = graph.get_neighbors(vertex);
+            graph.remove_vertex(vertex);
+            //fprintf(stderr, "Removing vertex %d\n", vertex);
+
+            for (int neighbor : neighbors) {
+                  //fprintf(stderr, "   Removing neighbor %d\n", neighbor);
+                  graph.remove_vertex(neighbor);
             }
 
             /* Add the chosen vertex to the independent set */
-            result.push_back(*vertex);
+            result.push_back(vertex);
         }
     }
 }
@@ -237,12 +373,10 @@ std::vector<int> greedy_dfs_bipartite(Graph &input_graph, int seed) {
     Graph graph(input_graph);
 
     // Assigned colors. Default everything to 0 = no color
-    std::unordered_map<int, int> colors;
-    for (int i = 0; i < graph.get_num_vertices(); i++) colors[i] = 0;
+    std::vector<int> colors(graph.get_num_vertices(), 0);
 
     // Initialize all vertices as not visited
-    std::set<int> not_visited;
-    for (int i = 0; i < graph.get_num_vertices(); i++) not_visited.insert(i);
+    UnvisitedVertices not_visited(graph.get_num_vertices());
 
     // Keep iterating until all vertices are visited.
     // This accounts for disconnected components.
@@ -251,12 +385,8 @@ std::vector<int> greedy_dfs_bipartite(Graph &input_graph, int seed) {
         // Get random index into not visited set
         long idx = rand() % not_visited.size();
 
-        // Create iterator and advance it
-        auto iterator = not_visited.begin();
-        std::advance(iterator, idx);
-
-        // Get root vertex at idx using the iterator
-        int root = *(iterator);
+        // Get root vertex at idx
+        int root = not_visited.select(idx);
 
         // Push to DFS stack
         std::stack<int> vertices;
@@ -273,7 +403,7 @@ std::vector<int> greedy_dfs_bipartite(Graph &input_graph, int seed) {
             // If this vertex was visited by some other branch while it was
             // sitting on the stack, skip. We shouldn't visit twice. Otherwise,
             // remove this vertex from the not visited set.
-            if (not_visited.find(vertex) == not_visited.end()) {
+            if (!not_visited.contains(vertex)) {
                 continue;
             }
             else {
@@ -306,7 +436,7 @@ std::vector<int> greedy_dfs_bipartite(Graph &input_graph, int seed) {
 
             // Push neighbors to stack if they haven't already been visited
             for (auto n : neighbors) {
-                if (not_visited.find(n) != not_visited.end()) {
+                if (not_visited.contains(n)) {
                     vertices.push(n);
                 }
             }
@@ -337,12 +467,10 @@ std::vector<int> greedy_bfs_bipartite(Graph &input_graph, int seed) {
     Graph graph(input_graph);
 
     // Assigned colors. Default everything to 0 = no color
-    std::unordered_map<int, int> colors;
-    for (int i = 0; i < graph.get_num_vertices(); i++) colors[i] = 0;
+    std::vector<int> colors(graph.get_num_vertices(), 0);
 
     // Initialize all vertices as not visited
-    std::set<int> not_visited;
-    for (int i = 0; i < graph.get_num_vertices(); i++) not_visited.insert(i);
+    UnvisitedVertices not_visited(graph.get_num_vertices());
 
     // Keep iterating until all vertices are visited.
     // This accounts for disconnected components.
@@ -351,12 +479,8 @@ std::vector<int> greedy_bfs_bipartite(Graph &input_graph, int seed) {
         // Get random index into not visited set
         long idx = rand() % not_visited.size();
 
-        // Create iterator and advance it
-        auto iterator = not_visited.begin();
-        std::advance(iterator, idx);
-
-        // Get root vertex at idx using the iterator
-        int root = *(iterator);
+        // Get root vertex at idx
+        int root = not_visited.select(idx);
 
         // Push to BFS queue
         std::queue<int> vertices;
@@ -373,7 +497,7 @@ std::vector<int> greedy_bfs_bipartite(Graph &input_graph, int seed) {
             // If this vertex was visited by some other branch while it was
             // sitting on the queue, skip. We shouldn't visit twice. Otherwise,
             // remove this vertex from the not visited set.
-            if (not_visited.find(vertex) == not_visited.end()) {
+            if (!not_visited.contains(vertex)) {
                 continue;
             }
             else {
@@ -406,7 +530,7 @@ std::vector<int> greedy_bfs_bipartite(Graph &input_graph, int seed) {
 
             // Push neighbors to stack if they haven't already been visited
             for (auto n : neighbors) {
-                if (not_visited.find(n) != not_visited.end()) {
+                if (not_visited.contains(n)) {
                     vertices.push(n);
                 }
             }
@@ -0,0 +1,137 @@
+"""Run the heuristic ensemble solver and print the result."""
+
+
+# Imports
+from pathlib import Path
+from src.limits import check, preexec
+from src.preprocessing.graphs import solver_input
+from src.runner import default_runner
+from src.usage import Popen
+import argparse
+import os
+import re
+import subprocess
+
+
+# Path to the compiled ensemble binary
+HEURISTIC_SOLVER = str(Path(__file__).parent / 'heuristic_solver')
+
+
+def _command(filename, timeout):
+    """Build the command line and stdin of the ensemble.
+
+    Returns
+    -------
+    tuple
+        (args, stdin) where stdin is None or a file descriptor to close
+        once the process is spawned.
+    """
+
+    # Compressed and in-memory inputs are streamed over stdin
+    filename, stdin = solver_input(filename, file_format='edgelist')
+    return [HEURISTIC_SOLVER, str(int(timeout)), filename], stdin
+
+
+def _parse(stdout):
+    """Parse the output of the ensemble into (time, size, certificate)."""
+    match = re.match(
+        r'(\d+),(\d+),"\[((\d+)(,(\d+))*)?\]"',
+        bytes.decode(stdout, 'utf-8').strip()
+    )
+    size = int(match.group(1))
+    time = int(match.group(2))
+    certificate = (
+        list(map(int, match.group(3).split(','))) if match.group(3) else []
+    )
+    return time, size, certificate
+
+
+def solve(filename, timeout, return_usage=False, limits=None):
+    """Run the heuristic ensemble on the given graph.
+
+    Parameters
+    ----------
+    filename : string, Networkx Graph or tuple
+        Path to an edgelist formatted graph file. May be gzip, xz or bz2
+        compressed. Alternatively an in-memory graph (a NetworkX Graph or a
+        `(num_vertices, edges)` pair, labeled 0..n-1), which is streamed to
+        the solver in edgelist format over a pipe.
+    timeout : int
+        Timeout in milliseconds.
+    return_usage : bool
+        Whether to also return the `src.usage.Usage` of the solver process.
+    limits : src.limits.Limits
+        Optional memory and CPU limits of the solver process.
+
+    Returns
+    -------
+    tuple
+        (time, size, certificate) where time is in milliseconds, followed
+        by the usage if requested.
+
+    Raises
+    ------
+    src.limits.MemoryLimitExceeded
+        Raised if the solver exceeds its memory limit.
+    """
+
+    # Run subprocess
+    args, stdin = _command(filename, timeout)
+    proc = Popen(
+        args,
+        stdin=stdin,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        preexec_fn=preexec(limits)
+    )
+    if stdin is not None:
+        os.close(stdin)
+    stdout, stderr = proc.communicate()
+
+    # Error if process failed
+    check(limits, proc.returncode, stderr)
+    if proc.returncode:
+        raise Exception(stderr)
+
+    # Parse results
+    if return_usage:
+        return _parse(stdout) + (proc.usage,)
+    return _parse(stdout)
+
+
+async def solve_async(filename, timeout, runner=None, limits=None):
+    """Run the heuristic ensemble as a job of an asyncio runner.
+
+    Parameters are as for `solve`, and runner is a `src.runner.Runner`,
+    defaulting to the shared one.
+    """
+    if runner is None:
+        runner = default_runner()
+    args, stdin = _command(filename, timeout)
+    completed = await runner.run(args, stdin=stdin, limits=limits)
+    check(limits, completed.returncode, completed.stderr)
+    if completed.returncode:
+        raise Exception(completed.stderr)
+    return _parse(completed.stdout)
+
+
+def main():
+    """Run."""
+
+    # Get an argument parser and parse arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'timeout',
+        help='Timeout in milliseconds.',
+        type=int
+    )
+    parser.add_argument('file', help='Path to an edgelist formatted file.')
+    argv = parser.parse_args()
+
+    # Run and print
+    print('{},{},"{}"'.format(*solve(argv.file, argv.timeout)))
+
+
+# Invoke main
+if __name__ == '__main__':
+    main()
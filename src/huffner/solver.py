@@ -3,18 +3,136 @@
 
 # Imports
 from pathlib import Path
+from src.limits import check, preexec
+from src.preprocessing.graphs import solver_input
+from src.runner import default_runner, TERMINATE_GRACE
+from src.usage import Popen
 import argparse
+import os
+import signal
 import subprocess
+import threading
 import time
 
 
-def solve(filename, timeout=None, preprocessing=0, seed=0, htime=0.25):
+def _command(filename, preprocessing, seed, htime):
+    """Build the command line and stdin of Huffner.
+
+    Returns
+    -------
+    tuple
+        (args, stdin) where stdin is None or a file descriptor to close
+        once the process is spawned.
+    """
+
+    # Get path to Huffner binary
+    huffner = str(Path(__file__).parent.parent / 'huffner-src/occ')
+
+    # Compressed and in-memory inputs are streamed to Huffner over stdin
+    filename, stdin = solver_input(filename, file_format='huffner')
+
+    return [
+        huffner,
+        '-p', str(preprocessing),
+        '-s', str(seed),
+        '-t', str(int(htime * 1000)),
+        '-f', filename
+    ], stdin
+
+
+def _parse(stdout):
+    """Parse the certificate printed by Huffner."""
+    return bytes.decode(stdout, 'utf-8').strip().split('\n')[1:]
+
+
+def _recover(lines, returncode, stderr):
+    """Recover the certificate Huffner reported when it was stopped.
+
+    Huffner reports its best solution so far when terminated. The report
+    is only trusted if Huffner was not killed, since it may have been cut
+    off, and a last line without a newline is dropped for the same reason.
+
+    Parameters
+    ----------
+    lines : list<tuple>
+        (time, line) pairs of stdout, with line in bytes and time the
+        seconds since the start at which it was received.
+    returncode : int
+        Exit status of Huffner.
+    stderr : bytes
+        Error output of Huffner.
+
+    Returns
+    -------
+    tuple
+        (time, certificate) where time is when the report started.
+    """
+    if returncode == -signal.SIGKILL:
+        raise Exception('Huffner was killed before reporting a solution')
+    if returncode and lines and not lines[-1][1].endswith(b'\n'):
+        lines = lines[:-1]
+    if not lines:
+        raise Exception(stderr or 'Huffner reported no solution')
+    return lines[0][0], _parse(b''.join(line for _, line in lines))
+
+
+def _communicate_anytime(proc, start, timeout):
+    """Wait for Huffner, stopping it at its timeout.
+
+    Output is read line by line on threads, so that everything Huffner
+    printed is kept however it exits.
+
+    Returns
+    -------
+    tuple
+        (lines, stderr, timed_out) where lines are (time, line) pairs.
+    """
+    lines = []
+    errors = []
+
+    def _read_stdout():
+        for line in iter(proc.stdout.readline, b''):
+            lines.append((time.time() - start, line))
+
+    def _read_stderr():
+        errors.append(proc.stderr.read())
+
+    readers = [
+        threading.Thread(target=_read_stdout, daemon=True),
+        threading.Thread(target=_read_stderr, daemon=True)
+    ]
+    for reader in readers:
+        reader.start()
+
+    # Terminate at the timeout, giving Huffner time to report
+    timed_out = False
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        proc.terminate()
+        try:
+            proc.wait(timeout=TERMINATE_GRACE)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    for reader in readers:
+        reader.join()
+    return lines, errors[0], timed_out
+
+
+def solve(filename, timeout=None, preprocessing=0, seed=0, htime=0.25,
+          return_usage=False, anytime=False, limits=None):
     """Solve OCT using Huffner.
 
     Parameters
     ----------
-    filename : string
-        Path to graph input file.
+    filename : string, Networkx Graph or tuple
+        Path to graph input file. May be gzip, xz or bz2 compressed.
+        Alternatively an in-memory graph (a NetworkX Graph or a
+        `(num_vertices, edges)` pair), which is streamed to the solver in
+        Huffner format over a pipe.
     timeout : float
         Timeout in seconds.
     preprocessing : int
@@ -23,46 +141,125 @@ def solve(filename, timeout=None, preprocessing=0, seed=0, htime=0.25):
         Seed to be used for shuffling.
     htime : float
         Number of seconds to run heuristics for. Defaults to 0.25.
+    return_usage : bool
+        Whether to also return the `src.usage.Usage` of the solver process.
+    anytime : bool
+        Whether to return the best solution found when the timeout is hit.
+        Its time is then when Huffner reported it, rather than the timeout.
+        Huffner is given `src.runner.TERMINATE_GRACE` seconds to report
+        before it is killed.
+    limits : src.limits.Limits
+        Optional memory and CPU limits of the solver process.
+
+    Returns
+    -------
+    tuple
+        (time, size, certificate), followed by the usage if requested.
+
+    Raises
+    ------
+    src.limits.MemoryLimitExceeded
+        Raised if the solver exceeds its memory limit.
     """
 
-    # Get path to Huffner binary
-    huffner = str(Path(__file__).parent.parent / 'huffner-src/occ')
+    # Get the command line
+    args, stdin = _command(filename, preprocessing, seed, htime)
 
     # Get start time
     start = time.time()
 
     # Create Huffner subprocess
-    proc = subprocess.Popen(
-        [
-            huffner,
-            '-p', str(preprocessing),
-            '-s', str(seed),
-            '-t', str(int(htime * 1000)),
-            '-f', filename
-        ],
+    proc = Popen(
+        args,
+        stdin=stdin,
         stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
+        stderr=subprocess.PIPE,
+        preexec_fn=preexec(limits)
     )
+    if stdin is not None:
+        os.close(stdin)
 
     # Wait for results. If timeout is hit, terminate the process
     # and then get results.
-    try:
-        stdout, stderr = proc.communicate(timeout=timeout)
-        total_time = round(time.time() - start, 1)
-    except subprocess.TimeoutExpired:
-        proc.terminate()
-        stdout, stderr = proc.communicate()
-        total_time = timeout
+    if anytime:
+        lines, stderr, timed_out = _communicate_anytime(proc, start, timeout)
+        check(limits, proc.returncode, stderr)
+        if timed_out:
+            total_time, certificate = _recover(
+                lines, proc.returncode, stderr
+            )
+            total_time = round(total_time, 1)
+        elif proc.returncode:
+            raise Exception(stderr)
+        else:
+            total_time = round(time.time() - start, 1)
+            certificate = _parse(b''.join(line for _, line in lines))
+    else:
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+            total_time = round(time.time() - start, 1)
+        except subprocess.TimeoutExpired:
+            proc.terminate()
+            stdout, stderr = proc.communicate()
+            total_time = timeout
 
-    # Error if process failed
-    if proc.returncode:
-        raise Exception(stderr)
+        # Error if process failed
+        check(limits, proc.returncode, stderr)
+        if proc.returncode:
+            raise Exception(stderr)
+
+        # Decode stdout
+        certificate = _parse(stdout)
+
+    # Return results
+    if return_usage:
+        return total_time, len(certificate), certificate, proc.usage
+    return total_time, len(certificate), certificate
+
+
+async def solve_async(filename, timeout=None, preprocessing=0, seed=0,
+                      htime=0.25, runner=None, anytime=False, limits=None):
+    """Solve OCT using Huffner as a job of an asyncio runner.
+
+    Parameters are as for `solve`, and runner is a `src.runner.Runner`,
+    defaulting to the shared one.
+    """
+    if runner is None:
+        runner = default_runner()
+    args, stdin = _command(filename, preprocessing, seed, htime)
+
+    # Arrival times of stdout lines, for anytime results, on the clock of
+    # the runner's start time
+    arrivals = []
 
-    # Decode stdout
-    stdout = bytes.decode(stdout, 'utf-8').strip().split('\n')
-    certificate = stdout[1:]
+    def _on_line(line):
+        arrivals.append((time.time(), line.encode('utf-8')))
+
+    completed = await runner.run(
+        args,
+        stdin=stdin,
+        timeout=timeout,
+        on_line=_on_line if anytime else None,
+        limits=limits
+    )
+    check(limits, completed.returncode, completed.stderr)
+
+    # Recover the best solution reported when stopped
+    if anytime and completed.timed_out:
+        total_time, certificate = _recover(
+            [(t - completed.start, line) for t, line in arrivals],
+            completed.returncode,
+            completed.stderr
+        )
+        return round(total_time, 1), len(certificate), certificate
+
+    # Error if process failed
+    if completed.returncode:
+        raise Exception(completed.stderr)
 
     # Return results
+    certificate = _parse(completed.stdout)
+    total_time = timeout if completed.timed_out else round(completed.time, 1)
     return total_time, len(certificate), certificate
 
 
@@ -95,6 +292,11 @@ def main():
         type=float,
         default=0.25
     )
+    parser.add_argument(
+        '--anytime',
+        help='Report the best solution found when the timeout is hit.',
+        action='store_true'
+    )
     argv = parser.parse_args()
 
     # Run solver
@@ -103,7 +305,8 @@ def main():
         timeout=argv.timeout,
         preprocessing=argv.preprocessing,
         seed=argv.seed,
-        htime=argv.htime
+        htime=argv.htime,
+        anytime=argv.anytime
     )))
 
 
@@ -0,0 +1,108 @@
+"""Solve many ILP instances on a bounded worker pool.
+
+Every job is an edgelist file together with keyword arguments of
+`src.ilp.solver.solve`. Jobs are started as soon as enough cores are free
+for the threads they use, so that the machine is kept busy without being
+oversubscribed, and their results are yielded as they complete.
+"""
+
+
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import os
+
+from src.ilp.solver import read_edgelist, solve
+
+
+# A solve of the graph in `path` with `solve(G, **options)`. The key is
+# returned untouched with the result, e.g. to describe the experiment
+Job = namedtuple('Job', ['key', 'path', 'options'])
+
+# The outcome of a job, either a solution or the exception raised
+Result = namedtuple('Result', ['job', 'solution', 'error'])
+
+
+def job_cores(options, cores):
+    """Number of cores a job keeps busy.
+
+    GLPK is single threaded whatever the requested threads, and CPLEX uses
+    every core when run with zero threads.
+
+    Parameters
+    ----------
+    options : dict
+        Keyword arguments of the solve.
+    cores : int
+        Number of cores of the pool.
+
+    Returns
+    -------
+    int
+        Number of cores, between 1 and `cores`.
+    """
+    if options.get('solver', 'GLPK') == 'GLPK':
+        return 1
+    threads = int(options.get('threads', 1))
+    return cores if threads <= 0 else min(threads, cores)
+
+
+def _solve_path(path, options):
+    """Read and solve a graph in a worker process.
+
+    Components are solved one after another, since pool workers cannot
+    start a pool of their own.
+    """
+    options = dict(options)
+    options.setdefault('processes', 1)
+    return solve(read_edgelist(path), **options)
+
+
+def solve_batch(jobs, cores=None):
+    """Solve jobs concurrently, yielding results as they complete.
+
+    Jobs are started in order whenever the cores they need are free. A job
+    that does not fit may be overtaken by later, smaller jobs.
+
+    Parameters
+    ----------
+    jobs : iterable<Job>
+        Jobs to solve.
+    cores : int
+        Number of cores to use. Defaults to every core of the machine.
+
+    Returns
+    -------
+    generator
+        One Result per job, in completion order.
+    """
+    if cores is None:
+        cores = os.cpu_count() or 1
+    pending = list(jobs)
+    running = {}
+    free = cores
+
+    with ProcessPoolExecutor(max_workers=cores) as pool:
+        while pending or running:
+
+            # Start every pending job that fits
+            waiting = []
+            for job in pending:
+                needed = job_cores(job.options, cores)
+                if needed <= free:
+                    future = pool.submit(_solve_path, job.path, job.options)
+                    running[future] = (job, needed)
+                    free -= needed
+                else:
+                    waiting.append(job)
+            pending = waiting
+
+            # Report finished jobs and release their cores
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job, needed = running.pop(future)
+                free += needed
+                error = future.exception()
+                if error is None:
+                    yield Result(job, future.result(), None)
+                else:
+                    yield Result(job, None, error)
@@ -0,0 +1,199 @@
+"""Lower bounds on the size of an OCT.
+
+An OCT of G contains an OCT of every induced subgraph, so the OCT sizes of
+vertex disjoint subgraphs add up to a lower bound. Every odd cycle needs at
+least one vertex removed and every clique on k >= 3 vertices k - 2 of them.
+Both kinds of subgraphs are packed greedily, which is fast enough to run
+after any heuristic and proves it optimal whenever the bound matches.
+
+The LP relaxation of the VertexCover formulation on the doubled graph is
+not used: setting every variable to 1/2 is feasible, so it never proves
+more than the trivial bound of zero.
+"""
+
+
+# Imports
+from src.ilp.separation import _odd_cycle_in_walk
+from collections import deque
+import argparse
+
+import numpy as np
+
+
+def _adjacency(G):
+    """Index the vertices of G and list their neighbors.
+
+    Returns
+    -------
+    tuple
+        (adjacency, loops) where adjacency holds the neighbor sets of
+        vertices 0, ..., n-1 in the order of `G.nodes()` and loops is a
+        boolean mask of the vertices with a self loop.
+    """
+    index = {vertex: i for i, vertex in enumerate(G.nodes())}
+    adjacency = [set() for _ in index]
+    loops = np.zeros(len(index), dtype=bool)
+    for u, v in G.edges():
+        if u == v:
+            loops[index[u]] = True
+        else:
+            adjacency[index[u]].add(index[v])
+            adjacency[index[v]].add(index[u])
+    return adjacency, loops
+
+
+def _shortest_odd_cycle(adjacency, removed, source):
+    """Find a short odd cycle through the closed walks of a vertex.
+
+    A breadth first search in the bipartite double cover reaches (source,
+    1) from (source, 0) along the shortest odd closed walk through source,
+    which contains an odd cycle.
+
+    Returns
+    -------
+    tuple
+        (cycle, reached) where cycle is None if the component of source is
+        bipartite, and reached lists the vertices of that component.
+    """
+    parent = {(source, 0): None}
+    queue = deque([(source, 0)])
+    while queue:
+        node = queue.popleft()
+        u, side = node
+        for v in adjacency[u]:
+            if removed[v] or (v, 1 - side) in parent:
+                continue
+            parent[(v, 1 - side)] = node
+            if v == source:
+                walk = []
+                node = (v, 1 - side)
+                while node is not None:
+                    walk.append(node[0])
+                    node = parent[node]
+                return _odd_cycle_in_walk(walk), None
+            queue.append((v, 1 - side))
+    return None, list({u for u, _ in parent})
+
+
+def odd_cycle_packing(adjacency, removed):
+    """Greedily pack vertex disjoint odd cycles.
+
+    Vertices are tried in order of increasing degree, since sparse regions
+    tend to hold short cycles. Components found to be bipartite are never
+    searched again.
+
+    Parameters
+    ----------
+    adjacency : list<set>
+        Neighbors of every vertex.
+    removed : numpy.ndarray
+        Boolean mask of vertices that may not be used.
+
+    Returns
+    -------
+    list<list>
+        Vertex disjoint odd cycles.
+    """
+    removed = removed.copy()
+    bipartite = np.zeros(len(adjacency), dtype=bool)
+    cycles = []
+    for v in sorted(range(len(adjacency)), key=lambda v: len(adjacency[v])):
+        if removed[v] or bipartite[v]:
+            continue
+        cycle, reached = _shortest_odd_cycle(adjacency, removed, v)
+        if cycle is None:
+            bipartite[reached] = True
+        else:
+            cycles.append(cycle)
+            removed[cycle] = True
+    return cycles
+
+
+def clique_packing(adjacency, removed):
+    """Greedily pack vertex disjoint cliques of at least three vertices.
+
+    Starting from vertices of highest degree, each clique is grown by the
+    candidate adjacent to the most other candidates.
+
+    Parameters
+    ----------
+    adjacency : list<set>
+        Neighbors of every vertex.
+    removed : numpy.ndarray
+        Boolean mask of vertices that may not be used.
+
+    Returns
+    -------
+    list<list>
+        Vertex disjoint cliques.
+    """
+    removed = removed.copy()
+    cliques = []
+    for v in sorted(range(len(adjacency)), key=lambda v: -len(adjacency[v])):
+        if removed[v]:
+            continue
+        clique = [v]
+        candidates = {u for u in adjacency[v] if not removed[u]}
+        while candidates:
+            u = max(
+                candidates,
+                key=lambda u: (len(adjacency[u] & candidates), -u)
+            )
+            clique.append(u)
+            candidates &= adjacency[u]
+        if len(clique) >= 3:
+            cliques.append(clique)
+            removed[clique] = True
+    return cliques
+
+
+def lower_bound(G):
+    """Compute a lower bound on the OCT size of G.
+
+    The bound is the larger of a packing of odd cycles alone and a packing
+    of cliques completed with odd cycles, plus one per self loop.
+
+    Parameters
+    ----------
+    G : Networkx Graph
+        Graph to bound.
+
+    Returns
+    -------
+    int
+        Lower bound on the size of a minimum OCT.
+    """
+    adjacency, loops = _adjacency(G)
+    cycles = len(odd_cycle_packing(adjacency, loops))
+    cliques = clique_packing(adjacency, loops)
+    removed = loops.copy()
+    for clique in cliques:
+        removed[clique] = True
+    mixed = (
+        sum(len(clique) - 2 for clique in cliques) +
+        len(odd_cycle_packing(adjacency, removed))
+    )
+    return int(loops.sum()) + max(cycles, mixed)
+
+
+def main():
+    """Print the lower bound of an edgelist graph."""
+
+    # Imported here since the solver imports this module
+    from src.ilp.solver import read_edgelist
+
+    # Get an argument parser and parse arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'file',
+        help='Path to an edgelist formatted file. May be compressed.'
+    )
+    argv = parser.parse_args()
+
+    # Bound and print
+    print(lower_bound(read_edgelist(argv.file)))
+
+
+# Invoke main
+if __name__ == '__main__':
+    main()
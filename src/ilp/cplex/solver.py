@@ -3,12 +3,35 @@
 
 # Imports
 from itertools import chain
-from src.ilp.solution import Solution
+from src.ilp.greedy import greedy_certificate
+from src.ilp.progress import Recorder
+from src.ilp.solution import FEASIBLE, OPTIMAL, Solution
+from src.ilp.strengthening import anchors, triangles
 import cplex
 import math
+import networkx as nx
 import os
 
 
+class _ProgressCallback(cplex.callbacks.MIPInfoCallback):
+    """Report incumbent and bound changes, aborting once a target is met.
+
+    The `recorder` attribute must be set after registration.
+    """
+
+    def __call__(self):
+        """Record the current incumbent and bound."""
+        incumbent = None
+        if self.has_incumbent():
+            incumbent = self.get_incumbent_objective_value()
+        if self.recorder(
+            self.get_time() - self.get_start_time(),
+            incumbent,
+            self.get_best_objective_value()
+        ):
+            self.abort()
+
+
 def _formulate_as_oct(G, mipgap=0, threads=1, timelimit=None, memlimit=None):
     """Construct an OCT problem with CPLEX.
 
@@ -101,6 +124,107 @@ def _formulate_as_oct(G, mipgap=0, threads=1, timelimit=None, memlimit=None):
     return prob, node_vars_flattened
 
 
+def _strengthen_oct(prob, G):
+    """Break side symmetry and add triangle inequalities to an OCT problem.
+
+    Parameters
+    ----------
+    prob : cplex.Cplex
+        OCT problem constructed by `_formulate_as_oct`.
+    G : Networkx Graph
+        Graph the problem was constructed from.
+
+    Returns
+    -------
+    list
+        Anchor vertices whose `s` variable was fixed to zero.
+    """
+
+    # Fix the side of one anchor per component
+    fixed = anchors(G)
+    if fixed:
+        prob.variables.set_upper_bounds(
+            [('s{}'.format(node), 0) for node in fixed]
+        )
+
+    # Every triangle needs at least one vertex in the OCT set
+    constraints = [
+        cplex.SparsePair(
+            ind=['c{}'.format(u), 'c{}'.format(v), 'c{}'.format(w)],
+            val=[1, 1, 1]
+        )
+        for u, v, w in triangles(G)
+    ]
+    prob.linear_constraints.add(
+        lin_expr=constraints,
+        senses=['G'] * len(constraints),
+        rhs=[1] * len(constraints)
+    )
+
+    return fixed
+
+
+def _oct_start(G, incumbent, fixed=()):
+    """Complete an OCT certificate into values for every OCT variable.
+
+    The `c` variables mark the certificate and the `s` variables a two
+    coloring of the bipartite graph left after removing it.
+
+    Parameters
+    ----------
+    G : Networkx Graph
+        Graph the certificate belongs to.
+    incumbent : list
+        OCT certificate.
+    fixed : iterable
+        Vertices whose `s` variable is fixed to zero.
+
+    Returns
+    -------
+    cplex.SparsePair
+        Value of every variable.
+    """
+    incumbent = set(map(str, incumbent))
+    remaining = G.subgraph(
+        [node for node in G.nodes() if str(node) not in incumbent]
+    )
+    color = nx.bipartite.color(remaining)
+
+    # Swap sides of components whose anchor is on the wrong side
+    for node in fixed:
+        if color.get(node, 0):
+            for other in nx.node_connected_component(remaining, node):
+                color[other] = 1 - color[other]
+
+    names, values = [], []
+    for node in G.nodes():
+        names += ['c{}'.format(node), 's{}'.format(node)]
+        values += [int(str(node) in incumbent), color.get(node, 0)]
+    return cplex.SparsePair(ind=names, val=values)
+
+
+def _vc_start(G, incumbent):
+    """Convert a Vertex Cover certificate into values for every variable.
+
+    Parameters
+    ----------
+    G : Networkx Graph
+        Graph the certificate belongs to.
+    incumbent : list
+        Vertex Cover certificate.
+
+    Returns
+    -------
+    cplex.SparsePair
+        Value of every variable.
+    """
+    incumbent = set(map(str, incumbent))
+    return cplex.SparsePair(
+        ind=['c{}'.format(node) for node in G.nodes()],
+        val=[int(str(node) in incumbent) for node in G.nodes()]
+    )
+
+
 def _formulate_as_vc(G, mipgap=0, threads=1, timelimit=None, memlimit=None):
     """Construct a Vertex Cover problem with CPLEX.
 
@@ -173,10 +297,22 @@ def _formulate_as_vc(G, mipgap=0, threads=1, timelimit=None, memlimit=None):
     return prob, node_vars_values
 
 
-def solve_with_cplex(G, formulation='OCT', mipgap=0,
-                     threads=1, timelimit=None, memlimit=None):
+def solve_with_cplex(G, formulation='OCT', mipgap=0, threads=1,
+                     timelimit=None, memlimit=None, upper_bound=None,
+                     incumbent=None, symmetry_breaking=False, on_event=None,
+                     target_gap=None, target_objective=None):
     """Solve an ILP problem instance with CPLEX.
 
+    An incumbent certificate is added as a MIP start, and the objective is
+    cut off at the upper bound (or the incumbent's size), so CPLEX prunes
+    every node that cannot improve on it. If CPLEX finds no solution within
+    the cutoff, the incumbent is returned. Without one, a greedy certificate
+    is returned if CPLEX ran out of time, and an error is raised if no
+    solution is within the upper bound.
+
+    An info callback reports incumbent and bound changes to `on_event` and
+    the solution's trace, and aborts the solve once a target is reached.
+
     Parameters
     ----------
     G : Networkx Graph
@@ -191,6 +327,19 @@ def solve_with_cplex(G, formulation='OCT', mipgap=0,
         Time limit for computation, in seconds.
     memlimit : int
         Memory limit in Mb.
+    upper_bound : int
+        Known upper bound on the objective.
+    incumbent : list
+        Known solution, whose size is the upper bound.
+    symmetry_breaking : bool
+        Whether to strengthen the OCT formulation with anchor fixings and
+        triangle inequalities.
+    on_event : callable
+        Called with every new progress Event.
+    target_gap : float
+        Relative gap at which to stop early.
+    target_objective : float
+        Incumbent objective at which to stop early.
     """
 
     # Typecast numeric types for safety
@@ -215,6 +364,29 @@ def solve_with_cplex(G, formulation='OCT', mipgap=0,
     else:
         raise Exception('Unknown Formulation')
 
+    # Strengthen
+    fixed = []
+    if symmetry_breaking and formulation == 'OCT':
+        fixed = _strengthen_oct(problem, G)
+
+    # Seed with the incumbent and cut off everything worse
+    if incumbent is not None:
+        if formulation == 'OCT':
+            start = _oct_start(G, incumbent, fixed)
+        else:
+            start = _vc_start(G, incumbent)
+        problem.MIP_starts.add(
+            start, problem.MIP_starts.effort_level.check_feasibility
+        )
+        upper_bound = len(incumbent)
+    if upper_bound is not None:
+        problem.parameters.mip.tolerances.uppercutoff.set(upper_bound)
+
+    # Stream progress events
+    recorder = Recorder(on_event, target_gap, target_objective)
+    callback = problem.register_callback(_ProgressCallback)
+    callback.recorder = recorder
+
     # Optimize
     start = problem.get_time()
     problem.solve()
@@ -223,14 +395,27 @@ def solve_with_cplex(G, formulation='OCT', mipgap=0,
     # Calculate total time
     time = round(end - start, 1)
 
-    # Construct certificate from solution values
-    solution = problem.solution.get_values(node_vars)
-    certificate = [
-        node_vars[i][1:]
-        for i in range(len(solution))
-        if math.isclose(solution[i], 1, abs_tol=1e-10)
-        and node_vars[i][0] == 'c'
-    ]
+    # Construct certificate from solution values. Without a solution within
+    # the cutoff, fall back to the incumbent, which is optimal if the cut off
+    # model is infeasible
+    infeasible = problem.solution.get_status() in (
+        problem.solution.status.MIP_infeasible,
+        problem.solution.status.MIP_infeasible_or_unbounded
+    )
+    if problem.solution.is_primal_feasible():
+        solution = problem.solution.get_values(node_vars)
+        certificate = [
+            node_vars[i][1:]
+            for i in range(len(solution))
+            if math.isclose(solution[i], 1, abs_tol=1e-10)
+            and node_vars[i][0] == 'c'
+        ]
+    elif incumbent is not None:
+        certificate = list(incumbent)
+    elif infeasible:
+        raise Exception('No solution within the upper bound')
+    else:
+        certificate = greedy_certificate(G, formulation)
 
     # Record cuts
     cuts = [
@@ -241,6 +426,19 @@ def solve_with_cplex(G, formulation='OCT', mipgap=0,
         for i in problem.solution.MIP.cut_type
     ]
 
+    # Record whether optimality was proven, and the best bound
+    optimal = infeasible or problem.solution.get_status() in (
+        problem.solution.status.MIP_optimal,
+        problem.solution.status.optimal_tolerance
+    )
+
+    # Record the final state
+    if infeasible:
+        bound = len(certificate)
+    else:
+        bound = problem.solution.MIP.get_best_objective()
+    recorder(time, len(certificate), bound)
+
     # Return solution
     return Solution(
         G=G,
@@ -248,5 +446,8 @@ def solve_with_cplex(G, formulation='OCT', mipgap=0,
         mipgap=mipgap,
         certificate=certificate,
         time=time,
-        cuts=cuts
+        cuts=cuts,
+        status=OPTIMAL if optimal else FEASIBLE,
+        bound=bound,
+        trace=recorder.trace
     )
@@ -2,137 +2,381 @@
 
 
 # Imports
-from itertools import chain
-from src.ilp.solution import Solution
+from itertools import islice
+from src.ilp.greedy import greedy_certificate
+from src.ilp.progress import Recorder
+from src.ilp.separation import (
+    cover_odd_cycles, fractional_odd_cycles, integral_odd_cycles
+)
+from src.ilp.solution import FEASIBLE, OPTIMAL, Solution
+from src.ilp.strengthening import anchors, triangles
+from src.limits import check, preexec
+from src.preprocessing.graphs import pipe_lines
+from src.usage import combine, Popen
+import numpy as np
+import os
 import re
 import subprocess
+import threading
+import timeit
 
 
-def _formulate_as_oct(G):
-    """Formulate an OCT ILP given a graph G.
+# Number of LP lines joined into each block written to glpsol
+LP_BLOCK_SIZE = 4096
+
+# Maximum number of odd cycle inequalities added per separation round
+CYCLES_PER_ROUND = 200
+
+# Branch and bound progress line, e.g.
+# `+   123: >>>>>   1.200000000e+01 >=   1.000000000e+01  16.7% (5; 0)`
+PROGRESS_LINE = re.compile(
+    r'^\+\s*\d+: (?:mip =|>>>>>)\s+(not found yet|\S+)\s+>=\s+(\S+)'
+)
+
+
+def _index_graph(G):
+    """Relabel the vertices of G by their position.
+
+    Variables are named after vertex indices rather than vertex names, so
+    the LP never depends on how the vertices are labeled.
 
     Parameters
     ----------
     G : Networkx Graph
-        Graph to formulate the OCT ILP from.
+        Graph to index.
 
     Returns
     -------
-    string
-        ILP in CPLEX LP format.
+    tuple
+        (vertices, edges) where `vertices[i]` is the vertex with index `i` and
+        edges is an iterator over pairs of vertex indices.
     """
+    vertices = list(G.nodes())
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+    edges = ((index[u], index[v]) for u, v in G.edges())
+    return vertices, edges
+
+
+def _sum_lines(num_vertices):
+    """Generate the sum of all `c` variables, one term per line."""
+    yield '    c0\n'
+    for i in range(1, num_vertices):
+        yield '    + c{}\n'.format(i)
+
+
+def _objective_lines(num_vertices):
+    """Generate the objective minimizing the number of `c` variables."""
+    yield 'Minimize\n'
+    yield from _sum_lines(num_vertices)
+
+
+def _cutoff_lines(num_vertices, cutoff):
+    """Generate a constraint bounding the objective from above."""
+    if cutoff is None:
+        return
+    yield '    cutoff:\n'
+    yield from _sum_lines(num_vertices)
+    yield '    <= {}\n'.format(cutoff)
 
-    # Output lines
-    lines = []
+
+def _formulate_as_oct(num_vertices, edges, cutoff=None, fixed=(),
+                      cliques=()):
+    """Generate an OCT ILP given an indexed graph.
+
+    Parameters
+    ----------
+    num_vertices : int
+        Number of vertices, indexed 0, ..., n-1.
+    edges : iterable
+        Pairs of vertex indices.
+    cutoff : int
+        Optional upper bound on the objective.
+    fixed : iterable
+        Indices of vertices whose side variable is fixed to zero.
+    cliques : iterable
+        Index triples of triangles, at least one vertex of each must be in
+        the OCT set.
+
+    Returns
+    -------
+    generator
+        Lines of the ILP in CPLEX LP format.
+    """
 
     # Formulate objective
-    lines.append('Minimize {}'.format(
-        ' + '.join(['c{}'.format(n) for n in G.nodes()])
-    ))
+    yield from _objective_lines(num_vertices)
 
     # Formulate constraints
-    lines.append('Subject To')
-    lines += chain.from_iterable(
-        (
-            '    s{} + s{} + c{} + c{} >= 1'.format(e[0], e[1], e[0], e[1]),
-            '    s{} + s{} - c{} - c{} <= 1'.format(e[0], e[1], e[0], e[1])
-        )
-        for e in G.edges()
-    )
+    yield 'Subject To\n'
+    yield from _cutoff_lines(num_vertices, cutoff)
+    for u, v in edges:
+        yield '    s{0} + s{1} + c{0} + c{1} >= 1\n'.format(u, v)
+        yield '    s{0} + s{1} - c{0} - c{1} <= 1\n'.format(u, v)
+    for i in fixed:
+        yield '    s{} <= 0\n'.format(i)
+    for u, v, w in cliques:
+        yield '    c{} + c{} + c{} >= 1\n'.format(u, v, w)
 
     # Formulate binary variables
-    lines.append('Binary')
-    lines += chain.from_iterable(
-        ('    c{}'.format(n), '    s{}'.format(n))
-        for n in G.nodes()
-    )
+    yield 'Binary\n'
+    for i in range(num_vertices):
+        yield '    c{0}\n    s{0}\n'.format(i)
 
     # End problem
-    lines.append('End\n')
+    yield 'End\n'
 
-    # Return string containing all lines
-    return '\n'.join(lines)
 
-
-def _formulate_as_vc(G):
-    """Formulate a Vertex Cover ILP given a graph G.
+def _formulate_as_vc(num_vertices, edges, cutoff=None):
+    """Generate a Vertex Cover ILP given an indexed graph.
 
     Parameters
     ----------
-    G : Networkx Graph
-        Graph to formulate the VC ILP from.
+    num_vertices : int
+        Number of vertices, indexed 0, ..., n-1.
+    edges : iterable
+        Pairs of vertex indices.
+    cutoff : int
+        Optional upper bound on the objective.
 
     Returns
     -------
-    string
-        ILP in CPLEX LP format.
+    generator
+        Lines of the ILP in CPLEX LP format.
     """
 
-    # Problem lines
-    lines = []
-
     # Set objective
-    lines.append('Minimize {}'.format(
-        ' + '.join(['c{}'.format(n) for n in G.nodes()])
-    ))
+    yield from _objective_lines(num_vertices)
 
     # Set constraints
-    lines.append('Subject To')
-    lines += (
-        '    c{} + c{} >= 1'.format(e[0], e[1])
-        for e in G.edges()
-    )
+    yield 'Subject To\n'
+    yield from _cutoff_lines(num_vertices, cutoff)
+    for u, v in edges:
+        yield '    c{} + c{} >= 1\n'.format(u, v)
 
     # Set binary variables
-    lines.append('Binary')
-    lines += ('    c{}'.format(n) for n in G.nodes())
+    yield 'Binary\n'
+    for i in range(num_vertices):
+        yield '    c{}\n'.format(i)
 
     # End Problem
-    lines.append('End\n')
+    yield 'End\n'
+
+
+def _formulate_as_cycles(num_vertices, cycles, integer, cutoff=None):
+    """Generate an OCT ILP over odd cycle inequalities.
+
+    Parameters
+    ----------
+    num_vertices : int
+        Number of vertices, indexed 0, ..., n-1.
+    cycles : iterable
+        Odd cycles, as lists of vertex indices, at least one vertex of each
+        must be in the OCT set.
+    integer : bool
+        Whether the `c` variables are binary, rather than bounded by one.
+    cutoff : int
+        Optional upper bound on the objective.
+
+    Returns
+    -------
+    generator
+        Lines of the ILP in CPLEX LP format.
+    """
 
-    # Return string containing all lines
-    return '\n'.join(lines)
+    # Formulate objective
+    yield from _objective_lines(num_vertices)
+
+    # Formulate constraints
+    yield 'Subject To\n'
+    yield from _cutoff_lines(num_vertices, cutoff)
+    for cycle in cycles:
+        yield '    {} >= 1\n'.format(
+            ' + '.join('c{}'.format(v) for v in cycle)
+        )
+
+    # Formulate variables
+    if integer:
+        yield 'Binary\n'
+        for i in range(num_vertices):
+            yield '    c{}\n'.format(i)
+    else:
+        yield 'Bounds\n'
+        for i in range(num_vertices):
+            yield '    c{} <= 1\n'.format(i)
+
+    # End problem
+    yield 'End\n'
 
 
-def _solution_from_output(output, graph, mipgap):
+def _blocks(lines, size=LP_BLOCK_SIZE):
+    """Join consecutive lines into blocks of at most `size` lines."""
+    lines = iter(lines)
+    block = ''.join(islice(lines, size))
+    while block:
+        yield block
+        block = ''.join(islice(lines, size))
+
+
+def _collect(fd):
+    """Read a file descriptor to its end on a background thread.
+
+    Parameters
+    ----------
+    fd : int
+        File descriptor to read. It is closed once exhausted.
+
+    Returns
+    -------
+    callable
+        Waits for the reader to finish and returns the bytes read.
+    """
+    chunks = []
+
+    def _run():
+        with os.fdopen(fd, 'rb') as infile:
+            chunks.append(infile.read())
+
+    thread = threading.Thread(target=_run, daemon=True)
+    thread.start()
+
+    def _result():
+        thread.join()
+        return b''.join(chunks)
+
+    return _result
+
+
+def _read_raw_solution(raw):
+    """Parse a solution written by `glpsol -w`.
+
+    The raw format has one `s mip <rows> <cols> <status> <objective>` line
+    for MIPs, or `s bas <rows> <cols> <primal> <dual> <objective>` for LPs,
+    followed by `i <row> ...` lines and `j <col> ...` lines. MIP column lines
+    hold a value, LP column lines a basis status, value and dual value.
+
+    Parameters
+    ----------
+    raw : string
+        Contents of the raw solution file.
+
+    Returns
+    -------
+    tuple
+        (status, objective, values) where status is one of `o` (optimal),
+        `f` (feasible), `n` (no feasible solution), `i` (infeasible, LP
+        only) or `u` (undefined), and values holds the column values in
+        column order. An LP solution is optimal only if it is both primal
+        and dual feasible.
+    """
+
+    # Solution line
+    header = re.search(
+        r'^s (mip|bas) (\d+) (\d+) (\w) (?:(\w) )?(\S+)$', raw, re.MULTILINE
+    )
+    if header is None:
+        raise Exception('Unable to parse glpsol solution')
+    status, objective = header.group(4), float(header.group(6))
+    if header.group(1) == 'bas' and status == 'f' and header.group(5) == 'f':
+        status = 'o'
+
+    # Column lines are contiguous and ordered, so keep every value token
+    start = raw.find('\nj ', header.end())
+    end = raw.find('\ne ', start)
+    if start < 0:
+        values = np.empty(0)
+    elif header.group(1) == 'mip':
+        values = np.array(raw[start:end].split()[2::3], dtype=float)
+    else:
+        values = np.array(raw[start:end].split()[3::5], dtype=float)
+
+    return status, objective, values
+
+
+def _progress_value(text):
+    """Parse an objective value of a progress line, None if unknown."""
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return value if abs(value) != float('inf') else None
+
+
+def _time_used(output):
+    """Parse the solve time in seconds from glpsol terminal output."""
+    return float(re.findall(r'\nTime used: +(\d+\.\d+)', output)[-1])
+
+
+def _solution_from_output(output, raw, graph, vertices, mipgap,
+                          formulation='OCT', incumbent=None, recorder=None,
+                          usage=None):
     """Construct a solution object from output.
 
+    The objective lists the `c` variables first and in index order, so GLPK
+    numbers them as columns 1, ..., n.
+
+    If an incumbent was given and glpsol found no solution better than it,
+    either because the cut off model is infeasible or because it ran out of
+    time, the incumbent is returned. Without an incumbent certificate, a
+    greedy one is returned if glpsol ran out of time, and an error is raised
+    if no solution is within the upper bound.
+
     Parameters
     ----------
     output : string
-        Output retrieved from glpsol.
+        Terminal output retrieved from glpsol.
+    raw : string
+        Raw solution written by glpsol.
     graph : Networkx Graph
         Graph problem was solved on.
+    vertices : list
+        Vertices of the graph, indexed as in the formulation.
     mipgap : float
         Allowed tolerance.
-    timelimit : float
-        Time limit for computation, in seconds.
+    formulation : string
+        Formulation solved, for the greedy certificate.
+    incumbent : list
+        Certificate the objective was cut off below, if any.
+    recorder : Recorder
+        Recorder of the progress events.
+    usage : Usage
+        Resource usage of glpsol.
 
     Returns
     -------
     Solution
         Solution object.
+
+    Raises
+    ------
+    Exception
+        Raised if there is no incumbent and no solution is within the upper
+        bound.
     """
 
     # Parse time from output
-    time = float(re.findall(r'\nTime used: +(\d+\.\d+)', output)[-1])
-
-    # Extract certificate text table
-    certificate_text = re.search(
-        r'\n\n +No\. +Column name[^\n]*\n[^\n]*\n(.*)(?=\n\nInteger)',
-        output,
-        re.DOTALL
-    ).group(1)
-
-    # Parse as table
-    certificate_table = [line.split() for line in certificate_text.split('\n')]
-
-    # Build certificate
-    certificate = [
-        vertex[1][1:]
-        for vertex in certificate_table
-        if vertex[1][0] == 'c' and vertex[3] == '1'
-    ]
+    time = _time_used(output)
+
+    # Build certificate from the `c` columns set to one. An infeasible cut
+    # off model proves the incumbent optimal
+    status, objective, values = _read_raw_solution(raw)
+    if status in ('o', 'f'):
+        certificate = [
+            vertices[i]
+            for i in np.flatnonzero(values[:len(vertices)] > 0.5)
+        ]
+        bound = objective if status == 'o' else None
+    elif incumbent is not None:
+        certificate = incumbent
+        bound = len(incumbent) if status == 'n' else None
+    elif status == 'n':
+        raise Exception('No solution within the upper bound')
+    else:
+        certificate = greedy_certificate(graph, formulation)
+        bound = None
+
+    # Record the final state
+    recorder = recorder or Recorder()
+    recorder(time, len(certificate), bound)
 
     # Construct solution
     return Solution(
@@ -141,27 +385,300 @@ def _solution_from_output(output, graph, mipgap):
         mipgap=mipgap,
         certificate=certificate,
         time=time,
-        cuts=[('NA', 'NA')]
+        cuts=[('NA', 'NA')],
+        status=FEASIBLE if bound is None else OPTIMAL,
+        bound=bound,
+        trace=recorder.trace,
+        usage=usage
     )
 
 
-def solve_with_glpk(G, formulation='OCT', mipgap=0,
-                    timelimit=None, memlimit=None):
+def _run_glpsol(problem, mipgap=0, timelimit=None, memlimit=None,
+                progress=None, offset=0.0, limits=None):
+    """Run glpsol on a problem in CPLEX LP format.
+
+    Branch and bound progress lines are parsed as glpsol prints them.
+
+    Parameters
+    ----------
+    problem : iterable
+        Lines of the problem.
+    mipgap : float
+        Allowed gap in tolerance.
+    timelimit : float
+        Time limit for computation, in seconds.
+    memlimit : int
+        Memory limit in Mb.
+    progress : callable
+        Called with (time, incumbent, bound) for every progress line.
+    offset : float
+        Seconds added to the time of every progress report.
+    limits : src.limits.Limits
+        Optional hard memory and CPU limits of glpsol.
+
+    Returns
+    -------
+    tuple
+        (output, raw, usage) where output is the terminal output of glpsol,
+        raw its raw solution and usage its resource usage.
+    """
+
+    # Open a pipe for the raw solution
+    solution_fd, write_fd = os.pipe()
+
+    # Construct GLPK command
+    command = [
+        'glpsol', '--lp', '-w', '/dev/fd/{}'.format(write_fd),
+        '--mipgap', str(mipgap)
+    ]
+    if timelimit is not None:
+        # Whole seconds, at least one as glpsol stops at once on zero
+        command += ['--tmlim', str(max(1, int(timelimit)))]
+    if memlimit is not None:
+        command += ['--memlim', str(memlimit)]
+    command.append('/dev/stdin')
+
+    # Call GLPK through `glpsol`
+    # The problem is generated block by block into a pipe read as /dev/stdin,
+    # so the full LP text is never held in memory. The raw solution is
+    # written to its own pipe, leaving only the short log on stdout
+    stdin = pipe_lines(_blocks(problem))
+    start = timeit.default_timer()
+    try:
+        glpsol = Popen(
+            command,
+            stdin=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            pass_fds=(write_fd,),
+            preexec_fn=preexec(limits)
+        )
+    except BaseException:
+        os.close(solution_fd)
+        raise
+    finally:
+        os.close(stdin)
+        os.close(write_fd)
+
+    # Read output as it arrives until glpsol finishes
+    raw = _collect(solution_fd)
+    lines = []
+    with glpsol.stdout:
+        for line in glpsol.stdout:
+            line = line.decode('utf-8')
+            lines.append(line)
+            match = PROGRESS_LINE.match(line)
+            if progress is not None and match:
+                progress(
+                    offset + timeit.default_timer() - start,
+                    _progress_value(match.group(1)),
+                    _progress_value(match.group(2))
+                )
+    glpsol.wait()
+    raw = raw()
+    stdout = ''.join(lines)
+
+    # Error on failure
+    check(limits, glpsol.returncode, stdout)
+    if glpsol.returncode:
+        raise Exception(stdout)
+
+    return stdout, raw.decode('utf-8'), glpsol.usage
+
+
+def _solve_oct_cycles(G, mipgap=0, timelimit=None, memlimit=None,
+                      cutoff=None, incumbent=None, recorder=None,
+                      limits=None):
+    """Solve OCT by generating odd cycle inequalities.
+
+    The model starts from a few odd cycles of G. In every round its LP
+    relaxation is solved and odd cycles violated by the fractional solution
+    are added. Once separation finds none, the model is solved as a MIP. If
+    the MIP solution leaves odd cycles, they are added and the rounds
+    continue, otherwise the solution is an optimal OCT.
+
+    The time limit and the solution time are in wall clock time, including
+    separation and the start of every glpsol process.
+
+    Parameters
+    ----------
+    G : Networkx Graph
+        Graph to solve OCT on.
+    mipgap : float
+        Allowed gap in tolerance.
+    timelimit : float
+        Time limit for the whole computation, in seconds.
+    memlimit : int
+        Memory limit in Mb.
+    cutoff : int
+        Optional upper bound on the objective.
+    incumbent : list
+        Known solution, returned if no better one is found.
+    recorder : Recorder
+        Recorder of progress events. Incumbents of the intermediate models
+        are not OCTs of G, so only their bounds are reported.
+    limits : src.limits.Limits
+        Optional hard memory and CPU limits of every glpsol run.
+
+    Returns
+    -------
+    Solution
+        Solution object.
+    """
+    recorder = recorder or Recorder()
+    start = timeit.default_timer()
+
+    # Index the graph
+    vertices = list(G.nodes())
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+    n = len(vertices)
+    edges = np.array(
+        [(index[u], index[v]) for u, v in G.edges()], dtype=np.int64
+    ).reshape(-1, 2)
+    adjacency = [[] for _ in range(n)]
+    for u, v in edges.tolist():
+        adjacency[u].append(v)
+        adjacency[v].append(u)
+
+    # Seed the model with odd cycles of the whole graph
+    cycles = integral_odd_cycles(
+        n, adjacency, np.zeros(n, dtype=bool), CYCLES_PER_ROUND
+    )
+
+    # Separate and solve in rounds. Without odd cycles G is bipartite, so
+    # the empty certificate is optimal
+    chosen = None if cycles else np.zeros(n, dtype=bool)
+    optimal = not cycles
+    integer = False
+    usages = []
+    while cycles:
+
+        # Stop once glpsol can not get a whole second
+        time = timeit.default_timer() - start
+        remaining = None if timelimit is None else timelimit - time
+        if remaining is not None and remaining < 1:
+            break
+
+        # Solve the current relaxation
+        output, raw, usage = _run_glpsol(
+            _formulate_as_cycles(n, cycles, integer, cutoff),
+            mipgap=mipgap if integer else 0,
+            timelimit=remaining,
+            memlimit=memlimit,
+            progress=lambda t, _, bound: recorder(t, None, bound),
+            offset=time,
+            limits=limits
+        )
+        usages.append(usage)
+        status, objective, values = _read_raw_solution(raw)
+        if status == 'o':
+            recorder(timeit.default_timer() - start, None, objective)
+        if status not in ('o', 'f'):
+            # An infeasible cut off model proves the incumbent optimal
+            optimal = status == 'n' and incumbent is not None
+            break
+        if not integer and status != 'o':
+            # Only an optimal LP solution bounds and separates soundly
+            break
+        values = values[:n]
+
+        # Separate
+        if integer:
+            chosen = values > 0.5
+            new = integral_odd_cycles(n, adjacency, chosen, CYCLES_PER_ROUND)
+            if not new:
+                optimal = status == 'o'
+                break
+            integer = False
+        else:
+            new = fractional_odd_cycles(n, edges, values, CYCLES_PER_ROUND)
+            if not new:
+                # Branch only once separation fails
+                integer = True
+        cycles += new
+
+    # Return the incumbent unless a better solution was found
+    if chosen is None and incumbent is not None:
+        certificate = incumbent
+    else:
+
+        # Repair an unfinished solution by covering leftover cycles greedily
+        if chosen is None:
+            chosen = np.zeros(n, dtype=bool)
+        chosen = cover_odd_cycles(n, adjacency, chosen, CYCLES_PER_ROUND)
+        certificate = [vertices[i] for i in np.flatnonzero(chosen)]
+
+        # Fall back to the incumbent if it is smaller
+        if incumbent is not None and len(incumbent) <= len(certificate):
+            certificate = incumbent
+
+    # Record the final state
+    time = timeit.default_timer() - start
+    bound = len(certificate) if optimal else None
+    recorder(time, len(certificate), bound)
+
+    # Construct solution
+    return Solution(
+        G=G,
+        threads=1,
+        mipgap=mipgap,
+        certificate=certificate,
+        time=round(time, 1),
+        cuts=[('Odd cycle', len(cycles))],
+        status=OPTIMAL if optimal else FEASIBLE,
+        bound=bound,
+        trace=recorder.trace,
+        usage=combine(usages)
+    )
+
+
+def solve_with_glpk(G, formulation='OCT', mipgap=0, timelimit=None,
+                    memlimit=None, upper_bound=None, incumbent=None,
+                    symmetry_breaking=False, on_event=None, target_gap=None,
+                    target_objective=None, limits=None):
     """Solve an ILP problem instance with GLPK.
 
+    Incumbent and bound changes are parsed from glpsol's progress lines as
+    they are printed, reported to `on_event`, and kept in the solution's
+    trace. glpsol writes no solution when interrupted, so a target gap is
+    enforced through `--mipgap` and a target objective is not supported.
+
+    With an incumbent certificate the objective is cut off at one below its
+    size, so glpsol only searches for strictly better solutions and proves
+    the incumbent optimal if there are none. With only an upper bound the
+    objective is cut off at the bound itself.
+
     Parameters
     ----------
     G : Networkx Graph
         Graph for which the problem will be computed
     formulation : string
-        How the problem should be solved. Either OCT or VC.
+        How the problem should be solved. Either OCT, VC or OCT_CYCLES.
     mipgap : float
         Allowed gap in tolerance
     timelimit : float
         Time limit for computation, in seconds.
     memlimit : int
         Memory limit in Mb.
+    upper_bound : int
+        Known upper bound on the objective.
+    incumbent : list
+        Known solution, whose size is the upper bound.
+    symmetry_breaking : bool
+        Whether to strengthen the OCT formulation with anchor fixings and
+        triangle inequalities.
+    on_event : callable
+        Called with every new progress Event.
+    target_gap : float
+        Relative gap at which to stop early.
+    target_objective : float
+        Not supported by GLPK, must be None.
+    limits : src.limits.Limits
+        Optional hard memory and CPU limits of glpsol. Unlike memlimit, the
+        memory limit is enforced by the operating system.
     """
+    if target_objective is not None:
+        raise Exception('A target objective is not supported by GLPK')
 
     # Typecast mipgap for safety
     mipgap = float(mipgap)
@@ -170,44 +687,60 @@ def solve_with_glpk(G, formulation='OCT', mipgap=0,
     if memlimit is not None:
         memlimit = int(memlimit)
 
-    # Get problem formulation
-    if formulation == 'OCT':
-        problem = _formulate_as_oct(G)
+    # Stream progress events
+    recorder = Recorder(on_event, target_gap, target_objective)
+    if target_gap is not None:
+        mipgap_run = max(mipgap, float(target_gap))
+    else:
+        mipgap_run = mipgap
+
+    # Search strictly below a known solution, or at most a known bound
+    if incumbent is not None:
+        cutoff = len(incumbent) - 1
+    elif upper_bound is not None:
+        cutoff = int(upper_bound)
+    else:
+        cutoff = None
+
+    # Generate odd cycle inequalities lazily
+    if formulation == 'OCT_CYCLES':
+        return _solve_oct_cycles(
+            G, mipgap=mipgap_run, timelimit=timelimit, memlimit=memlimit,
+            cutoff=cutoff, incumbent=incumbent, recorder=recorder,
+            limits=limits
+        )
+
+    # Get problem formulation over integer indexed vertices
+    vertices, edges = _index_graph(G)
+    if formulation == 'OCT' and symmetry_breaking:
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        problem = _formulate_as_oct(
+            len(vertices), edges, cutoff=cutoff,
+            fixed=(index[v] for v in anchors(G)),
+            cliques=(tuple(index[v] for v in t) for t in triangles(G))
+        )
+    elif formulation == 'OCT':
+        problem = _formulate_as_oct(len(vertices), edges, cutoff=cutoff)
     elif formulation == 'VC':
-        problem = _formulate_as_vc(G)
+        problem = _formulate_as_vc(len(vertices), edges, cutoff=cutoff)
     else:
         raise Exception('Unknown Formulation')
 
-    # Construct GLPK command
-    command = [
-        'glpsol', '--lp', '-o', '/dev/stdout',
-        '--mipgap', str(mipgap)
-    ]
-    if timelimit is not None:
-        command += ['--tmlim', str(int(timelimit))]
-    if memlimit is not None:
-        command += ['--memlim', str(memlimit)]
-    command.append('/dev/stdin')
-
-    # Call GLPK through `glpsol`
-    # Read input from /dev/stdin and report to /dev/stdout
-    glpsol = subprocess.Popen(
-        command,
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
+    # Solve
+    stdout, raw, usage = _run_glpsol(
+        problem, mipgap_run, timelimit, memlimit, progress=recorder,
+        limits=limits
     )
 
-    # Pass problem over stdin, then wait for glpsol to finish and grab output
-    stdout, stderr = glpsol.communicate(input=bytes(problem, 'utf-8'))
-
-    # Error on failure
-    if glpsol.returncode:
-        raise Exception(stdout)
-
     # Generate and return solution
     return _solution_from_output(
-        stdout.decode('utf-8'),
+        stdout,
+        raw,
         graph=G,
-        mipgap=mipgap
+        vertices=vertices,
+        mipgap=mipgap,
+        formulation=formulation,
+        incumbent=incumbent,
+        recorder=recorder,
+        usage=usage
     )
@@ -0,0 +1,60 @@
+"""Greedy feasible certificates.
+
+These are returned for graphs or components that a solver had no time to
+solve, or for which it found no solution at all. They are far from optimal,
+but cheap to compute and always feasible.
+"""
+
+
+# Imports
+from src.ilp.separation import cover_odd_cycles
+import networkx as nx
+import numpy as np
+
+
+# Maximum number of odd cycles covered per round
+CYCLES_PER_ROUND = 1000
+
+
+def greedy_certificate(G, formulation='OCT'):
+    """Compute a feasible certificate of G.
+
+    For the OCT formulations, odd cycles are covered greedily by their
+    vertices of highest degree, after removing every vertex with a self
+    loop. For VC, both endpoints of a maximal matching are taken, along
+    with every vertex with a self loop.
+
+    Parameters
+    ----------
+    G : Networkx Graph
+        Graph to cover.
+    formulation : string
+        Either OCT, VC or OCT_CYCLES.
+
+    Returns
+    -------
+    list
+        Vertices of the certificate.
+    """
+    if formulation == 'VC':
+        cover = {v for edge in nx.maximal_matching(G) for v in edge}
+        cover.update(u for u, _ in nx.selfloop_edges(G))
+        return [v for v in G.nodes() if v in cover]
+
+    # Index the graph
+    vertices = list(G.nodes())
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+    adjacency = [[] for _ in vertices]
+    loops = np.zeros(len(vertices), dtype=bool)
+    for u, v in G.edges():
+        if u == v:
+            loops[index[u]] = True
+        else:
+            adjacency[index[u]].append(index[v])
+            adjacency[index[v]].append(index[u])
+
+    # Cover
+    chosen = cover_odd_cycles(
+        len(vertices), adjacency, loops, CYCLES_PER_ROUND
+    )
+    return [vertices[i] for i in np.flatnonzero(chosen)]
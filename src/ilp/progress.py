@@ -0,0 +1,120 @@
+"""Incumbent and bound events reported while an ILP is solved.
+
+Both backends report an `Event` whenever the best known solution value
+(the incumbent) or the best lower bound changes. Events are recorded in the
+solution's trace, passed to an optional callback as they happen, and used
+to stop a solve early once a target gap or objective is reached.
+"""
+
+
+from collections import namedtuple
+
+
+# Seconds since the solve started, incumbent objective (None until a
+# solution is found), and lower bound (None while unknown)
+Event = namedtuple('Event', ['time', 'incumbent', 'bound'])
+
+
+def gap(event):
+    """Relative gap between the incumbent and bound of an event.
+
+    Parameters
+    ----------
+    event : Event
+        Event to compute the gap of.
+
+    Returns
+    -------
+    float
+        The gap, or None if either value is unknown.
+    """
+    if event.incumbent is None or event.bound is None:
+        return None
+    return (event.incumbent - event.bound) / max(abs(event.incumbent), 1e-10)
+
+
+def reached(event, target_gap=None, target_objective=None):
+    """Whether an event meets an early stopping target.
+
+    Parameters
+    ----------
+    event : Event
+        Latest event.
+    target_gap : float
+        Stop once the relative gap is at most this.
+    target_objective : float
+        Stop once the incumbent is at most this, e.g. a known optimum.
+
+    Returns
+    -------
+    bool
+        True if the solve may stop.
+    """
+    if event.incumbent is None:
+        return False
+    if target_objective is not None and event.incumbent <= target_objective:
+        return True
+    current = gap(event)
+    if target_gap is None or current is None:
+        return False
+    return current <= target_gap
+
+
+def _best(choose, value, previous):
+    """Combine a reported value with the previous one, either may be None."""
+    if value is None or previous is None:
+        return previous if value is None else value
+    return choose(value, previous)
+
+
+class Recorder():
+    """Collect events, forwarding changes to a callback.
+
+    Reports are merged with the previous event, so times never decrease, the
+    incumbent only decreases and the bound only increases.
+
+    Attributes
+    ----------
+    trace : list<Event>
+        Every distinct event, in order.
+    """
+
+    __slots__ = ('trace', 'on_event', 'target_gap', 'target_objective')
+
+    def __init__(self, on_event=None, target_gap=None,
+                 target_objective=None):
+        """Initialize Recorder.
+
+        Parameters
+        ----------
+        on_event : callable
+            Called with every new Event.
+        target_gap : float
+            Relative gap at which the solve may stop.
+        target_objective : float
+            Incumbent objective at which the solve may stop.
+        """
+        self.trace = []
+        self.on_event = on_event
+        self.target_gap = target_gap
+        self.target_objective = target_objective
+
+    def __call__(self, time, incumbent, bound):
+        """Record an event if it changes the incumbent or bound.
+
+        Returns
+        -------
+        bool
+            True if a stopping target has been reached.
+        """
+        if self.trace:
+            last = self.trace[-1]
+            time = max(time, last.time)
+            incumbent = _best(min, incumbent, last.incumbent)
+            bound = _best(max, bound, last.bound)
+        event = Event(time, incumbent, bound)
+        if not self.trace or self.trace[-1][1:] != event[1:]:
+            self.trace.append(event)
+            if self.on_event is not None:
+                self.on_event(event)
+        return reached(event, self.target_gap, self.target_objective)
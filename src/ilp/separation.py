@@ -0,0 +1,221 @@
+"""Separation of odd cycle inequalities.
+
+A vertex set C is an OCT exactly when every odd cycle of the graph has a
+vertex in C, i.e. when `sum(c[v] for v in cycle) >= 1` holds for every odd
+cycle. These routines find odd cycles violating that inequality for a given
+assignment of the `c` variables, either fractional (from an LP relaxation)
+or integral (from a MIP solution).
+
+All graphs are indexed: vertices are 0, ..., n-1 and edges an `m x 2`
+array of vertex indices.
+"""
+
+
+from collections import deque
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.csgraph
+
+
+# Tolerance on the weight of a violated cycle
+EPSILON = 1e-6
+
+# Number of Dijkstra sources run at once
+SOURCE_CHUNK_SIZE = 256
+
+
+def _odd_cycle_in_walk(walk):
+    """Extract an odd simple cycle from a closed walk of odd length.
+
+    Parameters
+    ----------
+    walk : list
+        Vertices of the walk, with `walk[0] == walk[-1]`.
+
+    Returns
+    -------
+    list
+        Vertices of an odd cycle using only vertices of the walk.
+    """
+    seen = {}
+    for i, vertex in enumerate(walk[:-1]):
+        if vertex in seen:
+            # Split at the repeated vertex and keep the odd part
+            j = seen[vertex]
+            if (i - j) % 2:
+                return _odd_cycle_in_walk(walk[j:i + 1])
+            return _odd_cycle_in_walk(walk[:j] + walk[i:])
+        seen[vertex] = i
+    return walk[:-1]
+
+
+def fractional_odd_cycles(num_vertices, edges, values,
+                          max_cycles=None):
+    """Find odd cycles whose `c` values sum to less than one.
+
+    Each edge (u, v) is weighted by `(c[u] + c[v]) / 2`, so the weight of a
+    closed walk is the sum of `c` over its vertices. An odd closed walk
+    through v corresponds to a path from (v, 0) to (v, 1) in the bipartite
+    double cover, so the lightest odd cycle through every vertex is found by
+    shortest paths in the cover.
+
+    Parameters
+    ----------
+    num_vertices : int
+        Number of vertices.
+    edges : numpy.ndarray
+        `m x 2` array of edges.
+    values : numpy.ndarray
+        Value of `c` for every vertex.
+    max_cycles : int
+        Stop after finding this many cycles.
+
+    Returns
+    -------
+    list<list>
+        Distinct violated odd cycles, lightest first.
+    """
+    n = num_vertices
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    values = np.clip(np.asarray(values, dtype=float)[:n], 0, 1)
+    if not len(edges):
+        return []
+
+    # Double cover: (v, 0) is v, (v, 1) is v + n. Zero weights are raised
+    # slightly since sparse graphs drop explicit zeros
+    u, v = edges[:, 0], edges[:, 1]
+    weight = (values[u] + values[v]) / 2 + EPSILON / (2 * n)
+    cover = scipy.sparse.coo_matrix(
+        (
+            np.concatenate((weight, weight)),
+            (np.concatenate((u, u + n)), np.concatenate((v + n, v)))
+        ),
+        shape=(2 * n, 2 * n)
+    ).tocsr()
+
+    # Only vertices with c < 1 can lie on a violated cycle
+    candidates = np.flatnonzero(values < 1 - EPSILON)
+
+    found = {}
+    for start in range(0, len(candidates), SOURCE_CHUNK_SIZE):
+        sources = candidates[start:start + SOURCE_CHUNK_SIZE]
+        distances, predecessors = scipy.sparse.csgraph.dijkstra(
+            cover, directed=False, indices=sources,
+            return_predecessors=True
+        )
+        for row, source in enumerate(sources):
+            if distances[row, source + n] >= 1 - EPSILON:
+                continue
+
+            # Walk back from (v, 1) to (v, 0)
+            walk = []
+            node = source + n
+            while node != source:
+                walk.append(int(node) % n)
+                node = predecessors[row, node]
+            walk.append(int(source))
+
+            cycle = _odd_cycle_in_walk(walk)
+            key = frozenset(cycle)
+            if key not in found:
+                found[key] = (values[cycle].sum(), cycle)
+            if len(found) == max_cycles:
+                break
+        if len(found) == max_cycles:
+            break
+
+    # Lightest first
+    return [cycle for _, cycle in sorted(found.values(), key=lambda x: x[0])]
+
+
+def integral_odd_cycles(num_vertices, adjacency, removed, max_cycles=None):
+    """Find odd cycles of the graph left after removing some vertices.
+
+    A breadth first search two colors every component. Every edge between
+    two vertices of the same color closes an odd cycle with the tree paths
+    to their lowest common ancestor.
+
+    Parameters
+    ----------
+    num_vertices : int
+        Number of vertices.
+    adjacency : list<list>
+        Neighbors of every vertex.
+    removed : numpy.ndarray
+        Boolean mask of removed vertices.
+    max_cycles : int
+        Stop after finding this many cycles.
+
+    Returns
+    -------
+    list<list>
+        Distinct odd cycles. Empty if and only if the remaining graph is
+        bipartite.
+    """
+    parent = np.full(num_vertices, -1, dtype=np.int64)
+    depth = np.full(num_vertices, -1, dtype=np.int64)
+    found = {}
+
+    for root in range(num_vertices):
+        if removed[root] or depth[root] >= 0:
+            continue
+        depth[root] = 0
+        queue = deque([root])
+        while queue:
+            u = queue.popleft()
+            for v in adjacency[u]:
+                if removed[v]:
+                    continue
+                if depth[v] < 0:
+                    depth[v] = depth[u] + 1
+                    parent[v] = u
+                    queue.append(v)
+                elif depth[v] == depth[u] and u < v:
+                    # Climb to the lowest common ancestor
+                    left, right = [u], [v]
+                    while left[-1] != right[-1]:
+                        left.append(parent[left[-1]])
+                        right.append(parent[right[-1]])
+                    cycle = left + right[-2::-1]
+                    key = frozenset(cycle)
+                    if key not in found:
+                        found[key] = [int(x) for x in cycle]
+                    if len(found) == max_cycles:
+                        return list(found.values())
+
+    return list(found.values())
+
+
+def cover_odd_cycles(num_vertices, adjacency, removed, max_cycles=None):
+    """Greedily remove vertices until the remaining graph is bipartite.
+
+    In every round, odd cycles of the remaining graph are found, and each
+    cycle not yet hit in the round loses its vertex of highest degree.
+
+    Parameters
+    ----------
+    num_vertices : int
+        Number of vertices.
+    adjacency : list<list>
+        Neighbors of every vertex.
+    removed : numpy.ndarray
+        Boolean mask of vertices already removed.
+    max_cycles : int
+        Number of cycles found per round.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean mask of the removed vertices, an OCT including `removed`.
+    """
+    removed = np.array(removed, dtype=bool)
+    cycles = integral_odd_cycles(num_vertices, adjacency, removed, max_cycles)
+    while cycles:
+        for cycle in cycles:
+            if not removed[cycle].any():
+                removed[max(cycle, key=lambda v: len(adjacency[v]))] = True
+        cycles = integral_odd_cycles(
+            num_vertices, adjacency, removed, max_cycles
+        )
+    return removed
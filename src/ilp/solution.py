@@ -1,12 +1,54 @@
 """OCT or VC solution class."""
 
 
+import json
+import struct
+
+import numpy as np
+
+from src.usage import Usage
+
+
+# Solution statuses
+OPTIMAL = 'optimal'
+FEASIBLE = 'feasible'
+
+# Length prefix of the metadata in the binary serialization
+_HEADER = struct.Struct('<I')
+
+
+def _plain(value):
+    """Convert NumPy scalars for JSON serialization."""
+    return value.item()
+
+
+def certificate_array(certificate):
+    """Convert vertex labels into a certificate array.
+
+    Parameters
+    ----------
+    certificate : iterable
+        Integer vertex labels, as integers or integer strings.
+
+    Returns
+    -------
+    numpy.ndarray
+        Sorted int64 array of the labels.
+    """
+    if isinstance(certificate, np.ndarray):
+        return np.sort(certificate.astype(np.int64))
+    return np.sort(np.array([int(v) for v in certificate], dtype=np.int64))
+
+
 def vc_to_oct(solution):
     """Convert a VertexCover solution into an OCT solution.
 
     This is done by undoing the graph doubling done to reduce
-    OCT to VC. The certificate is recovered as the vertes
-    whose counterparts are both in the VC certificate.
+    OCT to VC. Vertex v of the original graph is doubled into
+    v and v + n/2, and the certificate is recovered as the
+    vertices whose counterparts are both in the VC certificate.
+    Since the doubled graph has n/2 + 2m' edges, the original
+    graph has m' = (m - n/2) / 2 of them.
 
     Parameters
     ----------
@@ -22,27 +64,34 @@ def vc_to_oct(solution):
     # Raise exception if there are an odd number of vertices
     if solution.n % 2 != 0:
         raise Exception('Vertices in VC->OCT solution must be even')
+    half = solution.n // 2
 
-    # Copy graph and remove doubled nodes
-    graph = solution.g.copy()
-    graph.remove_nodes_from(map(str, range(int(solution.n / 2), solution.n)))
-
-    # Construct new certificate
-    certificate = [
-        n
-        for n in graph.nodes()
-        if n in solution.certificate
-        and str(int(n) + len(graph.nodes())) in solution.certificate
-    ]
+    # Keep vertices whose both copies are covered
+    covered = np.zeros(solution.n, dtype=bool)
+    covered[solution.certificate] = True
+    certificate = np.flatnonzero(covered[:half] & covered[half:])
 
-    # Return new solution
+    # Return new solution, with the VC bound shifted by the doubled vertices
     return Solution(
-        G=graph,
+        n=half,
+        m=(solution.m - half) // 2,
         certificate=certificate,
         threads=solution.threads,
         mipgap=solution.mipgap,
         time=solution.time,
-        cuts=solution.cuts
+        cuts=solution.cuts,
+        status=solution.status,
+        bound=None if solution.bound is None else solution.bound - half,
+        components=solution.components,
+        usage=solution.usage,
+        trace=[
+            (
+                time,
+                None if incumbent is None else incumbent - half,
+                None if bound is None else bound - half
+            )
+            for time, incumbent, bound in solution.trace
+        ]
     )
 
 
@@ -55,54 +104,153 @@ class Solution():
         Number of nodes in the graph.
     m : int
         Number of edges in the graph.
-    g : Networkx Graph
-        An instance of the original graph.
     threads : int
         Number of threads used to find the solution. Zero indicates
         solver was run in auto mode.
+    mipgap : float
+        MIP relative tolerance on the gap from the best integer objective.
     time : double
         Length of time taken to find the solution.
-    certificate : list
-        List of nodes in the solution.
+    certificate : numpy.ndarray
+        Sorted int64 array of the vertices in the solution.
     opt : int
         Size of the solution.
     cuts : list
         List of cut tuples made during optimization of the form
         (cut_name, cut_number).
+    status : str
+        OPTIMAL if the solution was proven optimal, FEASIBLE otherwise.
+    bound : float
+        Best known lower bound on the optimum, or None.
+    components : list
+        Breakdown of a solution merged from independently solved connected
+        components, as (n, m, opt, time) tuples. Empty otherwise.
+    trace : list
+        (time, incumbent, bound) events reported while solving.
+    usage : Usage
+        Resource usage of the solve, see `src.usage`, or None.
     """
 
-    def __init__(self, *args, **kwargs):
+    __slots__ = (
+        'n', 'm', 'threads', 'mipgap', 'time', 'certificate', 'cuts',
+        'status', 'bound', 'components', 'trace', 'usage'
+    )
+
+    def __init__(self, G=None, n=None, m=None, certificate=(), time=0,
+                 threads=1, mipgap=0, cuts=(), status=OPTIMAL, bound=None,
+                 components=(), trace=(), usage=None):
         """Initialize Solution.
 
         Parameters
         ----------
         G : Networkx Graph
-            Graph for solution.
+            Graph for solution. Only its size is kept. Either G or both n
+            and m are required.
+        n : int
+            Number of nodes in the graph.
+        m : int
+            Number of edges in the graph.
+        certificate : iterable
+            Integer labels of the vertices in the solution.
+        time : float
+            Time taken to find solution.
         threads : int
             Number of threads used to find the solution.
         mipgap : float
             MIP relative tolerance on the gap from the best integer objective.
-        certificate : list
-            List of vertex names in the solution.
-        time : float
-            Time taken to find solution.
         cuts : list<tuple>
             List of all cuts made.
+        status : str
+            OPTIMAL or FEASIBLE.
+        bound : float
+            Best known lower bound on the optimum.
+        components : list<tuple>
+            Optional (n, m, opt, time) breakdown per solved component.
+        trace : list<tuple>
+            Optional (time, incumbent, bound) progress events.
+        usage : Usage
+            Optional resource usage of the solve.
         """
+        if G is not None:
+            n, m = G.number_of_nodes(), G.number_of_edges()
+        if n is None or m is None:
+            raise Exception('Missing required key word argument.')
+        self.n = int(n)
+        self.m = int(m)
+        self.certificate = certificate_array(certificate)
+        self.time = float(time)
+        self.threads = int(threads)
+        self.mipgap = float(mipgap)
+        self.cuts = [tuple(cut) for cut in cuts]
+        self.status = status
+        self.bound = None if bound is None else float(bound)
+        self.components = [tuple(c) for c in components]
+        self.trace = [tuple(event) for event in trace]
+        self.usage = None if usage is None else Usage(*usage)
+
+    @property
+    def opt(self):
+        """Size of the solution."""
+        return len(self.certificate)
+
+    def to_dict(self):
+        """Return the Solution as a dictionary of plain Python values."""
+        return {
+            'n': self.n,
+            'm': self.m,
+            'certificate': self.certificate.tolist(),
+            'time': self.time,
+            'threads': self.threads,
+            'mipgap': self.mipgap,
+            'cuts': self.cuts,
+            'status': self.status,
+            'bound': self.bound,
+            'components': self.components,
+            'trace': self.trace,
+            'usage': self.usage
+        }
+
+    @classmethod
+    def from_dict(cls, values):
+        """Construct a Solution from the output of `to_dict`."""
+        return cls(**values)
+
+    def to_json(self):
+        """Serialize the Solution as a JSON string."""
+        return json.dumps(self.to_dict(), default=_plain)
+
+    @classmethod
+    def from_json(cls, text):
+        """Construct a Solution from the output of `to_json`."""
+        return cls.from_dict(json.loads(text))
+
+    def to_bytes(self):
+        """Serialize the Solution compactly.
+
+        The certificate is stored as raw little endian int64 values after a
+        length prefixed JSON header holding every other attribute.
+        """
+        values = self.to_dict()
+        del values['certificate']
+        header = json.dumps(values, default=_plain).encode('utf-8')
+        return b''.join((
+            _HEADER.pack(len(header)),
+            header,
+            self.certificate.astype('<i8').tobytes()
+        ))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Construct a Solution from the output of `to_bytes`."""
+        size, = _HEADER.unpack_from(data)
+        start = _HEADER.size + size
+        values = json.loads(data[_HEADER.size:start].decode('utf-8'))
+        values['certificate'] = np.frombuffer(data[start:], dtype='<i8')
+        return cls.from_dict(values)
 
-        # Assign variables
-        try:
-            self.g = kwargs.pop('G')
-            self.n = len(self.g.nodes())
-            self.m = len(self.g.edges())
-            self.threads = kwargs.pop('threads')
-            self.mipgap = kwargs.pop('mipgap')
-            self.certificate = kwargs.pop('certificate')
-            self.time = kwargs.pop('time')
-            self.cuts = kwargs.pop('cuts')
-            self.opt = len(self.certificate)
-        except KeyError as e:
-            raise Exception('Missing required key word argument.') from e
+    def __reduce__(self):
+        """Pickle through the binary serialization."""
+        return (Solution.from_bytes, (self.to_bytes(),))
 
     def __str__(self):
         """Return Solution info as a string."""
@@ -114,10 +262,20 @@ class Solution():
             'time = {:.3f}\n'
             'threads = {}\n'
             'mipgap = {}\n'
+            'status = {}\n'
+            'bound = {}\n'
             'certificate = {}\n'
             'cuts = \n{}'
+            '{}'
         ).format(
             self.n, self.m, self.opt, self.time, self.threads, self.mipgap,
+            self.status, 'NA' if self.bound is None else self.bound,
             ' '.join(map(str, self.certificate)),
-            '\n'.join(['  {}: {}'.format(*cut) for cut in self.cuts])
+            '\n'.join(['  {}: {}'.format(*cut) for cut in self.cuts]),
+            ''.join(
+                '\ncomponent n = {}, m = {}, opt = {}, time = {:.3f}'.format(
+                    *component
+                )
+                for component in self.components
+            )
         )
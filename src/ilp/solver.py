@@ -6,18 +6,28 @@ and must be installed independently of `requirements.txt`.
 
 
 # Imports
+from src.ilp.bounds import lower_bound
 from src.ilp.cplex.solver import solve_with_cplex
 from src.ilp.glpk.solver import solve_with_glpk
+from src.ilp.greedy import greedy_certificate
 from src.ilp.solution import vc_to_oct
-from src.ilp.solution import Solution
+from src.ilp.solution import FEASIBLE, OPTIMAL, Solution
+from src.preprocessing.graphs import open_path, strip_compression
+from src.runner import default_runner
+from src.usage import combine, Meter
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from timeit import default_timer
 import getopt
 import networkx as nx
+import numbers
+import numpy as np
 import os
 import sys
 
 
 # Constants
-FORMULATIONS = ('OCT', 'VC')
+FORMULATIONS = ('OCT', 'VC', 'OCT_CYCLES')
 SOLVERS = ('GLPK', 'CPLEX')
 FORMULATION = '--formulation'
 MIPGAP = '--mipgap'
@@ -26,13 +36,18 @@ THREADS = '--threads'
 TIMELIMIT = '--timelimit'
 MEMLIMIT = '--memlimit'
 CONVERT_TO_OCT = '--convert-to-oct'
+SYMMETRY_BREAKING = '--symmetry-breaking'
 USAGE = (
     'Usage: python -m src.ilp.solver '
     '[--formulation=] [--mipgap=] [--solver=] '
     '[--threads=] [--timelimit=] [--memlimit=] '
-    '[--convert-to-oct=] <edgelist-file>'
+    '[--convert-to-oct=] [--symmetry-breaking=] <edgelist-file>'
 )
 
+# Seconds left below which components are no longer solved but covered
+# greedily. glpsol's time limit is in whole seconds
+MIN_TIMELIMIT = 1.0
+
 
 def read_edgelist(filename):
     """Read edgelist.
@@ -40,7 +55,7 @@ def read_edgelist(filename):
     Parameters
     ----------
     filename : string
-        Edgelist filename
+        Edgelist filename. May be gzip, xz or bz2 compressed.
 
     Returns
     -------
@@ -49,30 +64,160 @@ def read_edgelist(filename):
     """
 
     # Split file extension
-    name, extension = os.path.splitext(filename)
+    name, extension = os.path.splitext(strip_compression(filename))
 
-    # Read file
-    if extension == '.edgelist':
-        with open(filename, 'r') as edgelist:
-            lines = edgelist.readlines()
-        G = nx.parse_edgelist(lines[1:])
-    else:
-        G = nx.read_edgelist(filename)
+    # Read file, streaming lines to the parser
+    with open_path(filename, 'r') as edgelist:
+        if extension == '.edgelist':
+            edgelist.readline()
+        G = nx.parse_edgelist(edgelist)
 
     return G
 
 
+def _solve_graph(G, solver, options):
+    """Solve a single graph with the chosen backend.
+
+    Parameters
+    ----------
+    G : Networkx Graph
+        Graph to solve.
+    solver : string
+        Either GLPK or CPLEX.
+    options : dict
+        Keyword arguments of the backend. `threads` is dropped for GLPK
+        and `limits` for CPLEX. If `prove_incumbent` is set, an incumbent
+        of an OCT formulation is first compared to the lower bound of
+        `src.ilp.bounds`.
+
+    The usage of the solution combines that of the solver subprocesses with
+    that of the current process during the solve. The time of the lower
+    bound counts against the time limit and is added to the solution time.
+    """
+    with Meter() as meter:
+        options = dict(options)
+        prove = options.pop('prove_incumbent', False)
+        incumbent = options.get('incumbent')
+
+        # The incumbent may already be proven optimal by the lower bound
+        elapsed = 0.0
+        solution = None
+        if (prove and incumbent is not None and
+                options.get('formulation') != 'VC'):
+            start = default_timer()
+            bound = lower_bound(G)
+            elapsed = default_timer() - start
+            if bound >= len(incumbent):
+                solution = Solution(
+                    G=G,
+                    threads=options.get('threads', 1),
+                    mipgap=options.get('mipgap', 0),
+                    certificate=incumbent,
+                    cuts=[],
+                    bound=len(incumbent)
+                )
+            elif options.get('timelimit') is not None:
+                options['timelimit'] = max(
+                    0.0, options['timelimit'] - elapsed
+                )
+
+        # Solve unless the incumbent is proven optimal
+        if solution is None:
+            if solver == 'GLPK':
+                options.pop('threads', None)
+                solution = solve_with_glpk(G, **options)
+            elif solver == 'CPLEX':
+                options.pop('limits', None)
+                solution = solve_with_cplex(G, **options)
+            else:
+                raise Exception('Unknown Solver')
+    solution.time += elapsed
+    solution.usage = combine([solution.usage, meter.usage])
+    return solution
+
+
+def _cover_graph(G, options):
+    """Cover a graph left without time without running a solver.
+
+    The incumbent certificate is returned if there is one, otherwise a
+    greedy certificate of `src.ilp.greedy`.
+    """
+    start = default_timer()
+    certificate = options.get('incumbent')
+    if certificate is None:
+        certificate = greedy_certificate(G, options.get('formulation'))
+    return Solution(
+        G=G,
+        threads=options.get('threads', 1),
+        mipgap=options.get('mipgap', 0),
+        certificate=certificate,
+        time=round(default_timer() - start, 1),
+        cuts=[],
+        status=FEASIBLE
+    )
+
+
+def _is_trivial(G, formulation):
+    """Whether G has an empty optimal certificate."""
+    if formulation in ('OCT', 'OCT_CYCLES'):
+        return nx.is_bipartite(G)
+    return not G.edges()
+
+
+def _merge_cuts(solutions):
+    """Sum cut counts of the same type over several solutions."""
+    cuts = OrderedDict()
+    for solution in solutions:
+        for name, count in solution.cuts:
+            if isinstance(count, numbers.Number):
+                cuts[name] = cuts.get(name, 0) + count
+            else:
+                cuts.setdefault(name, count)
+    return list(cuts.items())
+
+
 def solve(G, formulation='OCT', mipgap=0, solver='GLPK',
           threads=1, timelimit=None, memlimit=None,
-          convert_to_oct=False):
+          convert_to_oct=False, incumbent=None, decompose=True,
+          processes=None, symmetry_breaking=False, on_event=None,
+          target_gap=None, target_objective=None, limits=None,
+          prove_incumbent=False):
     """Solve an ILP problem instance with CPLEX or GLPK.
 
+    A known solution, for instance from the heuristic ensemble, can be
+    passed as `incumbent`. GLPK then only searches below its size and
+    returns it if nothing better exists, while CPLEX uses it as a MIP start
+    and objective cutoff. With `prove_incumbent`, for the OCT formulations,
+    the incumbent of every solved component is first compared to the lower
+    bound of `src.ilp.bounds`, and returned as optimal without running a
+    solver if they match.
+
+    Unless disabled, the graph is split into connected components first.
+    Components with an empty optimal certificate (bipartite for OCT, edgeless
+    for VC) are skipped, and the rest are solved in a process pool. Each
+    component receives a share of the time limit proportional to its number
+    of edges. When components are solved one at a time, the share is of the
+    time left, so time unused by earlier components goes to later ones, and
+    once less than `MIN_TIMELIMIT` seconds are left the remaining components
+    are covered greedily instead. A backend that finds no solution in time
+    returns a greedy certificate too, so the merged solution is then only
+    feasible. It sums the component times and lists them in its
+    `components` breakdown.
+
+    Incumbent and bound changes are reported to `on_event` as (time,
+    incumbent, bound) events and kept in the solution's trace. The solve
+    stops early once `target_gap` or `target_objective` is reached, see the
+    backends for details. Events and the target objective refer to a whole
+    graph, so they are only used when a single component is solved; the
+    target gap applies to every component.
+
     Parameters
     ----------
     G : Networkx Graph
         Graph for which OCT will be computed
     formulation : string
-        How problem should be solved. Either OCT or VC.
+        How problem should be solved. Either OCT, VC, or OCT_CYCLES. The
+        latter generates odd cycle inequalities lazily and requires GLPK.
     mipgap : float
         Allowed gap in tolerance
     solver : string
@@ -86,37 +231,179 @@ def solve(G, formulation='OCT', mipgap=0, solver='GLPK',
     convert_to_oct : bool
         If True and formulation=VC, the solution will be converted
         to an OCT solution before returning.
+    incumbent : list or int
+        Optional certificate of a known solution in the chosen formulation,
+        or just an upper bound on its size.
+    decompose : bool
+        Whether to solve connected components separately.
+    processes : int
+        Number of components solved at once. Defaults to `threads`, in
+        which case the threads are divided among the processes, or to 1 if
+        threads is zero or less.
+    symmetry_breaking : bool
+        If True and formulation=OCT, the side of one high degree anchor
+        vertex per component is fixed and triangle inequalities are added.
+    on_event : callable
+        Called with every new progress Event. Never called if more than one
+        component is solved, so e.g. an `experiments.checkpoint.Checkpoint`
+        records no progress for such graphs.
+    target_gap : float
+        Relative gap at which to stop early.
+    target_objective : float
+        Incumbent objective at which to stop early, e.g. a known optimum.
+        CPLEX only.
+    limits : src.limits.Limits
+        Optional hard memory and CPU limits of every glpsol process. CPLEX
+        runs in this process, so it is only bounded by memlimit and
+        threads.
+    prove_incumbent : bool
+        Whether to compare an incumbent certificate to the lower bound. Off
+        by default, since the bound takes roughly quadratic time, and its
+        time counts against the time limit.
     """
 
-    # Solve
-    if not G.nodes():
-        return Solution(
+    # Validate solver
+    if solver not in SOLVERS:
+        raise Exception('Unknown Solver')
+
+    start = default_timer()
+
+    # Split the incumbent into a bound and an optional certificate
+    if isinstance(incumbent, numbers.Integral):
+        upper_bound, incumbent = int(incumbent), None
+    elif incumbent is not None:
+        incumbent = list(incumbent)
+        upper_bound = len(incumbent)
+    else:
+        upper_bound = None
+
+    # Options shared by every backend call
+    options = {
+        'formulation': formulation,
+        'mipgap': mipgap,
+        'threads': threads,
+        'timelimit': timelimit,
+        'memlimit': memlimit,
+        'upper_bound': upper_bound,
+        'incumbent': incumbent,
+        'symmetry_breaking': symmetry_breaking,
+        'on_event': on_event,
+        'target_gap': target_gap,
+        'target_objective': target_objective,
+        'limits': limits,
+        'prove_incumbent': prove_incumbent
+    }
+
+    # Nothing to solve on an empty graph, and nothing beats an empty
+    # certificate
+    if not G.nodes() or incumbent == []:
+        solution = Solution(
             G=G,
             threads=threads,
             mipgap=mipgap,
             certificate=[],
             time=0,
-            cuts=[]
+            cuts=[],
+            bound=0
         )
-    elif solver == 'GLPK':
-        solution = solve_with_glpk(
-            G,
-            formulation=formulation,
-            mipgap=mipgap,
-            timelimit=timelimit,
-            memlimit=memlimit
+        if not G.nodes():
+            return solution
+
+    # Solve the whole graph at once
+    elif not decompose:
+        solution = _solve_graph(G, solver, options)
+
+    # Solve the nontrivial components, largest first
+    else:
+        components = sorted(
+            (
+                G.subgraph(nodes).copy()
+                for nodes in nx.connected_components(G)
+            ),
+            key=lambda component: component.number_of_edges(),
+            reverse=True
         )
-    elif solver == 'CPLEX':
-        solution = solve_with_cplex(
-            G,
-            formulation=formulation,
-            mipgap=mipgap,
+        components = [
+            component for component in components
+            if not _is_trivial(component, formulation)
+        ]
+        num_edges = sum(c.number_of_edges() for c in components)
+
+        # Divide threads among processes. Zero or fewer threads leave the
+        # number of threads to CPLEX, which is kept for every component
+        if processes is None:
+            processes = threads if threads > 0 else 1
+        processes = max(1, min(int(processes), len(components)))
+        if threads > 0:
+            component_threads = max(1, threads // processes)
+        else:
+            component_threads = threads
+
+        # Build one job per component
+        jobs = []
+        for component in components:
+            job = dict(options, threads=component_threads)
+            if timelimit is not None:
+                job['timelimit'] = (
+                    float(timelimit) * component.number_of_edges() / num_edges
+                )
+            if incumbent is not None:
+                nodes = set(map(str, component.nodes()))
+                job['incumbent'] = [v for v in incumbent if str(v) in nodes]
+                job['upper_bound'] = len(job['incumbent'])
+            if len(components) > 1:
+                job['on_event'] = None
+                job['target_objective'] = None
+                if incumbent is None:
+                    job['upper_bound'] = None
+            jobs.append(job)
+
+        # Solve. One at a time, every component gets its share of the time
+        # left, so time unused by earlier components goes to later ones, but
+        # at least MIN_TIMELIMIT and at most all of it. Once less is left, the
+        # remaining components are covered without a solver
+        if processes == 1:
+            solutions = []
+            left = num_edges
+            for component, job in zip(components, jobs):
+                remaining = None
+                if timelimit is not None:
+                    remaining = float(timelimit) - (default_timer() - start)
+                    job['timelimit'] = min(remaining, max(
+                        MIN_TIMELIMIT,
+                        remaining * component.number_of_edges() / left
+                    ))
+                left -= component.number_of_edges()
+                if remaining is not None and remaining < MIN_TIMELIMIT:
+                    solutions.append(_cover_graph(component, job))
+                else:
+                    solutions.append(_solve_graph(component, solver, job))
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                futures = [
+                    pool.submit(_solve_graph, component, solver, job)
+                    for component, job in zip(components, jobs)
+                ]
+                solutions = [future.result() for future in futures]
+
+        # Merge
+        optimal = all(s.status == OPTIMAL for s in solutions)
+        bounds = [s.bound for s in solutions]
+        solution = Solution(
+            G=G,
             threads=threads,
-            timelimit=timelimit,
-            memlimit=memlimit
+            mipgap=mipgap,
+            certificate=np.concatenate(
+                [s.certificate for s in solutions] + [np.empty(0, np.int64)]
+            ),
+            time=sum(s.time for s in solutions),
+            cuts=_merge_cuts(solutions),
+            status=OPTIMAL if optimal else FEASIBLE,
+            bound=None if None in bounds else sum(bounds),
+            components=[(s.n, s.m, s.opt, s.time) for s in solutions],
+            trace=solutions[0].trace if len(solutions) == 1 else [],
+            usage=combine(s.usage for s in solutions)
         )
-    else:
-        raise Exception('Unknown Solver')
 
     # Return
     if formulation == 'VC' and convert_to_oct:
@@ -125,6 +412,18 @@ def solve(G, formulation='OCT', mipgap=0, solver='GLPK',
         return solution
 
 
+async def solve_async(G, runner=None, **options):
+    """Solve an ILP problem instance as a job of an asyncio runner.
+
+    Options are as for `solve`, and runner is a `src.runner.Runner`,
+    defaulting to the shared one. GLPK and CPLEX manage their own processes
+    and threads, so the solve runs on a thread within the runner's limit.
+    """
+    if runner is None:
+        runner = default_runner()
+    return await runner.run_blocking(solve, G, **options)
+
+
 def main():
     """Parse call, solve, and report solution."""
 
@@ -136,7 +435,8 @@ def main():
         THREADS: '1',
         TIMELIMIT: None,
         MEMLIMIT: None,
-        CONVERT_TO_OCT: False
+        CONVERT_TO_OCT: False,
+        SYMMETRY_BREAKING: False
     }
 
     # Validate options
@@ -146,7 +446,7 @@ def main():
         opts, args = getopt.getopt(sys.argv[1:], None, [
             'formulation=', 'mipgap=', 'solver=',
             'threads=', 'timelimit=', 'memlimit=',
-            'convert-to-oct='
+            'convert-to-oct=', 'symmetry-breaking='
         ])
 
         # Error if input file is not specified
@@ -166,6 +466,8 @@ def main():
             opts_dict[MEMLIMIT] = int(opts_dict[MEMLIMIT])
         if opts_dict[CONVERT_TO_OCT] == 'True':
             opts_dict[CONVERT_TO_OCT] = True
+        if opts_dict[SYMMETRY_BREAKING] == 'True':
+            opts_dict[SYMMETRY_BREAKING] = True
 
         # Validate enumeration options
         if (opts_dict[FORMULATION] not in FORMULATIONS or
@@ -192,7 +494,8 @@ def main():
         threads=opts_dict[THREADS],
         timelimit=opts_dict[TIMELIMIT],
         memlimit=opts_dict[MEMLIMIT],
-        convert_to_oct=opts_dict[CONVERT_TO_OCT]
+        convert_to_oct=opts_dict[CONVERT_TO_OCT],
+        symmetry_breaking=opts_dict[SYMMETRY_BREAKING]
     ))
 
 
@@ -0,0 +1,61 @@
+"""Valid strengthenings of the OCT formulation.
+
+The `s` variables of the OCT formulation only encode a two coloring, so
+swapping both sides within any connected component yields an equivalent
+solution. Fixing the side of one anchor vertex per component removes this
+symmetry, and triangle inequalities cut off fractional points of the LP
+relaxation where every vertex of a triangle is half in the OCT set.
+"""
+
+
+import networkx as nx
+
+
+def anchors(G):
+    """Choose one anchor vertex per connected component.
+
+    The anchor is the vertex of highest degree, ties broken by the order of
+    `G.nodes()`, so the choice is deterministic for a given graph.
+
+    Parameters
+    ----------
+    G : Networkx Graph
+        Graph to choose anchors in.
+
+    Returns
+    -------
+    list
+        One vertex per connected component with at least one edge.
+    """
+    position = {vertex: i for i, vertex in enumerate(G.nodes())}
+    return sorted(
+        (
+            max(component, key=lambda v: (G.degree(v), -position[v]))
+            for component in nx.connected_components(G)
+            if len(component) > 1
+        ),
+        key=position.get
+    )
+
+
+def triangles(G):
+    """Generate every triangle of G exactly once.
+
+    Parameters
+    ----------
+    G : Networkx Graph
+        Graph to enumerate triangles in.
+
+    Returns
+    -------
+    generator
+        Vertex triples (u, v, w), ordered as in `G.nodes()`.
+    """
+    position = {vertex: i for i, vertex in enumerate(G.nodes())}
+    for u in G.nodes():
+        later = [v for v in G.neighbors(u) if position[v] > position[u]]
+        later.sort(key=position.get)
+        for i, v in enumerate(later):
+            for w in later[i + 1:]:
+                if G.has_edge(v, w):
+                    yield u, v, w
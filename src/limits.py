@@ -0,0 +1,94 @@
+"""Hard resource limits of solver processes.
+
+Solvers run as subprocesses can be given a hard limit on their address
+space, through `RLIMIT_AS`, and the cores they may run on, through
+`sched_setaffinity`, so that many jobs share a node predictably. Both are
+applied in the child between fork and exec. A solver exceeding its memory
+limit fails to allocate and exits, which the wrappers report by raising
+`MemoryLimitExceeded`, the "memout" status of a job.
+
+JVMs reserve far more address space than they use, so their memory is
+capped with JVM flags instead, see `src.akiba_iwata.solver`. A JVM failing
+to start is then an error rather than a memout.
+"""
+
+
+# Imports
+from collections import namedtuple
+import os
+import resource
+
+
+# Status of a job which exceeded its memory limit
+MEMOUT = 'memout'
+
+# Limits of a solver process. Memory is the address space in megabytes and
+# cpus the cores it may run on. Either may be None for no limit
+Limits = namedtuple('Limits', ['memory', 'cpus'])
+Limits.__new__.__defaults__ = (None, None)
+
+# Messages printed by solvers failing to allocate memory: C++ solvers,
+# the JVM and glpsol, respectively
+_MEMOUT_MESSAGES = (
+    b'std::bad_alloc',
+    b'OutOfMemoryError',
+    b'insufficient memory',
+    b'no memory available'
+)
+
+
+class MemoryLimitExceeded(Exception):
+    """Raised when a solver process exceeds its memory limit."""
+
+    status = MEMOUT
+
+
+def preexec(limits):
+    """Function applying limits in a child process, for `preexec_fn`.
+
+    Parameters
+    ----------
+    limits : Limits
+        Limits to apply, or None.
+
+    Returns
+    -------
+    callable
+        Function to pass as the `preexec_fn` of `subprocess.Popen`, or None
+        if there is nothing to limit.
+    """
+    if limits is None or limits == Limits():
+        return None
+    if limits.cpus is not None and not hasattr(os, 'sched_setaffinity'):
+        raise Exception('CPU affinity is not supported on this platform')
+
+    def _apply():
+        if limits.memory is not None:
+            size = int(limits.memory) * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (size, size))
+        if limits.cpus is not None:
+            os.sched_setaffinity(0, limits.cpus)
+
+    return _apply
+
+
+def check(limits, returncode, output):
+    """Raise MemoryLimitExceeded if a failed process ran out of memory.
+
+    Parameters
+    ----------
+    limits : Limits
+        Limits the process ran with, or None.
+    returncode : int
+        Exit status of the process.
+    output : bytes or str
+        Output in which the process reports its errors.
+    """
+    if not returncode or limits is None or limits.memory is None:
+        return
+    if isinstance(output, str):
+        output = output.encode('utf-8')
+    if any(message in output for message in _MEMOUT_MESSAGES):
+        raise MemoryLimitExceeded(
+            'Memory limit of {} MB exceeded'.format(limits.memory)
+        )
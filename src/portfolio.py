@@ -0,0 +1,328 @@
+"""Race exact OCT solvers against each other on the same instance.
+
+No single exact solver is fastest on every instance, and their running
+times differ by orders of magnitude. A portfolio starts several of them at
+once on the same graph, takes the first answer proven optimal and stops
+the others, e.g.
+
+    from src.portfolio import portfolio
+
+    answer = portfolio(G, solvers=('ic', 'ai', 'ilp'), weights=(1, 1, 2))
+    print(answer.solver, answer.size)
+
+Every racer runs in a process of its own, which is pinned to its share of
+the cores, split by weight, and is stopped together with any solver
+process it started. The iterative compression and Akiba-Iwata solvers are
+single threaded, so only the ILP racer makes use of more than one core.
+"""
+
+
+# Imports
+from collections import namedtuple
+from multiprocessing.connection import wait
+from timeit import default_timer
+import argparse
+import multiprocessing
+import os
+import signal
+import subprocess
+
+import networkx as nx
+
+from src.akiba_iwata.solver import solve as solve_ai
+from src.huffner.solver import solve as solve_ic
+from src.ilp.solution import OPTIMAL
+from src.ilp.solver import read_edgelist, solve as solve_ilp
+from src.runner import TERMINATE_GRACE
+
+
+# Solvers which may race, see `portfolio`
+SOLVERS = ('ic', 'ai', 'ilp')
+
+# Answer of a racer. Time is in seconds since the start of the race, and
+# optimal is True if the certificate is proven to be a minimum OCT
+Answer = namedtuple(
+    'Answer',
+    ['solver', 'time', 'size', 'certificate', 'optimal']
+)
+
+
+def _race_ic(G, cores, options):
+    """Solve with iterative compression.
+
+    Huffner is stopped at its timeout with the best solution so far, so the
+    answer is only optimal if it finished before then.
+    """
+    options = dict({'preprocessing': 2}, **options)
+    timeout = options.get('timeout')
+    start = default_timer()
+    _, _, certificate = solve_ic(G, **options)
+    optimal = timeout is None or default_timer() - start < timeout
+    return [int(v) for v in certificate], optimal
+
+
+def _race_ai(G, cores, options):
+    """Solve with Akiba-Iwata."""
+    _, _, certificate = solve_ai(G, convert_to_oct=True, **options)
+    return certificate, True
+
+
+def _race_ilp(G, cores, options):
+    """Solve with an ILP, with as many threads as cores."""
+    options = dict({
+        'formulation': 'OCT',
+        'solver': 'CPLEX',
+        'threads': cores,
+        'processes': 1
+    }, **options)
+    solution = solve_ilp(G, **options)
+    return (
+        [int(v) for v in solution.certificate],
+        solution.status == OPTIMAL
+    )
+
+
+# Racer of every solver, returning (certificate, optimal) for a graph
+# labeled 0, ..., n-1, a number of cores and keyword arguments
+_RACERS = {
+    'ic': _race_ic,
+    'ai': _race_ai,
+    'ilp': _race_ilp
+}
+
+
+def share_cores(weights, cpus):
+    """Split cores between racers in proportion to their weights.
+
+    Every racer gets at least one core. If there are fewer cores than
+    racers, racers share single cores in turn.
+
+    Parameters
+    ----------
+    weights : list<float>
+        Positive weight of every racer.
+    cpus : list<int>
+        Cores available to the race.
+
+    Returns
+    -------
+    list<list>
+        Cores of every racer, disjoint unless there are too few of them.
+    """
+    if any(weight <= 0 for weight in weights):
+        raise Exception('Racer weights must be positive')
+    if len(cpus) < len(weights):
+        return [[cpus[i % len(cpus)]] for i in range(len(weights))]
+
+    # One core each, and the rest by largest remainder
+    spare = len(cpus) - len(weights)
+    quotas = [spare * weight / sum(weights) for weight in weights]
+    counts = [1 + int(quota) for quota in quotas]
+    order = sorted(
+        range(len(weights)),
+        key=lambda i: int(quotas[i]) - quotas[i]
+    )
+    for i in order[:len(cpus) - sum(counts)]:
+        counts[i] += 1
+
+    # Consecutive blocks
+    shares = []
+    for count in counts:
+        shares.append(cpus[:count])
+        cpus = cpus[count:]
+    return shares
+
+
+def _race(solver, G, cpus, options, connection):
+    """Run one racer in its own session, sending back its answer."""
+    os.setsid()
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpus)
+    try:
+        connection.send((_RACERS[solver](G, len(cpus), options), None))
+    except Exception as e:
+        connection.send((None, '{}: {}'.format(type(e).__name__, e)))
+
+
+def _stop(process):
+    """Stop a racer together with the solver processes it started."""
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        if not process.is_alive():
+            break
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            # Not yet in a session of its own
+            os.kill(process.pid, sig)
+        process.join(TERMINATE_GRACE)
+    process.join()
+
+
+def portfolio(G, solvers=SOLVERS, weights=None, cores=None, timeout=None,
+              options=None):
+    """Race exact solvers on a graph and return the first optimal answer.
+
+    The race ends when a racer proves its answer optimal, when every racer
+    has finished, or at the timeout. The remaining racers are then stopped.
+
+    Parameters
+    ----------
+    G : Networkx Graph
+        Graph to solve.
+    solvers : list<str>
+        Solvers to race, among 'ic' (iterative compression), 'ai'
+        (Akiba-Iwata) and 'ilp'.
+    weights : list<float>
+        Share of the cores of every solver. Defaults to equal shares.
+    cores : int
+        Number of cores to race on. Defaults to every available core.
+    timeout : float
+        Optional timeout in seconds.
+    options : dict
+        Keyword arguments of the `solve` function of every solver, by
+        solver. The ILP defaults to the OCT formulation with CPLEX, and
+        iterative compression to preprocessing level 2.
+
+    Returns
+    -------
+    Answer
+        The first optimal answer, or else the smallest one. Its solver is
+        the one that won the race.
+
+    Raises
+    ------
+    subprocess.TimeoutExpired
+        Raised if no racer answered within the timeout.
+    """
+    solvers = list(solvers)
+    for solver in solvers:
+        if solver not in _RACERS:
+            raise Exception('Unknown Solver')
+    if weights is None:
+        weights = [1] * len(solvers)
+    if len(weights) != len(solvers):
+        raise Exception('Every solver needs a weight')
+    options = options or {}
+
+    # Split the cores
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    if cores is not None:
+        cpus = cpus[:cores]
+    shares = share_cores(weights, cpus)
+
+    # Racers solve a copy labeled 0, ..., n-1
+    H = nx.convert_node_labels_to_integers(G, label_attribute='label')
+    labels = nx.get_node_attributes(H, 'label')
+
+    # Start racing
+    start = default_timer()
+    racers = {}
+    for solver, share in zip(solvers, shares):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_race,
+            args=(solver, H, share, options.get(solver, {}), sender)
+        )
+        process.start()
+        sender.close()
+        racers[receiver] = (solver, process)
+
+    # Collect answers until one is optimal
+    answers = []
+    errors = []
+    try:
+        while racers and not any(answer.optimal for answer in answers):
+            remaining = None
+            if timeout is not None:
+                remaining = timeout - (default_timer() - start)
+                if remaining <= 0:
+                    break
+            for receiver in wait(list(racers), remaining):
+                solver, process = racers.pop(receiver)
+                try:
+                    result, error = receiver.recv()
+                except EOFError:
+                    result, error = None, 'exited unexpectedly'
+                receiver.close()
+                process.join()
+                if error is not None:
+                    errors.append('{}: {}'.format(solver, error))
+                    continue
+                certificate, optimal = result
+                answers.append(Answer(
+                    solver,
+                    default_timer() - start,
+                    len(certificate),
+                    [labels[v] for v in certificate],
+                    optimal
+                ))
+    finally:
+        for receiver, (_, process) in racers.items():
+            _stop(process)
+            receiver.close()
+
+    # Prefer optimal answers, then small ones, then early ones
+    if not answers:
+        if errors:
+            raise Exception('; '.join(errors))
+        raise subprocess.TimeoutExpired(solvers, timeout)
+    return min(answers, key=lambda a: (not a.optimal, a.size, a.time))
+
+
+def main():
+    """Race solvers on an edgelist graph and print the winning answer."""
+
+    # Get an argument parser and parse arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'file',
+        help='Path to an edgelist formatted file. May be compressed.'
+    )
+    parser.add_argument(
+        '--solvers',
+        help='Solvers to race.',
+        nargs='+',
+        choices=SOLVERS,
+        default=list(SOLVERS)
+    )
+    parser.add_argument(
+        '--weights',
+        help='Share of the cores of every solver.',
+        nargs='+',
+        type=float
+    )
+    parser.add_argument(
+        '--cores',
+        help='Number of cores to race on.',
+        type=int
+    )
+    parser.add_argument(
+        '--timeout',
+        help='Optional timeout in seconds.',
+        type=float
+    )
+    argv = parser.parse_args()
+
+    # Race and print
+    answer = portfolio(
+        read_edgelist(argv.file),
+        solvers=argv.solvers,
+        weights=argv.weights,
+        cores=argv.cores,
+        timeout=argv.timeout
+    )
+    print('{},{},{},"{}",{}'.format(
+        answer.solver,
+        round(answer.time, 1),
+        answer.size,
+        answer.certificate,
+        answer.optimal
+    ))
+
+
+# Invoke main
+if __name__ == '__main__':
+    main()
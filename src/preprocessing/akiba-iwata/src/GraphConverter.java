@@ -178,6 +178,15 @@ public class GraphConverter {
 		if (sorting) degSort();
 	}
 	
+	/**
+	 * Build the graph from edges given as consecutive pairs of vertex IDs
+	 */
+	public void read(int[] es) {
+		createAdj(es);
+		sorting();
+		if (sorting) degSort();
+	}
+	
 	public static void main(String[] args) throws IOException {
 		GraphConverter g = new GraphConverter();
 		args = SetOpt.setOpt(g, args);
@@ -29,6 +29,9 @@ public class Main {
 	@Option(abbr = 'd')
 	public static int debug = 0;
 
+	@Option(abbr = 's', usage = "Answer framed requests from stdin until it is closed instead of reading a file. See serve().")
+	public static boolean server = false;
+
 	int[] vertexID;
 	int[][] adj;
 
@@ -64,6 +67,16 @@ public class Main {
 		}
 	}
 
+	void read(int[] edges) {
+		GraphConverter conv = new GraphConverter();
+		conv.type = "snap";
+		conv.undirected = true;
+		conv.sorting = true;
+		conv.read(edges);
+		adj = conv.adj;
+		vertexID = conv.vertexID;
+	}
+
 	void run(String file) {
 		System.err.println("reading the input graph...");
 		read(file);
@@ -72,7 +85,6 @@ public class Main {
 		for (int i = 0; i < adj.length; i++) m += adj[i].length;
 		m /= 2;
 		System.err.printf("n = %d, m = %d%n", adj.length, m);
-		VCSolver vc = new VCSolver(adj, adj.length);
 		// VCSolver.nBranchings = 0;
 		// VCSolver.REDUCTION = reduction;
 		// VCSolver.LOWER_BOUND = lb;
@@ -104,6 +116,39 @@ public class Main {
 		// 	}
 		// }
 
+		int[][] classes = classify();
+
+		System.out.print("OCT:");
+		for (int s : classes[0]) {
+			System.out.print(" ");
+			System.out.print(s);
+		}
+		System.out.println();
+
+		System.out.print("Bipartite:");
+		for (int s : classes[1]) {
+			System.out.print(" ");
+			System.out.print(s);
+		}
+		System.out.println();
+
+		System.out.print("Rest:");
+		for (int s : classes[2]) {
+			System.out.print(" ");
+			System.out.print(s);
+		}
+		System.out.println();
+
+
+	}
+
+	/**
+	 * Classify the vertices of the original graph after one round of reductions
+	 * @return the OCT, Bipartite and Rest vertices, in this order
+	 */
+	int[][] classify() {
+		VCSolver vc = new VCSolver(adj, adj.length);
+
 		/* Goodrich Addition (TM) */
 		int[] assignments = vc.preprocess();
 
@@ -143,37 +188,70 @@ public class Main {
 			}
 		}
 
-		System.out.print("OCT:");
-		oct.forEach((s) -> {
-			System.out.print(" ");
-			System.out.print(s);
-		});
-		System.out.println();
+		return new int[][] {toArray(oct), toArray(not_oct), toArray(rest)};
+	}
 
-		System.out.print("Bipartite:");
-		not_oct.forEach((s) -> {
-			System.out.print(" ");
-			System.out.print(s);
-		});
-		System.out.println();
+	static int[] toArray(Collection<Integer> set) {
+		int[] array = new int[set.size()];
+		int i = 0;
+		for (int v : set) array[i++] = v;
+		return array;
+	}
 
-		System.out.print("Rest:");
-		rest.forEach((s) -> {
-			System.out.print(" ");
-			System.out.print(s);
-		});
-		System.out.println();
+	/**
+	 * Answer reduction requests read from stdin until it is closed, so that a
+	 * single warm JVM serves many graphs. All integers are big endian and 32 bit.
+	 * A request is the number of edges m followed by the 2m vertex IDs of the
+	 * edges of a snap graph. The response holds the OCT, Bipartite and Rest
+	 * classes, each as its size followed by its vertices. A request that fails
+	 * is answered with -1 followed by the error message in modified UTF-8.
+	 */
+	static void serve() throws IOException {
+		DataInputStream in = new DataInputStream(new BufferedInputStream(System.in));
+		DataOutputStream out = new DataOutputStream(new BufferedOutputStream(new FileOutputStream(FileDescriptor.out)));
+
+		// Keep stray prints off the protocol stream
+		System.setOut(System.err);
 
+		while (true) {
+			int m;
+			try {
+				m = in.readInt();
+			} catch (EOFException e) {
+				break;
+			}
+			int[] edges = new int[2 * m];
+			for (int i = 0; i < edges.length; i++) edges[i] = in.readInt();
 
+			int[][] classes;
+			try {
+				// Reset the random state, so every answer matches a fresh run
+				VCSolver.rand = new Random(VCSolver.SEED);
+				Main main = new Main();
+				main.read(edges);
+				classes = main.classify();
+			} catch (RuntimeException e) {
+				out.writeInt(-1);
+				out.writeUTF(String.valueOf(e));
+				out.flush();
+				continue;
+			}
+			for (int[] vertices : classes) {
+				out.writeInt(vertices.length);
+				for (int v : vertices) out.writeInt(v);
+			}
+			out.flush();
+		}
 	}
 
 	void debug(Object...os) {
 		System.err.println(deepToString(os));
 	}
 
-	public static void main(String[] args) {
+	public static void main(String[] args) throws IOException {
 		Main main = new Main();
 		args = SetOpt.setOpt(main, args);
-		main.run(args[0]);
+		if (server) serve();
+		else main.run(args[0]);
 	}
 }
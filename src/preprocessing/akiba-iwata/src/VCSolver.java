@@ -7,7 +7,9 @@ import tc.wata.debug.*;
 
 public class VCSolver {
 
-	public static Random rand = new Random(4327897);
+	public static final long SEED = 4327897;
+
+	public static Random rand = new Random(SEED);
 
 	public static int REDUCTION = 3;
 
@@ -1,21 +1,208 @@
 """A collection of graph operations used in preprocessing."""
 
 
+from pathlib import Path, PurePath
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import threading
+
 import networkx as nx
 
 
 MAX_NODES = 50
+PIPE_CHUNK_SIZE = 1 << 16
+COMPRESSED_OPENERS = {
+    '.gz': gzip.open,
+    '.xz': lzma.open,
+    '.bz2': bz2.open
+}
+
+
+def is_compressed(path):
+    """Whether a path names a gzip, xz or bz2 compressed file."""
+    return Path(str(path)).suffix in COMPRESSED_OPENERS
+
+
+def strip_compression(name):
+    """Remove a trailing compression extension from a file name."""
+    name = str(name)
+    suffix = Path(name).suffix
+    if suffix in COMPRESSED_OPENERS:
+        return name[:-len(suffix)]
+    return name
+
+
+def resolve_path(path):
+    """Find a graph file, falling back to its compressed variants.
+
+    If `path` does not exist, the first existing `path.gz`, `path.xz` or
+    `path.bz2` is returned instead. If none exist, `path` is returned
+    unchanged so that opening it raises the usual error.
+    """
+    path = Path(str(path))
+    if path.exists() or is_compressed(path):
+        return path
+    for extension in COMPRESSED_OPENERS:
+        candidate = path.with_name(path.name + extension)
+        if candidate.exists():
+            return candidate
+    return path
 
 
 def open_path(path, mode='r'):
     """ Python < 3.6 doesn't support calling open on a Pathlib Path.
 
+    Paths ending in `.gz`, `.xz` or `.bz2` are transparently
+    (de)compressed with the matching stdlib codec. Text modes are
+    decoded as a stream, so only a small buffer is held in memory.
+
     Parameters
     ----------
     path : Path
         Pathlib path to open
+    mode : str
+        Mode as accepted by `open`.
+    """
+    opener = COMPRESSED_OPENERS.get(Path(str(path)).suffix)
+    if opener is None:
+        return open(str(path), mode)
+    if 'b' not in mode and 't' not in mode:
+        mode += 't'
+    return opener(str(path), mode)
+
+
+def _pipe(feed, mode):
+    """Run `feed` on a background thread writing into an OS pipe.
+
+    Parameters
+    ----------
+    feed : callable
+        Called with the write end of the pipe as an open file object.
+    mode : str
+        Mode used to open the write end, either 'w' or 'wb'.
+
+    Returns
+    -------
+    int
+        File descriptor of the read end of the pipe.
+    """
+    read_fd, write_fd = os.pipe()
+
+    def _run():
+        try:
+            with os.fdopen(write_fd, mode) as outfile:
+                feed(outfile)
+        except BrokenPipeError:
+            # The consumer exited before reading all of its input
+            pass
+
+    threading.Thread(target=_run, daemon=True).start()
+    return read_fd
+
+
+def pipe_path(path):
+    """Stream a (possibly compressed) file into a pipe.
+
+    The file is decompressed on a background thread and written to the
+    write end of an OS pipe. The read end is returned and may be handed to
+    `subprocess.Popen` as `stdin`; the caller must close it after the
+    process has been spawned.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the file to stream.
+
+    Returns
+    -------
+    int
+        File descriptor of the read end of the pipe.
+    """
+    def _feed(outfile):
+        with open_path(path, 'rb') as infile:
+            shutil.copyfileobj(infile, outfile, PIPE_CHUNK_SIZE)
+
+    return _pipe(_feed, 'wb')
+
+
+def pipe_lines(lines):
+    """Stream lines of text into a pipe.
+
+    Like `pipe_path`, but the contents are produced by an iterable of
+    strings, such as the output of `edgelist_lines`, instead of a file.
+
+    Parameters
+    ----------
+    lines : iterable
+        Lines to write, including their trailing newlines.
+
+    Returns
+    -------
+    int
+        File descriptor of the read end of the pipe.
+    """
+    return _pipe(lambda outfile: outfile.writelines(lines), 'w')
+
+
+def is_path(source):
+    """Whether a graph source is a file path rather than an in-memory graph."""
+    return isinstance(source, (str, PurePath))
+
+
+def graph_parts(graph):
+    """Split an in-memory graph into its name, vertices and edges.
+
+    Parameters
+    ----------
+    graph : Networkx Graph or tuple
+        Either a NetworkX Graph or a `(num_vertices, edges)` pair, where
+        edges is a sized iterable of `(u, v)` pairs (e.g. an `m x 2` NumPy
+        array) over the vertices 0, ..., num_vertices-1.
+
+    Returns
+    -------
+    tuple
+        (name, vertices, edges)
+    """
+    if isinstance(graph, nx.Graph):
+        return graph.graph.get('name', ''), graph.nodes(), graph.edges()
+    num_vertices, edges = graph
+    return '', range(num_vertices), edges
+
+
+def solver_input(source, file_format='edgelist'):
+    """Prepare a graph to be read by an external solver binary.
+
+    External solvers only read plain text files. Compressed files and
+    in-memory graphs are therefore streamed to the solver over stdin in
+    the requested format, and the solver is pointed at `/dev/stdin`
+    instead.
+
+    Parameters
+    ----------
+    source : Path, str, Networkx Graph or tuple
+        Path of the graph file, or an in-memory graph as accepted by
+        `graph_parts`.
+    file_format : str
+        Format expected by the solver when streaming an in-memory graph.
+        One of 'edgelist', 'huffner' or 'snap'.
+
+    Returns
+    -------
+    tuple
+        (filename, stdin) where filename should be passed to the solver and
+        stdin to `subprocess.Popen`. If stdin is not None it is a file
+        descriptor which must be closed once the process has been spawned.
     """
-    return open(str(path), mode)
+    if not is_path(source):
+        return '/dev/stdin', pipe_lines(GRAPH_FORMATS[file_format](source))
+    path = resolve_path(source)
+    if not is_compressed(path):
+        return str(path), None
+    return '/dev/stdin', pipe_path(path)
 
 
 def reset_labels(graph):
@@ -45,13 +232,19 @@ def names_in_dir(dir_name, extension):
     """
     Return a sorted list of file names with a particular extension in a
     directory. The extension is not included in the filenames, and files
-    starting with underscores are ignored.
+    starting with underscores are ignored. Compressed files are listed under
+    the name of their uncompressed counterpart.
     """
     # Find names using glob
     names = [x.name for x in dir_name.glob('[!_]*{}'.format(extension))]
+    for compression in COMPRESSED_OPENERS:
+        names += [
+            strip_compression(x.name)
+            for x in dir_name.glob('[!_]*{}{}'.format(extension, compression))
+        ]
     # Clean up and return
     names = [name.replace(extension, '') for name in names]
-    names = sorted(names)
+    names = sorted(set(names))
     return names
 
 
@@ -63,8 +256,9 @@ def read_beasley(input_dir, dataset_name):
 
     # print("Read Beasley was called on", dataset_name, "in folder", input_dir)
 
+    dataset_name = strip_compression(dataset_name)
     graph = nx.Graph(name=dataset_name.replace('.txt', ''.format(dataset_name)))
-    with open_path(input_dir / dataset_name, 'r') as infile:
+    with open_path(resolve_path(input_dir / dataset_name), 'r') as infile:
         order, size = map(int, infile.readline().split())
         # print("Order, size:", order, size)
         # Beasley vertices are labeled 1, ..., n
@@ -90,8 +284,9 @@ def read_huffner(input_dir, dataset_name):
     Nodes are strings and should be relabeled if desired.
     """
 
+    dataset_name = strip_compression(dataset_name)
     graph = nx.Graph(name=dataset_name.replace('.graph', ''))
-    with open_path(input_dir / dataset_name, 'r') as infile:
+    with open_path(resolve_path(input_dir / dataset_name), 'r') as infile:
         # Handle the header
         infile.readline()  # Throw out '# Graph Name'
         infile.readline()  # Throw out graph name
@@ -122,8 +317,9 @@ def read_edgelist(input_dir, dataset_name):
     Populate and yield a NetworkX Graph with edgelist data.
     Nodes are strings and should be relabeled if desired.
     """
+    dataset_name = strip_compression(dataset_name)
     graph = nx.Graph(name=dataset_name.replace('.edgelist', ''))
-    with open_path(input_dir / dataset_name, 'r') as infile:
+    with open_path(resolve_path(input_dir / dataset_name), 'r') as infile:
         # Handle the header
         order, size = map(int, infile.readline().split())
 
@@ -141,53 +337,103 @@ def read_edgelist(input_dir, dataset_name):
         return graph
 
 
-def write_edgelist(graph, output_dir):
+def edgelist_lines(graph):
+    """
+    Yield the lines of an edgelist file for a graph.
+    Accepts any graph supported by `graph_parts`.
+    """
+    name, vertices, edges = graph_parts(graph)
+    yield '{} {}\n'.format(len(vertices), len(edges))
+    for edge in edges:
+        yield '{} {}\n'.format(*edge)
+
+
+def huffner_lines(graph, name=None):
+    """
+    Yield the lines of a Huffner file for a graph.
+    Accepts any graph supported by `graph_parts`. The graph name may be
+    overridden with `name`.
+    """
+    graph_name, vertices, edges = graph_parts(graph)
+    name = graph_name if name is None else name
+    yield '# Graph Name\n{}.huffner\n'.format(name)
+    yield '# Number of Vertices\n{}\n'.format(len(vertices))
+    yield '# Number of Edges\n{}\n'.format(len(edges))
+    yield '# Vertex names\n'
+    for vertex in vertices:
+        yield '{}\n'.format(vertex)
+    yield '# Edges\n'
+    for edge in edges:
+        yield '{} {}\n'.format(*edge)
+    yield '# EOF\n'
+
+
+def snap_lines(graph):
+    """
+    Yield the lines of a snap file for the VC doubling of a graph.
+    Accepts any graph supported by `graph_parts`. Vertices must be labeled
+    0, ..., n-1.
+    """
+    name, vertices, edges = graph_parts(graph)
+    shift = len(vertices)
+    yield '# Nodes: {} Edges: {}\n'.format(2 * shift, 2 * len(edges) + shift)
+    yield '# FromNodeId \t ToNodeId\n'
+    for vertex in vertices:
+        yield '{} {}\n'.format(vertex, int(vertex) + shift)
+    for u, v in edges:
+        yield '{} {}\n'.format(u, v)
+        yield '{} {}\n'.format(int(u) + shift, int(v) + shift)
+
+
+GRAPH_FORMATS = {
+    'edgelist': edgelist_lines,
+    'huffner': huffner_lines,
+    'snap': snap_lines
+}
+
+
+def write_edgelist(graph, output_dir, compression='', name=None):
     """
     Write a qubo as an edgelist.
     First line has #vertices #edges.
     Subtract one from edges so they start at 0.
+    An optional compression extension ('.gz', '.xz', '.bz2') compresses the
+    output. Any graph supported by `graph_parts` may be written if its name
+    is given.
     """
-    name = '{}.edgelist'.format(graph.graph['name'])
+    if name is None:
+        name = graph.graph['name']
+    name = '{}.edgelist{}'.format(name, compression)
     with open_path(output_dir / name, 'w') as outfile:
-        outfile.write('{} {}\n'.format(graph.order(), graph.size()))
-        for edge in graph.edges():
-            outfile.write('{} {}\n'.format(*edge))
+        outfile.writelines(edgelist_lines(graph))
 
 
-def write_huffner(graph, output_dir):
+def write_huffner(graph, output_dir, compression='', name=None):
     """
     Write a qubo in the style of Huffner's data.
+    An optional compression extension ('.gz', '.xz', '.bz2') compresses the
+    output. Any graph supported by `graph_parts` may be written if its name
+    is given.
     """
-    name = '{}.huffner'.format(graph.graph['name'])
-    with open_path(output_dir / name, 'w') as outfile:
-        outfile.write('# Graph Name\n{}\n'.format(name))
-        outfile.write('# Number of Vertices\n{}\n'.format(graph.order()))
-        outfile.write('# Number of Edges\n{}\n'.format(graph.size()))
-        outfile.write('# Vertex names\n')
-        for vertex in graph.nodes():
-            outfile.write('{}\n'.format(vertex))
-        outfile.write('# Edges\n')
-        for edge in graph.edges():
-            outfile.write('{} {}\n'.format(*edge))
-        outfile.write('# EOF\n')
+    if name is None:
+        name = graph.graph['name']
+    with open_path(output_dir / '{}.huffner{}'.format(name, compression),
+                   'w') as outfile:
+        outfile.writelines(huffner_lines(graph, name=name))
 
 
-def write_snap(graph, output_dir):
+def write_snap(graph, output_dir, compression='', name=None):
     """
     Write a qubo in the style of Akiba-Iwata's snap files.
+    An optional compression extension ('.gz', '.xz', '.bz2') compresses the
+    output. Any graph supported by `graph_parts` may be written if its name
+    is given.
     """
-    name = '{}.snap'.format(graph.graph['name'])
-    order = 2 * graph.order()
-    size = 2 * graph.size() + graph.order()
+    if name is None:
+        name = graph.graph['name']
+    name = '{}.snap{}'.format(name, compression)
     with open_path(output_dir / name, 'w') as outfile:
-        outfile.write('# Nodes: {} Edges: {}\n'.format(order, size))
-        outfile.write('# FromNodeId \t ToNodeId\n')
-        for vertex in graph.nodes():
-            outfile.write('{} {}\n'.format(vertex, vertex + graph.order()))
-        for edge in graph.edges():
-            outfile.write('{} {}\n'.format(*edge))
-            outfile.write('{} {}\n'.format(
-                *map(lambda x: x + graph.order(), edge)))
+        outfile.writelines(snap_lines(graph))
 
 
 def convert_oct_set(oct_set, og_names):
@@ -207,7 +453,7 @@ def load_pre_oct_set(input_dir, filename):
     Reads in .oct file where OCT vertices are preprocessed from the original
     data graph.
     """
-    with open_path(input_dir / filename, 'r') as infile:
+    with open_path(resolve_path(input_dir / filename), 'r') as infile:
         return [x.strip() for x in infile.readlines()]
 
 
@@ -216,7 +462,7 @@ def load_og_name_lookup(input_dir, filename):
     Reads in a .lookup into a dict that maps a relabeled name to an og_name.
     """
     og_names = {}
-    with open_path(input_dir / filename, 'r') as infile:
+    with open_path(resolve_path(input_dir / filename), 'r') as infile:
         for line in infile.readlines():
             key, value = line.split()
             og_names[key] = value
@@ -0,0 +1,173 @@
+"""Lift certificates on a preprocessed kernel back to the original graph.
+
+Preprocessing relabels the kernel vertices 0, ..., n-1 and records two pieces
+of metadata per dataset: a `.lookup` file mapping each kernel vertex to its
+original name, and a `.oct` file listing the original vertices that
+preprocessing forced into the OCT set. A certificate on the kernel is lifted by
+mapping it through the lookup and adding the forced OCT vertices.
+
+Both metadata files are loaded once per dataset into NumPy arrays, so lifting
+is a single fancy-indexing operation regardless of certificate size.
+"""
+
+
+from functools import lru_cache
+
+import numpy as np
+
+from src.preprocessing.graphs import open_path, resolve_path
+
+
+def _read_tokens(path):
+    """Read a whitespace separated metadata file into a string array."""
+    with open_path(resolve_path(path), 'r') as infile:
+        return np.array(infile.read().split(), dtype=str)
+
+
+class LiftingTable():
+    """Lookup and OCT metadata of one preprocessed dataset.
+
+    Attributes
+    ----------
+    names : numpy.ndarray
+        Original vertex names, indexed by kernel vertex.
+    pre_oct : numpy.ndarray
+        Original names of the vertices preprocessing forced into OCT.
+    """
+
+    __slots__ = ('names', 'pre_oct')
+
+    def __init__(self, names, pre_oct):
+        """Initialize LiftingTable.
+
+        Parameters
+        ----------
+        names : numpy.ndarray
+            Original vertex names, indexed by kernel vertex.
+        pre_oct : numpy.ndarray
+            Original names of the preprocessed OCT vertices.
+        """
+        self.names = names
+        self.pre_oct = pre_oct
+
+    @classmethod
+    def from_files(cls, lookup_path, oct_path):
+        """Load a table from `.lookup` and `.oct` files.
+
+        Parameters
+        ----------
+        lookup_path : Path
+            Path to the `.lookup` file, one `vertex name` pair per line.
+        oct_path : Path
+            Path to the `.oct` file, one original vertex name per line.
+
+        Returns
+        -------
+        LiftingTable
+            The loaded table.
+        """
+
+        # Lookup lines are `vertex name` pairs
+        pairs = _read_tokens(lookup_path).reshape(-1, 2)
+        vertices = pairs[:, 0].astype(np.int64)
+
+        # Scatter names into a dense array indexed by kernel vertex
+        size = int(vertices.max()) + 1 if len(vertices) else 0
+        names = np.empty(size, dtype=pairs.dtype)
+        names[vertices] = pairs[:, 1]
+
+        return cls(names, _read_tokens(oct_path))
+
+    def lift(self, certificate):
+        """Lift a single kernel certificate.
+
+        Parameters
+        ----------
+        certificate : iterable
+            Kernel vertices, as integers or integer strings.
+
+        Returns
+        -------
+        numpy.ndarray
+            Original names of the preprocessed OCT vertices followed by the
+            lifted certificate.
+        """
+        return self.lift_batch([certificate])[0]
+
+    def lift_batch(self, certificates):
+        """Lift many kernel certificates with a single indexing operation.
+
+        Parameters
+        ----------
+        certificates : iterable
+            Iterable of kernel certificates, each an iterable of integers or
+            integer strings.
+
+        Returns
+        -------
+        list<numpy.ndarray>
+            One array per certificate holding the original names of the
+            preprocessed OCT vertices followed by the lifted certificate.
+        """
+
+        # Flatten all certificates into one index array
+        certificates = [
+            np.array(list(c), dtype=np.int64) for c in certificates
+        ]
+        if not certificates:
+            return []
+        offsets = np.cumsum([len(c) for c in certificates])[:-1]
+        lifted = self.names[np.concatenate(certificates)]
+
+        # Split back and prepend the forced OCT vertices
+        return [
+            np.concatenate((self.pre_oct, part))
+            for part in np.split(lifted, offsets)
+        ]
+
+
+@lru_cache(maxsize=None)
+def load_lifting_table(lookup_dir, oct_dir, dataset):
+    """Load, and cache, the lifting table of a preprocessed dataset.
+
+    Parameters
+    ----------
+    lookup_dir : Path
+        Directory containing `<dataset>.lookup`.
+    oct_dir : Path
+        Directory containing `<dataset>.oct`.
+    dataset : str
+        Dataset name.
+
+    Returns
+    -------
+    LiftingTable
+        Table for the dataset. Repeated calls return the same object.
+    """
+    return LiftingTable.from_files(
+        lookup_dir / '{}.lookup'.format(dataset),
+        oct_dir / '{}.oct'.format(dataset)
+    )
+
+
+def lift_certificates(lookup_dir, oct_dir, dataset, certificates):
+    """Lift kernel certificates of a dataset back to original vertex names.
+
+    Parameters
+    ----------
+    lookup_dir : Path
+        Directory containing `<dataset>.lookup`.
+    oct_dir : Path
+        Directory containing `<dataset>.oct`.
+    dataset : str
+        Dataset name.
+    certificates : iterable
+        Iterable of kernel certificates.
+
+    Returns
+    -------
+    list<numpy.ndarray>
+        Full OCT sets on the original graph, one per certificate.
+    """
+    table = load_lifting_table(lookup_dir, oct_dir, dataset)
+    return table.lift_batch(certificates)
@@ -0,0 +1,136 @@
+"""Build OCT instances directly from QUBOs.
+
+The graph of a QUBO has one vertex per variable and one edge per non-zero
+coupler. These routines read the couplers of a `dimod.BinaryQuadraticModel` or
+a SciPy sparse QUBO matrix as arrays and return the graph as a
+`(num_vertices, edges)` pair, which every solver wrapper accepts directly.
+"""
+
+
+import networkx as nx
+import numpy as np
+import scipy.sparse
+
+
+def _graph_from_couplers(num_variables, rows, cols, data, compact):
+    """Construct graph arrays from coupler triplets.
+
+    Parameters
+    ----------
+    num_variables : int
+        Number of QUBO variables.
+    rows, cols : numpy.ndarray
+        Variable indices of each coupler.
+    data : numpy.ndarray
+        Coupler weights.
+    compact : bool
+        Whether variables without a non-zero coupler are dropped.
+
+    Returns
+    -------
+    tuple
+        (num_vertices, edges, variables) where edges is an `m x 2` array
+        with `u < v` in each row, and `variables[i]` is the variable index of
+        vertex `i`.
+    """
+
+    # Drop linear terms and orient every coupler as (min, max)
+    off_diagonal = rows != cols
+    rows, cols = rows[off_diagonal], cols[off_diagonal]
+    u, v = np.minimum(rows, cols), np.maximum(rows, cols)
+
+    # Merge (i, j) and (j, i) couplers, then drop the zero ones
+    couplers = scipy.sparse.coo_matrix(
+        (data[off_diagonal], (u, v)),
+        shape=(num_variables, num_variables)
+    ).tocsr()
+    couplers.eliminate_zeros()
+    couplers = couplers.tocoo()
+    edges = np.column_stack((couplers.row, couplers.col)).astype(np.int64)
+
+    # Relabel the remaining vertices 0, ..., n-1 preserving their order
+    if compact:
+        variables, edges = np.unique(edges, return_inverse=True)
+        edges = edges.reshape(-1, 2)
+    else:
+        variables = np.arange(num_variables)
+
+    return len(variables), edges, variables
+
+
+def from_sparse(matrix, compact=True):
+    """Build the graph of a QUBO matrix.
+
+    Parameters
+    ----------
+    matrix : scipy.sparse matrix
+        Square QUBO matrix in any SciPy sparse format (COO, CSR, ...). The
+        diagonal holds linear terms and is ignored. Couplers may be given in
+        either or both triangles.
+    compact : bool
+        If True, variables without a non-zero coupler are dropped and the
+        remaining ones relabeled 0, ..., n-1 in order.
+
+    Returns
+    -------
+    tuple
+        (num_vertices, edges, variables) where `(num_vertices, edges)` is the
+        graph and `variables[i]` is the matrix index of vertex `i`.
+    """
+    matrix = scipy.sparse.coo_matrix(matrix)
+    if matrix.shape[0] != matrix.shape[1]:
+        raise Exception('QUBO matrix must be square')
+    return _graph_from_couplers(
+        matrix.shape[0], matrix.row, matrix.col, matrix.data, compact
+    )
+
+
+def from_bqm(bqm, compact=True):
+    """Build the interaction graph of a binary quadratic model.
+
+    Parameters
+    ----------
+    bqm : dimod.BinaryQuadraticModel
+        The model. Its variables must be sortable.
+    compact : bool
+        If True, variables without a non-zero coupler are dropped and the
+        remaining ones relabeled 0, ..., n-1 in sorted order.
+
+    Returns
+    -------
+    tuple
+        (num_vertices, edges, labels) where `(num_vertices, edges)` is the
+        graph and `labels[i]` is the BQM variable of vertex `i`.
+    """
+    order = sorted(bqm.variables)
+    _, (rows, cols, data), _ = bqm.to_numpy_vectors(variable_order=order)
+    num_vertices, edges, variables = _graph_from_couplers(
+        len(order), np.asarray(rows), np.asarray(cols), np.asarray(data),
+        compact
+    )
+    return num_vertices, edges, [order[i] for i in variables]
+
+
+def to_networkx(num_vertices, edges, name=''):
+    """Build a NetworkX graph from graph arrays in bulk.
+
+    Only needed for consumers that require NetworkX, such as the ILP solvers.
+
+    Parameters
+    ----------
+    num_vertices : int
+        Number of vertices, labeled 0, ..., n-1.
+    edges : numpy.ndarray
+        `m x 2` array of edges.
+    name : str
+        Graph name.
+
+    Returns
+    -------
+    Networkx Graph
+        The graph.
+    """
+    graph = nx.Graph(name=name)
+    graph.add_nodes_from(range(num_vertices))
+    graph.add_edges_from(np.asarray(edges).tolist())
+    return graph
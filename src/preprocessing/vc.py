@@ -1,25 +1,154 @@
 """
-To be filled in with a Python script that calls the modified akiba-iwata
-subfolder.
+VertexCover reductions of the modified akiba-iwata subfolder.
 
+By default every round of reductions runs `Main` in a fresh JVM on the snap
+file written for the graph. The server mode of `Main` instead keeps one JVM
+across fixpoint rounds and datasets, so that JVM startup and JIT warm-up are
+only paid once. It is opt-in until it has been built and checked against
+the output of the one-shot runs.
 """
 
+from pathlib import Path
+import atexit
+import os
+import struct
 import subprocess
+
 import networkx as nx
+import numpy as np
+
+from src.preprocessing.graphs import graph_parts, solver_input
+
+
+AKIBA_IWATA_CLASSPATH = str(Path(__file__).parent / 'akiba-iwata' / 'bin')
+_INT = struct.Struct('>i')
+
+# Server shared by every call of vc_reductions
+_server = None
+
+
+def snap_edges(graph):
+    """
+    Return the edges of the snap file of a graph, as written by
+    `write_snap`, as an `m x 2` array. Accepts any graph supported by
+    `graph_parts`. Vertices must be labeled 0, ..., n-1.
+    """
+    _, vertices, edges = graph_parts(graph)
+    shift = len(vertices)
+    vertices = np.array([int(v) for v in vertices], dtype=np.int64)
+    edges = np.array(
+        [(int(u), int(v)) for u, v in edges], dtype=np.int64
+    ).reshape(-1, 2)
+    return np.concatenate((
+        np.column_stack((vertices, vertices + shift)),
+        edges,
+        edges + shift
+    ))
+
+
+class ReductionServer():
+    """
+    Client of an akiba-iwata JVM in server mode. Requests and responses are
+    framed as big endian 32 bit integers, see `Main.serve` for the protocol.
+    """
+
+    def __init__(self, classpath=AKIBA_IWATA_CLASSPATH):
+        self.process = subprocess.Popen(
+            args=['java', '-cp', classpath, 'Main', '--server'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL)
+
+    def _read(self, size):
+        data = self.process.stdout.read(size)
+        if len(data) != size:
+            raise Exception('Reduction server exited unexpectedly')
+        return data
 
+    def _read_int(self):
+        return _INT.unpack(self._read(_INT.size))[0]
 
-def vc_reductions(graph, oct_set):
-    output = subprocess.run(
-        args=['java', '-cp', 'src/preprocessing/akiba-iwata/bin', 'Main',
-              'data/preprocessed/snap/{}.snap'.format(
-              graph.graph['name']), '-r', '3'],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        check=True)
+    def classify(self, edges):
+        """
+        Run one round of reductions on a snap graph given by its edges.
+        Returns the (oct, bipartite, rest) lists of original vertices.
+        """
+        edges = np.asarray(edges, dtype='>i4').reshape(-1, 2)
+        self.process.stdin.write(_INT.pack(len(edges)))
+        self.process.stdin.write(edges.tobytes())
+        self.process.stdin.flush()
+
+        size = self._read_int()
+        if size < 0:
+            length = struct.unpack('>H', self._read(2))[0]
+            raise Exception(self._read(length).decode('utf-8'))
+        classes = []
+        for i in range(3):
+            if i:
+                size = self._read_int()
+            vertices = np.frombuffer(self._read(4 * size), dtype='>i4')
+            classes.append(vertices.astype(int).tolist())
+        return tuple(classes)
+
+    def close(self):
+        """Stop the JVM by closing its input."""
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def reduction_server():
+    """Return the shared reduction server, starting it if needed."""
+    global _server
+    if _server is None or _server.process.poll() is not None:
+        _server = ReductionServer()
+        atexit.register(_server.close)
+    return _server
+
+
+def _classify(graph):
+    """
+    Run one round of reductions on the snap file of a graph in a fresh JVM.
+    Returns the (oct, bipartite, rest) lists of original vertices.
+    """
+    data, stdin = solver_input(
+        'data/preprocessed/snap/{}.snap'.format(graph.graph['name']),
+        file_format='snap')
+    try:
+        output = subprocess.run(
+            args=['java', '-cp', AKIBA_IWATA_CLASSPATH, 'Main',
+                  data, '-r', '3'],
+            stdin=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True)
+    finally:
+        if stdin is not None:
+            os.close(stdin)
     output = output.stdout.decode("utf-8").split("\n")
-    oct_vertices = list(map(int, output[0].split()[1:]))
-    bipartite_vertices = list(map(int, output[1].split()[1:]))
-    # remaining_vertices = list(map(int, output[2].split()[1:]))
+    return tuple(list(map(int, line.split()[1:])) for line in output[:3])
+
+
+def vc_reductions(graph, oct_set, server=None):
+    """
+    Apply one round of reductions to a graph whose snap file was written.
+    A ReductionServer, e.g. `reduction_server()`, answers instead of a fresh
+    JVM if given.
+    """
+    if server is None:
+        classes = _classify(graph)
+    else:
+        try:
+            classes = server.classify(snap_edges(graph))
+        except BrokenPipeError:
+            raise Exception('Reduction server exited unexpectedly')
+    oct_vertices, bipartite_vertices, _ = classes
 
     # Update the bipartite vertices
     og_name_lookup = nx.get_node_attributes(graph, 'og_name')
@@ -36,5 +165,3 @@ def vc_reductions(graph, oct_set):
     graph_reduced = len(oct_vertices) != 0
 
     return graph_reduced, graph, oct_set
-    # print("Data: {}\nOCT: {}\nBipartite: {}\nRest: {}".format(
-    #     dataset, oct_set, bipartite_set, rest))
@@ -0,0 +1,232 @@
+"""Run solver jobs concurrently with asyncio.
+
+Every subprocess backed solver wrapper has an `async` variant built on a
+`Runner`, which bounds the number of jobs running at once, enforces
+per-job timeouts by terminating and then killing the process, and streams
+its stdout as it is produced. A single Python process can therefore keep
+every core busy with a mix of solver jobs, e.g.
+
+    from src.heuristics import solver as he
+    from src.huffner import solver as ic
+
+    runner = Runner(concurrency=16)
+    results = run_all([
+        he.solve_async(path, 1000, runner=runner),
+        ic.solve_async(path, timeout=10, runner=runner)
+    ])
+
+Only `asyncio` features available in Python 3.5 are used.
+"""
+
+
+# Imports
+from collections import namedtuple
+import asyncio
+import functools
+import os
+import subprocess
+import time
+
+from src.limits import preexec
+
+
+# Outcome of a process run by the runner. Output is in bytes and time in
+# seconds. If timed_out is True, the process was stopped at its timeout.
+# Start is the `time.time()` at which the process was started, e.g. to time
+# lines passed to `on_line`
+Completed = namedtuple(
+    'Completed',
+    ['returncode', 'stdout', 'stderr', 'time', 'timed_out', 'start']
+)
+
+# Seconds between terminating and killing a process
+TERMINATE_GRACE = 1.0
+
+# Bytes of stdout read at once. Lines are split from the chunks, so they
+# may be of any length, e.g. a certificate printed on one line
+READ_CHUNK = 64 * 1024
+
+# Runner shared by wrappers called without one
+_runner = None
+
+
+class Runner():
+    """Run subprocesses and blocking calls with a concurrency limit.
+
+    Attributes
+    ----------
+    concurrency : int
+        Maximum number of jobs running at once.
+    grace : float
+        Seconds a process may take to exit once terminated before it is
+        killed.
+    """
+
+    def __init__(self, concurrency=None, grace=TERMINATE_GRACE):
+        """Initialize Runner.
+
+        Parameters
+        ----------
+        concurrency : int
+            Maximum number of jobs running at once. Defaults to the number
+            of cores.
+        grace : float
+            Seconds between terminating and killing a timed out process.
+        """
+        self.concurrency = concurrency or os.cpu_count() or 1
+        self.grace = grace
+        self._semaphore = None
+
+    def _slot(self):
+        """Semaphore bounding the running jobs, created in the event loop."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def stop(self, process):
+        """Terminate a process, killing it if it does not exit in time."""
+        try:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), self.grace)
+            except asyncio.TimeoutError:
+                process.kill()
+        except ProcessLookupError:
+            # Already exited
+            pass
+        await process.wait()
+
+    async def run(self, args, stdin=None, timeout=None, on_line=None,
+                  limits=None):
+        """Run a process to completion or until its timeout.
+
+        Parameters
+        ----------
+        args : list
+            Command line of the process.
+        stdin : int
+            Optional file descriptor for stdin, such as the one returned by
+            `solver_input`. It is closed once the process is spawned.
+        timeout : float
+            Seconds after which the process is terminated, then killed.
+        on_line : callable
+            Called with every line of stdout, decoded, as it is produced.
+        limits : src.limits.Limits
+            Optional memory and CPU limits of the process.
+
+        Returns
+        -------
+        Completed
+            Exit status, output and running time of the process.
+        """
+        async with self._slot():
+            start = time.time()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *args,
+                    stdin=stdin,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    preexec_fn=preexec(limits)
+                )
+            finally:
+                if stdin is not None:
+                    os.close(stdin)
+
+            # Capture stdout line by line and stderr at once
+            lines = []
+
+            def _line(line):
+                lines.append(line)
+                if on_line is not None:
+                    on_line(line.decode('utf-8'))
+
+            async def _read_stdout():
+                partial = bytearray()
+                while True:
+                    chunk = await process.stdout.read(READ_CHUNK)
+                    if not chunk:
+                        break
+                    end = chunk.rfind(b'\n') + 1
+                    if not end:
+                        partial.extend(chunk)
+                        continue
+                    partial.extend(chunk[:end])
+                    for line in bytes(partial).split(b'\n')[:-1]:
+                        _line(line + b'\n')
+                    partial = bytearray(chunk[end:])
+                if partial:
+                    _line(bytes(partial))
+
+            reading = asyncio.gather(_read_stdout(), process.stderr.read())
+
+            # Wait, stopping the process at its timeout, on cancellation or
+            # on any error
+            timed_out = False
+            try:
+                try:
+                    _, stderr = await asyncio.wait_for(
+                        asyncio.shield(reading), timeout
+                    )
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    await self.stop(process)
+                    _, stderr = await reading
+                await process.wait()
+            finally:
+                if process.returncode is None:
+                    # Output ends once the process is stopped
+                    await self.stop(process)
+                    await asyncio.wait([reading], timeout=self.grace)
+
+            return Completed(
+                process.returncode,
+                b''.join(lines),
+                stderr,
+                time.time() - start,
+                timed_out,
+                start
+            )
+
+    async def run_blocking(self, function, *args, **kwargs):
+        """Call a blocking function on a thread, within the limit.
+
+        Used for solvers which manage their own processes, such as the
+        Akiba-Iwata JVM pool and the ILP backends.
+        """
+        async with self._slot():
+            return await asyncio.get_event_loop().run_in_executor(
+                None, functools.partial(function, *args, **kwargs)
+            )
+
+
+def default_runner():
+    """Return the runner shared by wrappers called without one."""
+    global _runner
+    if _runner is None:
+        _runner = Runner()
+    return _runner
+
+
+def run_all(jobs):
+    """Run coroutines to completion on the event loop.
+
+    Parameters
+    ----------
+    jobs : iterable
+        Coroutines, e.g. `async` solver wrapper calls.
+
+    Returns
+    -------
+    list
+        The result of every job in order, or the exception it raised.
+    """
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        # No loop in this thread yet
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(
+        asyncio.gather(*jobs, return_exceptions=True)
+    )
@@ -0,0 +1,219 @@
+"""Resource usage of solver runs.
+
+Subprocess solvers are accounted for by the rusage the kernel reports when
+the child is reaped with `os.wait4`. Work done in the Python process itself
+is measured by the change in its own rusage, and, if asked for, its Python
+allocations by the tracemalloc peak. Tracing slows down every allocation,
+so it is off by default.
+"""
+
+
+# Imports
+from collections import namedtuple
+import os
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+
+# Peak resident set size in bytes, user and system CPU time in seconds,
+# voluntary and involuntary context switches, and peak Python allocations
+# in bytes (None if not traced)
+Usage = namedtuple('Usage', [
+    'max_rss',
+    'user_time',
+    'system_time',
+    'voluntary_switches',
+    'involuntary_switches',
+    'python_peak'
+])
+
+# ru_maxrss is in kilobytes, except on macOS
+MAX_RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+
+def from_rusage(rusage, python_peak=None):
+    """Convert a `resource.struct_rusage` into a Usage."""
+    return Usage(
+        rusage.ru_maxrss * MAX_RSS_UNIT,
+        rusage.ru_utime,
+        rusage.ru_stime,
+        rusage.ru_nvcsw,
+        rusage.ru_nivcsw,
+        python_peak
+    )
+
+
+def combine(usages):
+    """Combine the usages of several runs.
+
+    Peaks are maximized and times and context switches summed.
+
+    Parameters
+    ----------
+    usages : iterable
+        Usages, None for runs that were not measured.
+
+    Returns
+    -------
+    Usage
+        Combined usage, or None if no run was measured.
+    """
+    usages = [usage for usage in usages if usage is not None]
+    if not usages:
+        return None
+    peaks = [u.python_peak for u in usages if u.python_peak is not None]
+    return Usage(
+        max(u.max_rss for u in usages),
+        sum(u.user_time for u in usages),
+        sum(u.system_time for u in usages),
+        sum(u.voluntary_switches for u in usages),
+        sum(u.involuntary_switches for u in usages),
+        max(peaks) if peaks else None
+    )
+
+
+def fields(usage):
+    """Values of a usage for a results row, NaN where unknown."""
+    if usage is None:
+        return [float('nan')] * len(Usage._fields)
+    return [float('nan') if value is None else value for value in usage]
+
+
+class Popen(subprocess.Popen):
+    """A `subprocess.Popen` recording the resource usage of its child.
+
+    The child is reaped with `os.wait4` instead of `os.waitpid`, whether by
+    `wait`, `communicate` or `poll`. Its usage is available once one of
+    them has seen the child exit.
+
+    Attributes
+    ----------
+    usage : Usage
+        Usage of the child, or None while it runs.
+    """
+
+    usage = None
+
+    def _wait4(self, pid, wait_flags):
+        """`os.waitpid` keeping the rusage of the child."""
+        pid, status, rusage = os.wait4(pid, wait_flags)
+        if pid == self.pid:
+            self.usage = from_rusage(rusage)
+        return pid, status
+
+    def _try_wait(self, wait_flags):
+        """Reap the child like the standard library, keeping its rusage."""
+        try:
+            return self._wait4(self.pid, wait_flags)
+        except ChildProcessError:
+            # Reaped elsewhere, e.g. with SIGCHLD ignored
+            return self.pid, 0
+
+    def _internal_poll(self, _deadstate=None, **kwargs):
+        """Poll the child like the standard library, keeping its rusage."""
+        kwargs['_waitpid'] = self._wait4
+        return super()._internal_poll(_deadstate=_deadstate, **kwargs)
+
+
+class Meter():
+    """Measure the usage of the current process over a block.
+
+    CPU times and context switches are the change over the block. The peak
+    resident set size is the process peak so far, since the kernel keeps no
+    other. Python allocations are only traced during the block if asked for,
+    since tracing slows down every allocation.
+
+    Attributes
+    ----------
+    usage : Usage
+        Usage of the block, once it has exited.
+    """
+
+    def __init__(self, trace_python=False):
+        """Initialize Meter.
+
+        Parameters
+        ----------
+        trace_python : bool
+            Whether to trace Python allocations, for the `python_peak` of
+            the usage. It is None otherwise.
+        """
+        self.trace_python = trace_python
+        self.usage = None
+        self._start = None
+        self._tracing = False
+
+    def __enter__(self):
+        self._tracing = self.trace_python and not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+        elif self.trace_python and hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        self._start = resource.getrusage(resource.RUSAGE_SELF)
+        return self
+
+    def __exit__(self, *args):
+        end = resource.getrusage(resource.RUSAGE_SELF)
+        peak = None
+        if self.trace_python:
+            _, peak = tracemalloc.get_traced_memory()
+        if self._tracing:
+            tracemalloc.stop()
+        self.usage = Usage(
+            end.ru_maxrss * MAX_RSS_UNIT,
+            end.ru_utime - self._start.ru_utime,
+            end.ru_stime - self._start.ru_stime,
+            end.ru_nvcsw - self._start.ru_nvcsw,
+            end.ru_nivcsw - self._start.ru_nivcsw,
+            peak
+        )
+
+
+def process_usage(pid):
+    """Read the usage of a running process so far from /proc.
+
+    Used for long lived workers, which are not reaped after every job. The
+    peak resident set size is that of the whole process lifetime.
+
+    Returns
+    -------
+    Usage
+        Usage so far, or None where /proc is unavailable.
+    """
+    try:
+        with open('/proc/{}/stat'.format(pid)) as stat_file:
+            stat = stat_file.read()
+        with open('/proc/{}/status'.format(pid)) as status_file:
+            status = dict(
+                line.split(':', 1) for line in status_file if ':' in line
+            )
+    except OSError:
+        return None
+
+    # Fields after the parenthesized command name, utime and stime in ticks
+    values = stat[stat.rindex(')') + 2:].split()
+    ticks = os.sysconf('SC_CLK_TCK')
+    return Usage(
+        int(status['VmHWM'].split()[0]) * 1024,
+        int(values[11]) / ticks,
+        int(values[12]) / ticks,
+        int(status['voluntary_ctxt_switches']),
+        int(status['nonvoluntary_ctxt_switches']),
+        None
+    )
+
+
+def difference(after, before):
+    """Usage between two `process_usage` readings of the same process."""
+    if after is None or before is None:
+        return None
+    return Usage(
+        after.max_rss,
+        after.user_time - before.user_time,
+        after.system_time - before.system_time,
+        after.voluntary_switches - before.voluntary_switches,
+        after.involuntary_switches - before.involuntary_switches,
+        None
+    )